@@ -0,0 +1,71 @@
+# benchmarks/bench_company_name.py
+#
+# Throughput of enrich.CompanyNameCleaner over synthetic page titles.
+#
+#   python -m benchmarks.bench_company_name --n 100000
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+from dap.enrich import CompanyNameCleaner
+
+_BRANDS = ["Zollinger", "Acme", "Smith & Jones", "Pura Vida", "Harbor", "Delta", "Oak Street", "Blue Coast"]
+_SUFFIXES = ["Law", "LLC", "Group", "Partners", "Associates", "Relocation", "Consulting", ""]
+_GENERIC = ["Immigration Lawyer", "Expat Consultant", "Residency Advisor", "Criminal Defense Attorney", "Home"]
+_GEO = ["New Orleans", "Louisiana", "Costa Rica", "Baton Rouge", "San José"]
+_SEPS = [" | ", " - ", " :: ", " — ", " : "]
+
+
+def synthetic_titles(n: int, unique_ratio: float = 0.3, seed: int = 1) -> list[str]:
+    rnd = random.Random(seed)
+    pool_size = max(int(n * unique_ratio), 1)
+    pool = []
+    for i in range(pool_size):
+        brand = f"{rnd.choice(_BRANDS)} {rnd.choice(_SUFFIXES)}".strip()
+        parts = [brand, f"{rnd.choice(_GENERIC)} {rnd.choice(_GEO)}"]
+        rnd.shuffle(parts)
+        if rnd.random() < 0.3:
+            parts.append(f"#{i}")
+        pool.append(rnd.choice(_SEPS).join(parts))
+    return [rnd.choice(pool) for _ in range(n)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100_000, help="Number of titles.")
+    parser.add_argument("--unique-ratio", type=float, default=0.3, help="Share of distinct titles.")
+    args = parser.parse_args()
+
+    titles = synthetic_titles(args.n, args.unique_ratio)
+    cleaner = CompanyNameCleaner.from_config()
+
+    t0 = time.perf_counter()
+    cleaner.clean_many(titles)
+    cold = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    cleaner.clean_many(titles)
+    warm = time.perf_counter() - t0
+
+    print(
+        json.dumps(
+            {
+                "bench": "company_name",
+                "titles": len(titles),
+                "unique_titles": len(set(titles)),
+                "cold_s": round(cold, 4),
+                "cold_titles_per_s": round(len(titles) / cold),
+                "warm_s": round(warm, 4),
+                "warm_titles_per_s": round(len(titles) / warm),
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
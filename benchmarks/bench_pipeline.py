@@ -0,0 +1,261 @@
+# benchmarks/bench_pipeline.py
+#
+# Offline end-to-end benchmark: crawler.run, discover, enrich, upsert_prospects and
+# apply_enrichment against a local synthetic web, a fake Serper endpoint and an
+# in-memory worksheet. No credentials or network access needed.
+#
+#   python -m benchmarks.bench_pipeline --sites 2000 --out bench.json
+#   python -m benchmarks.bench_pipeline --sites 2000 --compare bench.json
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List
+
+from benchmarks.fakes import FakeWeb, SiteProfile, _Site, site_host, site_url
+from dap.sheets.schema import PROSPECT_COLUMNS_OPTIONAL_V11, PROSPECT_COLUMNS_V1, RUNS_COLUMNS_OPTIONAL, RUNS_COLUMNS_V1
+from dap.tracing import start_run
+from tests.fakes import MemoryWorksheet, memory_sheets
+
+HEADER = PROSPECT_COLUMNS_V1 + PROSPECT_COLUMNS_OPTIONAL_V11
+
+# Result keys compared by --compare; higher is better for throughput, lower for latency.
+_HIGHER = ("per_s",)
+_LOWER = ("_ms",)
+
+
+def _timed(fn: Callable[[], Any]) -> tuple[Any, float]:
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> tuple[Any, float]:
+    """Fastest of `repeat` runs (in-memory stages are short and noisy)."""
+    runs = [_timed(fn) for _ in range(max(repeat, 1))]
+    return runs[-1][0], min(secs for _, secs in runs)
+
+
+def _rate(n: int, secs: float) -> float:
+    return round(n / secs, 1) if secs > 0 else 0.0
+
+
+def _prospect_rows(n: int) -> List[Dict[str, str]]:
+    return [{"website_url": site_url(i), "domain": site_host(i), "status": "discovered"} for i in range(n)]
+
+
+def _sheet(rows: List[Dict[str, str]], latency_ms: float) -> MemoryWorksheet:
+    return MemoryWorksheet("prospects", [HEADER] + [[r.get(c, "") for c in HEADER] for r in rows], latency_ms)
+
+
+def bench_crawl(n: int, timeout_s: int) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    from dap.crawler import run
+
+    tracer = start_run("bench-crawl")
+    items = [{"url": site_url(i), "domain": site_host(i)} for i in range(n)]
+    results, secs = _timed(lambda: run(items, timeout_s=timeout_s))
+    fetch = tracer.summary()["calls"].get("fetch", {})
+    return {
+        "sites": n,
+        "secs": round(secs, 3),
+        "sites_per_s": _rate(n, secs),
+        "fetches": fetch.get("count", 0),
+        "fetch_p50_ms": fetch.get("p50_ms", 0.0),
+        "fetch_p90_ms": fetch.get("p90_ms", 0.0),
+        "fetch_p99_ms": fetch.get("p99_ms", 0.0),
+        "bytes": fetch.get("bytes", 0),
+        "with_email": sum(1 for r in results if r.get("primary_email")),
+    }, results
+
+
+def bench_discover() -> Dict[str, Any]:
+    from dap.discovery.search_seed import discover
+
+    tracer = start_run("bench-discover")
+    found, secs = _timed(lambda: discover(None))
+    calls = tracer.summary()["calls"].get("serper.search", {})
+    return {
+        "queries": calls.get("count", 0),
+        "candidates": len(found),
+        "resolved_from_snippet": sum(1 for d in found if d.get("emails")),
+        "secs": round(secs, 3),
+        "queries_per_s": _rate(calls.get("count", 0), secs),
+        "search_p90_ms": calls.get("p90_ms", 0.0),
+    }
+
+
+def bench_parse(profile: SiteProfile, workers: int, threads: int, chunk_size: int) -> Dict[str, Any]:
+    """Page parsing from `threads` crawl threads: inline vs a dap.parse_pool.ParsePool."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from dap.parse_pool import ParsePool
+
+    bodies = [_Site(i, profile).page("/")[1].encode() for i in range(profile.sites)]
+
+    def run(pool: ParsePool) -> float:
+        with pool, ThreadPoolExecutor(threads) as ex:
+            t0 = time.perf_counter()
+            list(ex.map(pool.parse, bodies))
+            return time.perf_counter() - t0
+
+    inline = run(ParsePool(0))
+    pooled = run(ParsePool(workers, chunk_size=chunk_size, inline_below=0))
+    return {
+        "pages": len(bodies),
+        "workers": workers,
+        "inline_secs": round(inline, 3),
+        "pool_secs": round(pooled, 3),
+        "inline_pages_per_s": _rate(len(bodies), inline),
+        "pool_pages_per_s": _rate(len(bodies), pooled),
+    }
+
+
+def bench_enrich(prospects: List[Dict[str, str]], results: List[Dict[str, Any]], repeat: int) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    from dap.enrich import enrich
+
+    updates, secs = _best(lambda: enrich(prospects, results), repeat)
+    return {"rows": len(prospects), "updates": len(updates), "secs": round(secs, 4), "rows_per_s": _rate(len(prospects), secs)}, updates
+
+
+def _with_sheet(rows: List[Dict[str, str]], latency_ms: float, fn: Callable[[], Any]) -> Callable[[], tuple[Any, MemoryWorksheet]]:
+    def run() -> tuple[Any, MemoryWorksheet]:
+        ws = _sheet(rows, latency_ms)
+        with memory_sheets(ws, MemoryWorksheet("runs", [RUNS_COLUMNS_V1 + RUNS_COLUMNS_OPTIONAL])):
+            return fn(), ws
+
+    return run
+
+
+def bench_upsert(existing: int, new: int, latency_ms: float, repeat: int) -> Dict[str, Any]:
+    from dap.sheets.writers import upsert_prospects
+
+    # half of the seeds update existing rows, half are appended
+    seeds = [
+        {"website_url": site_url(i), "domain": site_host(i), "status": "discovered", "notes": "bench"}
+        for i in range(existing - new // 2, existing + new - new // 2)
+    ]
+    (written, ws), secs = _best(_with_sheet(_prospect_rows(existing), latency_ms, lambda: upsert_prospects(None, seeds, key="domain")), repeat)
+    return {
+        "sheet_rows": existing,
+        "rows": len(seeds),
+        "written": written,
+        "secs": round(secs, 4),
+        "rows_per_s": _rate(len(seeds), secs),
+        "api_calls": sum(ws.calls.values()),
+    }
+
+
+def bench_apply(prospects: List[Dict[str, str]], updates: List[Dict[str, Any]], latency_ms: float, repeat: int) -> Dict[str, Any]:
+    from dap.sheets.writers_enrich import apply_enrichment
+
+    (written, ws), secs = _best(_with_sheet(prospects, latency_ms, lambda: apply_enrichment(None, updates)), repeat)
+    return {
+        "updates": len(updates),
+        "written": written,
+        "secs": round(secs, 4),
+        "updates_per_s": _rate(len(updates), secs),
+        "api_calls": sum(ws.calls.values()),
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Names of metrics that regressed by more than `tolerance` (a share, e.g. 0.2)."""
+    regressions = []
+    for bench, res in current["results"].items():
+        base = baseline.get("results", {}).get(bench, {})
+        for key, v in res.items():
+            b = base.get(key)
+            if not isinstance(v, (int, float)) or not isinstance(b, (int, float)) or not b:
+                continue
+            ratio = v / b
+            if key.endswith(_HIGHER) and ratio < 1 - tolerance:
+                regressions.append(f"{bench}.{key}: {b} -> {v} ({ratio:.2f}x)")
+            elif key.endswith(_LOWER) and ratio > 1 + tolerance:
+                regressions.append(f"{bench}.{key}: {b} -> {v} ({ratio:.2f}x)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the DAP pipeline stages.")
+    parser.add_argument("--sites", type=int, default=1000, help="Synthetic sites to crawl and enrich.")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Mean per-page server latency.")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="Uniform +/- jitter on page latency.")
+    parser.add_argument("--size-kb", type=int, default=20, help="Approximate page size.")
+    parser.add_argument("--fail-rate", type=float, default=0.05, help="Share of sites answering 404/500.")
+    parser.add_argument("--contact-rate", type=float, default=0.3, help="Share of sites with the email only on /contact.")
+    parser.add_argument("--no-email-rate", type=float, default=0.1, help="Share of sites without any email.")
+    parser.add_argument("--serper-latency-ms", type=float, default=50.0, help="Fake Serper response latency.")
+    parser.add_argument("--sheet-rows", type=int, default=5000, help="Existing rows in the in-memory prospects sheet.")
+    parser.add_argument("--sheets-latency-ms", type=float, default=0.0, help="Added latency per Sheets API call.")
+    parser.add_argument("--parse-workers", type=int, default=2, help="Worker processes for the parse benchmark.")
+    parser.add_argument("--parse-threads", type=int, default=16, help="Concurrent callers in the parse benchmark (crawl workers).")
+    parser.add_argument("--parse-chunk-size", type=int, default=16, help="Pages per parse worker round trip.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each in-memory stage; the fastest is reported.")
+    parser.add_argument("--skip", action="append", default=[], help="Skip a benchmark (crawl, discover, parse, enrich, upsert, apply).")
+    parser.add_argument("--out", default="", help="Also write the JSON result to this file.")
+    parser.add_argument("--compare", default="", help="Baseline JSON from an earlier --out; exit 1 on regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression share for --compare.")
+    args = parser.parse_args()
+
+    profile = SiteProfile(
+        sites=args.sites,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        size_kb=args.size_kb,
+        fail_rate=args.fail_rate,
+        contact_rate=args.contact_rate,
+        no_email_rate=args.no_email_rate,
+    )
+    results: Dict[str, Any] = {}
+    prospects = _prospect_rows(args.sites)
+
+    with FakeWeb(profile, serper_latency_ms=args.serper_latency_ms) as web:
+        web.install_proxy()
+        os.environ["DAP_SERPER_ENDPOINT"] = web.serper_endpoint
+        os.environ.setdefault("SERPER_API_KEY", "bench")
+
+        crawl_results: List[Dict[str, Any]] = []
+        if "crawl" not in args.skip:
+            results["crawl"], crawl_results = bench_crawl(args.sites, timeout_s=10)
+        if "discover" not in args.skip:
+            results["discover"] = bench_discover()
+
+    if "parse" not in args.skip:
+        results["parse"] = bench_parse(profile, args.parse_workers, args.parse_threads, args.parse_chunk_size)
+
+    updates: List[Dict[str, Any]] = []
+    if "enrich" not in args.skip and crawl_results:
+        results["enrich"], updates = bench_enrich(prospects, crawl_results, args.repeat)
+    if "upsert" not in args.skip:
+        results["upsert"] = bench_upsert(args.sheet_rows, min(args.sites, args.sheet_rows), args.sheets_latency_ms, args.repeat)
+    if "apply" not in args.skip and updates:
+        results["apply"] = bench_apply(prospects, updates, args.sheets_latency_ms, args.repeat)
+
+    out = {
+        "bench": "pipeline",
+        "params": {**asdict(profile), "serper_latency_ms": args.serper_latency_ms, "sheet_rows": args.sheet_rows, "sheets_latency_ms": args.sheets_latency_ms},
+        "results": results,
+    }
+    print(json.dumps(out))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(out, f, indent=1)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("params") != out["params"]:
+            print("WARNING baseline was run with different params")
+        regressions = compare(out, baseline, args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+# benchmarks/bench_urls.py
+#
+# Throughput of dap.urls canonicalization over large synthetic URL lists with repeats
+# (the same sites come back from discovery, the sheet, the crawl and enrichment),
+# against the inline urlsplit() normalization each stage used to do.
+#
+#   python -m benchmarks.bench_urls --n 500000
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Callable, List
+from urllib.parse import urlsplit, urlunsplit
+
+from dap import urls
+
+_TLDS = ["com", "net", "org", "co.uk", "com.au", "co.cr", "io", "law"]
+_HOSTS = ["", "www.", "WWW.", "shop.", "blog."]
+_PATHS = ["", "/", "/contact", "/about-us/", "/?utm_source=serper", "/en/services#team"]
+
+
+def synthetic_urls(n: int, unique_ratio: float = 0.2, seed: int = 1) -> List[str]:
+    rnd = random.Random(seed)
+    pool_size = max(int(n * unique_ratio), 1)
+    pool = []
+    for i in range(pool_size):
+        scheme = rnd.choice(["https://", "http://", "HTTPS://", ""])
+        host = f"{rnd.choice(_HOSTS)}site{i}.{rnd.choice(_TLDS)}"
+        pool.append(f"{scheme}{host}{rnd.choice(_PATHS)}")
+    return [rnd.choice(pool) for _ in range(n)]
+
+
+def _inline_key(u: str) -> str:
+    """The pre-dap.urls join key (enrich._norm): scheme://netloc, lowercased."""
+    u = (u or "").strip()
+    if not u:
+        return ""
+    if "://" not in u:
+        u = "https://" + u
+    p = urlsplit(u)
+    return urlunsplit((p.scheme.lower(), p.netloc.lower(), "", "", ""))
+
+
+def _timed(fn: Callable[[str], str], items: List[str]) -> float:
+    t0 = time.perf_counter()
+    for u in items:
+        fn(u)
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=500_000, help="Number of URLs.")
+    parser.add_argument("--unique-ratio", type=float, default=0.2, help="Share of distinct URLs.")
+    args = parser.parse_args()
+
+    items = synthetic_urls(args.n, args.unique_ratio)
+    results = {"inline_urlsplit_s": round(_timed(_inline_key, items), 4)}
+    for fn in (urls.canonical_url, urls.url_key, urls.registrable_domain):
+        fn.cache_clear()
+        results[f"{fn.__name__}_cold_s"] = round(_timed(fn, items), 4)
+        results[f"{fn.__name__}_warm_s"] = round(_timed(fn, items), 4)
+
+    print(
+        json.dumps(
+            {
+                "bench": "urls",
+                "urls": len(items),
+                "unique_urls": len(set(items)),
+                **results,
+                "url_key_per_s": round(len(items) / results["url_key_cold_s"], 1) if results["url_key_cold_s"] else 0.0,
+                "cache": urls.cache_info(),
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
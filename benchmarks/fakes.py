@@ -0,0 +1,186 @@
+# benchmarks/fakes.py
+#
+# Local stand-ins for the web and Serper used by the offline benchmarks
+# (the Google Sheets double lives in tests/fakes.py).
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+SITE_SUFFIX = "benchtest"  # one label, so every synthetic site is its own registrable domain
+
+
+@dataclass(frozen=True)
+class SiteProfile:
+    """Shape of the synthetic web. Rates are shares of all sites."""
+
+    sites: int = 1000
+    latency_ms: float = 5.0
+    jitter_ms: float = 5.0
+    size_kb: int = 20
+    fail_rate: float = 0.05
+    contact_rate: float = 0.3
+    no_email_rate: float = 0.1
+    seed: int = 1
+
+
+def site_host(i: int) -> str:
+    return f"site{i}.{SITE_SUFFIX}"
+
+
+def site_url(i: int) -> str:
+    return f"http://{site_host(i)}"
+
+
+class _Site:
+    """Deterministic behaviour of site `i`: failure, where its email lives, page size."""
+
+    def __init__(self, i: int, profile: SiteProfile):
+        rnd = random.Random(profile.seed * 1_000_003 + i)
+        self.i = i
+        roll = rnd.random()
+        self.fail = 404 if roll < profile.fail_rate / 2 else 500 if roll < profile.fail_rate else 0
+        roll = rnd.random()
+        self.email_on = "" if roll < profile.no_email_rate else "contact" if roll < profile.no_email_rate + profile.contact_rate else "home"
+        self.latency_s = max(profile.latency_ms + rnd.uniform(-profile.jitter_ms, profile.jitter_ms), 0) / 1000.0
+        self.padding = "lorem ipsum dolor sit amet " * max(profile.size_kb * 1024 // 27, 1)
+
+    def page(self, path: str) -> tuple[int, str]:
+        if self.fail:
+            return self.fail, "error"
+        title = f"Site {self.i} Relocation LLC | Immigration Lawyer Costa Rica"
+        body = [f"<html lang='en'><head><title>{title}</title>", f'<meta name="description" content="Site {self.i}">']
+        body.append("<script>var x = 1;</script></head><body>")
+        if path in ("", "/"):
+            if self.email_on == "home":
+                body.append(f"<p>Write to info@{site_host(self.i)} or call +1 504 555 {self.i % 10000:04d}</p>")
+        elif path.rstrip("/") in ("/contact", "/contact-us"):
+            if self.email_on != "contact":
+                return 404, "not found"
+            body.append(f"<a href='mailto:hello@{site_host(self.i)}'>hello@{site_host(self.i)}</a>")
+        else:
+            return 404, "not found"
+        body.append(f"<p>{self.padding}</p></body></html>")
+        return 200, "".join(body)
+
+
+def _organic(query: str, num: int, sites: int) -> List[Dict[str, str]]:
+    h = int.from_bytes(hashlib.blake2b(query.encode("utf-8"), digest_size=8).digest(), "big")
+    rnd = random.Random(h)
+    return [
+        {"title": f"Site {i} Relocation LLC | Immigration Lawyer", "link": f"{site_url(i)}/?utm_source=serper", "snippet": _snippet(i)}
+        for i in (rnd.randrange(sites) for _ in range(num))
+    ]
+
+
+def _snippet(i: int) -> str:
+    # roughly a third of results show contact details in the snippet, some cut off mid-address
+    if i % 6 == 0:
+        return f"Immigration help. Contact info@{site_host(i)} or call +1 504 555 {i % 10000:04d}."
+    if i % 6 == 1:
+        return f"Relocation services in Costa Rica. Call (504) 555-{i % 10000:04d} today."
+    if i % 6 == 2:
+        return f"Expat advice and residency. Write to info@{site_host(i)[:-3]}..."
+    return "Relocation and residency services for expats."
+
+
+class FakeWeb:
+    """One local HTTP server acting as both the synthetic web (as an HTTP proxy for
+    *.benchtest) and the Serper search endpoint (POST /search).
+
+        with FakeWeb(SiteProfile(sites=2000)) as web:
+            web.install_proxy()                   # urllib (crawler) -> synthetic sites
+            os.environ["DAP_SERPER_ENDPOINT"] = web.serper_endpoint
+    """
+
+    def __init__(self, profile: SiteProfile, serper_latency_ms: float = 50.0):
+        self.profile = profile
+        self.serper_latency_s = serper_latency_ms / 1000.0
+        self._sites: Dict[int, _Site] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.serper_calls = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="bench-web", daemon=True)
+
+    @property
+    def base(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def serper_endpoint(self) -> str:
+        return f"{self.base}/search"
+
+    def site(self, i: int) -> _Site:
+        with self._lock:
+            s = self._sites.get(i)
+            if s is None:
+                s = self._sites[i] = _Site(i, self.profile)
+            return s
+
+    def install_proxy(self) -> None:
+        """Routes urllib's default opener (used by dap.crawler) through this server."""
+        urllib.request.install_opener(urllib.request.build_opener(urllib.request.ProxyHandler({"http": self.base})))
+
+    def __enter__(self) -> "FakeWeb":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        urllib.request.install_opener(None)
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        web = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.0"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, body: bytes, ctype: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                host = (parts.hostname or self.headers.get("Host", "")).lower()
+                with web._lock:
+                    web.requests += 1
+                num = host[4:].split(".", 1)[0]
+                if not (host.startswith("site") and host.endswith("." + SITE_SUFFIX) and num.isdigit()):
+                    self._send(404, b"unknown host", "text/plain")
+                    return
+                site = web.site(int(num))
+                time.sleep(site.latency_s)
+                status, html = site.page(parts.path)
+                self._send(status, html.encode("utf-8"), "text/html; charset=utf-8")
+
+            def do_POST(self) -> None:
+                if urlsplit(self.path).path != "/search":
+                    self._send(404, b"", "text/plain")
+                    return
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                with web._lock:
+                    web.serper_calls += 1
+                time.sleep(web.serper_latency_s)
+                organic = _organic(payload.get("q", ""), int(payload.get("num", 10)), web.profile.sites)
+                self._send(200, json.dumps({"organic": organic}).encode("utf-8"), "application/json")
+
+        return Handler
@@ -0,0 +1,214 @@
+# dap/campaigns.py
+
+from __future__ import annotations
+
+import argparse
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from dap.tracing import Tracer, start_run
+
+# Campaigns map keyword packs (config/keywords.yml) to spreadsheets, so several campaigns
+# run in one invocation instead of one cron job each:
+#
+#   python -m dap.campaigns                      # every enabled campaign
+#   python -m dap.campaigns --campaign cr --dry-run
+#
+# Unknown options are passed to run_daily for every campaign.
+
+
+@dataclass(frozen=True)
+class Campaign:
+    name: str
+    spreadsheet_id: str
+    packs: tuple[str, ...]
+    prospects_sheet_name: str = ""
+    runs_sheet_name: str = ""
+    archive_sheet_name: str = ""
+
+    def sheets_config(self):
+        from dap.sheets.client import load_sheets_config
+
+        cfg = load_sheets_config(self.spreadsheet_id)
+        names = {
+            "prospects_sheet_name": self.prospects_sheet_name,
+            "runs_sheet_name": self.runs_sheet_name,
+            "archive_sheet_name": self.archive_sheet_name,
+        }
+        return replace(cfg, **{k: v for k, v in names.items() if v})
+
+
+def _campaigns_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "config" / "campaigns.yml"
+
+
+def load_campaigns(path: Path | None = None) -> List[Campaign]:
+    """Enabled campaigns from config/campaigns.yml.
+
+    `spreadsheet_id_env` names an env var holding the spreadsheet id (kept out of the repo);
+    `spreadsheet_id` may be given directly instead.
+    """
+    import os
+
+    import yaml  # type: ignore
+
+    path = path or _campaigns_path()
+    if not path.exists():
+        raise FileNotFoundError(f"campaigns.yml not found at: {path}")
+    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    if not isinstance(data.get("campaigns"), list):
+        raise ValueError("campaigns.yml must contain top-level key: campaigns: [ ... ]")
+
+    out: List[Campaign] = []
+    for c in data["campaigns"]:
+        if not isinstance(c, dict) or not c.get("enabled", False):
+            continue
+        name = str(c.get("name") or "").strip()
+        if not name:
+            raise ValueError("every campaign in campaigns.yml needs a name")
+        packs = tuple(str(p).strip() for p in c.get("packs") or [] if str(p).strip())
+        if not packs:
+            raise ValueError(f"campaign {name}: list at least one keyword pack under packs")
+        sheet_id = str(c.get("spreadsheet_id") or "").strip()
+        if not sheet_id and c.get("spreadsheet_id_env"):
+            sheet_id = os.getenv(str(c["spreadsheet_id_env"]), "").strip()
+        if not sheet_id:
+            raise ValueError(f"campaign {name}: missing spreadsheet_id (or its spreadsheet_id_env is unset)")
+        out.append(
+            Campaign(
+                name=name,
+                spreadsheet_id=sheet_id,
+                packs=packs,
+                prospects_sheet_name=str(c.get("prospects_sheet_name") or ""),
+                runs_sheet_name=str(c.get("runs_sheet_name") or ""),
+                archive_sheet_name=str(c.get("archive_sheet_name") or ""),
+            )
+        )
+    if len({c.name for c in out}) != len(out):
+        raise ValueError("campaign names in campaigns.yml must be unique")
+    return out
+
+
+class SharedCrawl:
+    """One crawl shared by concurrently running campaigns.
+
+    Each site (by domain) is fetched at most once per invocation: the first campaign to ask
+    crawls it, later ones wait for and reuse that result. `fetch_slots` caps concurrent site
+    crawls across all campaigns, so N campaigns do not mean N times the crawl workers.
+    """
+
+    def __init__(self, crawl_fn: Callable[..., Dict[str, Any] | None], fetch_slots: int = 8):
+        self.crawl_fn = crawl_fn
+        self._slots = threading.BoundedSemaphore(max(fetch_slots, 1))
+        self._lock = threading.Lock()
+        self._results: Dict[str, Future] = {}
+        self.crawled = 0
+        self.reused = 0
+
+    def crawl(self, item: Dict[str, Any], **kwargs: Any) -> Dict[str, Any] | None:
+        from dap.urls import canonical_url
+
+        key = item.get("domain") or canonical_url(item.get("url") or "")
+        with self._lock:
+            fut = self._results.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._results[key] = Future()
+        if not owner:
+            r = fut.result()
+            with self._lock:
+                self.reused += 1
+            # same site, but joined to this campaign's row by its own URL; no requests spent
+            return dict(r, url=canonical_url(item.get("url") or "") or r["url"], fetch_count=0) if r else r
+        try:
+            with self._slots:
+                r = self.crawl_fn(item, **kwargs)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        fut.set_result(r)
+        with self._lock:
+            self.crawled += 1
+        return r
+
+
+@dataclass
+class Shared:
+    """What campaign runs share (see the `shared` handling in run_daily.run)."""
+
+    tracer: Tracer
+    parse_pool: Any
+    crawl: Callable[..., Dict[str, Any] | None]
+    suppression: Any  # one SuppressionIndex: an address one campaign adds is seen by the others at once
+
+
+def run_campaigns(campaigns: List[Campaign], run_argv: List[str], fetch_slots: int = 8) -> Dict[str, int]:
+    """Runs run_daily for every campaign concurrently in this process. Returns {campaign: exit code}."""
+    from dap.crawler import crawl_one
+    from dap.parse_pool import ParsePool
+    from dap.run_daily import build_parser, run
+    from dap.suppression import SuppressionIndex
+
+    base = build_parser().parse_args(run_argv)
+    tracer = start_run(f"campaigns-{uuid.uuid4()}")
+    crawl = SharedCrawl(crawl_one, fetch_slots=fetch_slots)
+
+    with ParsePool(base.parse_workers, chunk_size=base.parse_chunk_size) as parse_pool, SuppressionIndex() as suppression:
+        shared = Shared(tracer=tracer, parse_pool=parse_pool, crawl=crawl.crawl, suppression=suppression)
+
+        def run_one(c: Campaign) -> int:
+            args = build_parser().parse_args(run_argv)
+            args.campaign = c.name
+            args.packs = c.packs
+            args.sheets_config = c.sheets_config()
+            args.shared = shared
+            args.metrics_file = ""  # one textfile per invocation would be overwritten by each campaign
+            print(f"campaign={c.name} spreadsheet={c.spreadsheet_id} packs={','.join(c.packs)}")
+            return run(args)
+
+        # one thread per campaign: their Sheets reads and writes overlap
+        with ThreadPoolExecutor(max(len(campaigns), 1), thread_name_prefix="dap-campaign") as ex:
+            futures = {c.name: ex.submit(run_one, c) for c in campaigns}
+            codes = {}
+            for name, fut in futures.items():
+                try:
+                    codes[name] = fut.result()
+                except Exception as e:
+                    print(f"ERROR campaign={name} err={e}")
+                    codes[name] = 1
+
+    print(f"campaigns={len(campaigns)} sites_crawled={crawl.crawled} sites_shared={crawl.reused} trace={tracer.write_json()}")
+    return codes
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run several DAP campaigns (config/campaigns.yml) in one process. Unknown options are passed to run_daily.",
+    )
+    parser.add_argument("--config", default="", help="Campaigns file (default: config/campaigns.yml).")
+    parser.add_argument("--campaign", action="append", default=[], help="Run only this campaign (repeatable).")
+    parser.add_argument("--fetch-slots", type=int, default=8, help="Concurrent site crawls shared by all campaigns.")
+    args, run_argv = parser.parse_known_args(argv)
+
+    campaigns = load_campaigns(Path(args.config) if args.config else None)
+    if args.campaign:
+        unknown = set(args.campaign) - {c.name for c in campaigns}
+        if unknown:
+            parser.error(f"unknown or disabled campaign(s): {', '.join(sorted(unknown))}")
+        campaigns = [c for c in campaigns if c.name in args.campaign]
+    if not campaigns:
+        print("no enabled campaigns")
+        return 0
+
+    codes = run_campaigns(campaigns, run_argv, fetch_slots=args.fetch_slots)
+    for name, code in codes.items():
+        print(f"campaign={name} exit_code={code}")
+    return max(codes.values())
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+# dap/content_cache.py
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict
+
+from dap.state import state_dir
+
+
+class ContentHashCache:
+    """Local url -> content hash store, used by `enrich` to skip unchanged pages.
+
+    Changes are kept in memory until `save()`; call it only after the run's writes
+    have succeeded, so a failed write never leaves a page marked as already enriched.
+    """
+
+    def __init__(self, path: Path, hashes: Dict[str, str] | None = None):
+        self.path = path
+        self.hashes: Dict[str, str] = dict(hashes or {})
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "ContentHashCache":
+        path = path or state_dir() / "content_hashes.json"
+        hashes = {}
+        if path.exists():
+            hashes = json.loads(path.read_text(encoding="utf-8") or "{}")
+        return cls(path, hashes)
+
+    def get(self, url: str) -> str:
+        return self.hashes.get(url, "")
+
+    def set(self, url: str, content_hash: str) -> None:
+        if content_hash and self.hashes.get(url) != content_hash:
+            self.hashes[url] = content_hash
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.hashes, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.path)
+        self.dirty = False
@@ -1,113 +1,210 @@
 from __future__ import annotations
 
+import hashlib
 import re
 import urllib.error
 import urllib.request
-from urllib.parse import urlsplit, urlunsplit
+from urllib.parse import urlsplit
+
+from dap.tracing import get_tracer
+from dap.urls import canonical_url
 
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
 
 _EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_TEL_HREF_RE = re.compile(r"""href=["']tel:([^"']+)["']""", re.I)
+_PHONE_RE = re.compile(r"(?<![\w+])(?:\+\d{1,3}[\s.-]?)?\(?\d{2,4}\)?[\s.-]\d{3,4}[\s.-]\d{3,4}(?![\w])")
+_HTML_LANG_RE = re.compile(r"""<html\b[^>]*?\blang\s*=\s*["']?([A-Za-z]{2,3}(?:[-_][A-Za-z0-9]{2,8})*)""", re.I)
 
 
-def run(items, timeout_s: int = 10):
-    """Fetch pages and extract emails.
-
-    items: list[dict] where each item has at least {"url": "https://..."}
-    Returns list[dict] with keys: url, status, title, description, primary_email, all_emails
-    """
-
-    def fetch(u: str):
-        req = urllib.request.Request(u, headers={"User-Agent": USER_AGENT})
+def _fetch(u: str, timeout_s: int):
+    """Raw (status, body bytes); parsing is separate so it can run off the fetch threads."""
+    req = urllib.request.Request(u, headers={"User-Agent": USER_AGENT})
+    with get_tracer().span("fetch", host=urlsplit(u).netloc.lower(), url=u) as sp:
         with urllib.request.urlopen(req, timeout=timeout_s) as resp:
-            html0 = resp.read().decode("utf-8", errors="ignore")
+            body = resp.read()
             status0 = getattr(resp, "status", 200)
+        sp["attrs"]["bytes"] = len(body)
+        sp["attrs"]["status"] = status0
+    return status0, body
+
+
+def extract_title(html: str) -> str:
+    lo = html.lower()
+    start = lo.find("<title>")
+    end = lo.find("</title>")
+    if start != -1 and end != -1 and end > start:
+        return html[start + 7 : end].strip()
+    return ""
+
 
-        # strip scripts/styles
-        html1 = re.sub(r"<script.*?>.*?</script>", " ", html0, flags=re.S | re.I)
-        html1 = re.sub(r"<style.*?>.*?</style>", " ", html1, flags=re.S | re.I)
-
-        # visible-ish text
-        text0 = re.sub(r"<[^>]+>", " ", html1)
-        text0 = re.sub(r"\s+", " ", text0).strip()
-        return status0, html1, text0
-
-    def extract_title(html: str) -> str:
-        lo = html.lower()
-        start = lo.find("<title>")
-        end = lo.find("</title>")
-        if start != -1 and end != -1 and end > start:
-            return html[start + 7 : end].strip()
+def extract_description(html: str) -> str:
+    lo = html.lower()
+    marker = 'name="description"'
+    idx = lo.find(marker)
+    if idx == -1:
         return ""
+    content_idx = lo.find("content=", idx)
+    if content_idx == -1:
+        return ""
+    quote = html[content_idx + 8 : content_idx + 9]
+    if quote not in ("\"", "'"):
+        return ""
+    endq = html.find(quote, content_idx + 9)
+    if endq == -1:
+        return ""
+    return html[content_idx + 9 : endq].strip()
+
+
+def extract_emails(text: str) -> list[str]:
+    return sorted(set(_EMAIL_RE.findall(text or "")))
+
+
+def _normalize_phone(raw: str) -> str:
+    digits = re.sub(r"\D", "", raw)
+    if not 8 <= len(digits) <= 15:
+        return ""
+    return ("+" if raw.strip().startswith("+") else "") + digits
+
 
-    def extract_description(html: str) -> str:
-        lo = html.lower()
-        marker = 'name="description"'
-        idx = lo.find(marker)
-        if idx == -1:
-            return ""
-        content_idx = lo.find("content=", idx)
-        if content_idx == -1:
-            return ""
-        quote = html[content_idx + 8 : content_idx + 9]
-        if quote not in ("\"", "'"):
-            return ""
-        endq = html.find(quote, content_idx + 9)
-        if endq == -1:
-            return ""
-        return html[content_idx + 9 : endq].strip()
-
-    def extract_emails(text: str) -> list[str]:
-        return sorted(set(_EMAIL_RE.findall(text or "")))
-
-    results = []
+def extract_phones(html: str, text: str) -> list[str]:
+    """Phone numbers from tel: links and phone-shaped text, normalized to digits (with leading +)."""
+    seen: dict[str, None] = {}
+    for raw in _TEL_HREF_RE.findall(html or "") + _PHONE_RE.findall(text or ""):
+        phone = _normalize_phone(raw)
+        if phone:
+            seen.setdefault(phone, None)
+    return list(seen)
 
+
+def extract_language(html: str) -> str:
+    m = _HTML_LANG_RE.search(html or "")
+    return m.group(1).lower().replace("_", "-") if m else ""
+
+
+def parse_page(body: bytes) -> dict:
+    """Extracts everything the crawl keeps from one page's raw bytes.
+
+    Pure CPU work (regex stripping and extraction, company-name cleaning) with a compact,
+    picklable result, so dap.parse_pool can run it in worker processes.
+    """
+    from dap.enrich import company_name_cleaner
+
+    html0 = body.decode("utf-8", errors="ignore")
+
+    # strip scripts/styles
+    html1 = re.sub(r"<script.*?>.*?</script>", " ", html0, flags=re.S | re.I)
+    html1 = re.sub(r"<style.*?>.*?</style>", " ", html1, flags=re.S | re.I)
+
+    # visible-ish text
+    text0 = re.sub(r"<[^>]+>", " ", html1)
+    text0 = re.sub(r"\s+", " ", text0).strip()
+
+    title = extract_title(html1)
+    return {
+        "title": title,
+        "company_name": company_name_cleaner().clean(title),
+        "description": extract_description(html1),
+        "emails": extract_emails(text0),
+        "phones": extract_phones(html1, text0),
+        "language": extract_language(html1),
+        "content_hash": hashlib.sha1(body).hexdigest(),
+    }
+
+
+def parse_pages(bodies: list[bytes]) -> list[dict]:
+    """Batch `parse_page`, one inter-process round trip per chunk."""
+    return [parse_page(b) for b in bodies]
+
+
+def crawl_one(item, timeout_s: int = 10, parse=parse_page):
+    """Fetches one site (plus contact-page fallbacks) and returns its result dict, or None if it has no url.
+
+    `parse` turns raw page bytes into a `parse_page` dict (e.g. dap.parse_pool.ParsePool.parse).
+    """
+    url = canonical_url(item.get("url") or "")
+    if not url:
+        return None
+    fetches = 1  # HTTP requests spent on this site (for --request-budget)
+
+    try:
+        status, body = _fetch(url, timeout_s)
+        page = parse(body)
+        emails = page["emails"]
+        phones = list(page["phones"])
+        hashes = [page["content_hash"]]
+
+        # fallback: common contact paths
+        if not emails:
+            for path in ("/contact", "/contact-us", "/contact/", "/contact-us/"):
+                try:
+                    fetches += 1
+                    contact = parse(_fetch(url + path, timeout_s)[1])
+                    hashes.append(contact["content_hash"])
+                    emails = contact["emails"]
+                    phones += [ph for ph in contact["phones"] if ph not in phones]
+                    if emails:
+                        break
+                except Exception:
+                    continue
+
+        primary_email = emails[0] if emails else ""
+        # covers the contact pages read too, so a contact page that changed under an
+        # unchanged homepage is not skipped as "unchanged" by dap.enrich
+        content_hash = hashes[0] if len(hashes) == 1 else hashlib.sha1("|".join(hashes).encode()).hexdigest()
+
+        return {
+            "url": url,
+            "status": status,
+            "title": page["title"],
+            "company_name": page["company_name"],
+            "description": page["description"],
+            "primary_email": primary_email,
+            "all_emails": ",".join(emails),
+            "content_hash": content_hash,
+            "phone_numbers": ",".join(phones),
+            "language": page["language"],
+            "http_status": str(status),
+            "scrape_error": "",
+            "fetch_count": fetches,
+        }
+
+    except urllib.error.HTTPError as e:
+        return {
+            "url": url,
+            "status": e.code,
+            "primary_email": "",
+            "all_emails": "",
+            "http_status": str(e.code),
+            "scrape_error": type(e).__name__,
+            "fetch_count": fetches,
+        }
+    except Exception as e:
+        return {
+            "url": url,
+            "status": "error",
+            "error": str(e)[:200],
+            "primary_email": "",
+            "all_emails": "",
+            "http_status": "",
+            "scrape_error": type(e).__name__,
+            "fetch_count": fetches,
+        }
+
+
+def iter_run(items, timeout_s: int = 10, parse=parse_page):
+    """Like `run`, but yields each result as soon as its site is crawled."""
     for item in items:
-        raw_url = (item.get("url") or "").strip()
-        if not raw_url:
-            continue
-        parts = urlsplit(raw_url)
-        url = urlunsplit((parts.scheme, parts.netloc, "", "", ""))
-
-        try:
-            status, html, text = fetch(url)
-            title = extract_title(html)
-            description = extract_description(html)
-
-            emails = extract_emails(text)
-
-            # fallback: common contact paths
-            if not emails:
-                parts = urlsplit(url)
-                base = urlunsplit((parts.scheme, parts.netloc, "", "", ""))
-                for path in ("/contact", "/contact-us", "/contact/", "/contact-us/"):
-                    try:
-                        _, _, t2 = fetch(base + path)
-                        emails = extract_emails(t2)
-                        if emails:
-                            break
-                    except Exception:
-                        continue
-
-            primary_email = emails[0] if emails else ""
-
-            results.append(
-                {
-                    "url": url,
-                    "status": status,
-                    "title": title,
-                    "description": description,
-                    "primary_email": primary_email,
-                    "all_emails": ",".join(emails),
-                }
-            )
-
-        except urllib.error.HTTPError as e:
-            results.append({"url": url, "status": e.code, "primary_email": "", "all_emails": ""})
-        except Exception as e:
-            results.append({"url": url, "status": "error", "error": str(e)[:200], "primary_email": "", "all_emails": ""})
-
-    return results
+        result = crawl_one(item, timeout_s, parse)
+        if result is not None:
+            yield result
 
 
+def run(items, timeout_s: int = 10, parse=parse_page):
+    """Fetch pages and extract emails.
 
+    items: list[dict] where each item has at least {"url": "https://..."}
+    Returns list[dict] with keys: url, status, title, company_name, description, primary_email, all_emails,
+    content_hash, plus the optional v1.1 fields phone_numbers, language, http_status, scrape_error
+    """
+    return list(iter_run(items, timeout_s, parse))
@@ -4,10 +4,28 @@ import os
 from typing import Dict, List
 import requests
 
+from dap.tracing import get_tracer
+
 
 SERPER_ENDPOINT = "https://google.serper.dev/search"
 
 
+_session: requests.Session | None = None
+
+
+def _http() -> requests.Session:
+    # one pooled keep-alive session per process instead of a new connection per query
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def _endpoint() -> str:
+    # DAP_SERPER_ENDPOINT points discovery at a stand-in (e.g. benchmarks/fakes.py)
+    return os.getenv("DAP_SERPER_ENDPOINT", "").strip() or SERPER_ENDPOINT
+
+
 def serper_search(query: str, limit: int = 10) -> List[Dict]:
     """
     Returns items like:
@@ -20,9 +38,12 @@ def serper_search(query: str, limit: int = 10) -> List[Dict]:
     payload = {"q": query, "num": min(max(limit, 1), 100)}
     headers = {"X-API-KEY": api_key, "Content-Type": "application/json"}
 
-    r = requests.post(SERPER_ENDPOINT, json=payload, headers=headers, timeout=30)
-    r.raise_for_status()
-    data = r.json() or {}
+    with get_tracer().span("serper.search", query=query) as sp:
+        r = _http().post(_endpoint(), json=payload, headers=headers, timeout=30)
+        sp["attrs"]["status"] = r.status_code
+        sp["attrs"]["bytes"] = len(r.content or b"")
+        r.raise_for_status()
+        data = r.json() or {}
 
     organic = data.get("organic") or []
     out: List[Dict] = []
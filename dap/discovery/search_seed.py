@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List
+
+from dap.urls import normalize_url, registrable_domain, url_key
 
 
 def _repo_root() -> Path:
@@ -11,7 +13,12 @@ def _repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
+# (mtime, parsed) of keywords.yml; re-parsed only when the file changes (long-running `dap.serve`)
+_keywords_cache: tuple[float, Dict] | None = None
+
+
 def _load_keywords_yml() -> Dict:
+    global _keywords_cache
     try:
         import yaml  # type: ignore
     except Exception as e:
@@ -21,46 +28,17 @@ def _load_keywords_yml() -> Dict:
     if not path.exists():
         raise FileNotFoundError(f"keywords.yml not found at: {path}")
 
+    mtime = path.stat().st_mtime
+    if _keywords_cache is not None and _keywords_cache[0] == mtime:
+        return _keywords_cache[1]
+
     data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
     if "packs" not in data or not isinstance(data["packs"], list):
         raise ValueError("keywords.yml must contain top-level key: packs: [ ... ]")
+    _keywords_cache = (mtime, data)
     return data
 
 
-def _normalize_url(url: str) -> str:
-    from urllib.parse import urlsplit, urlunsplit
-
-    u = (url or "").strip()
-    if not u:
-        return ""
-    if u.startswith("//"):
-        u = "https:" + u
-    if not u.startswith(("http://", "https://")):
-        u = "https://" + u
-
-    parts = urlsplit(u)
-    scheme = parts.scheme.lower() or "https"
-    netloc = parts.netloc
-    path = parts.path or "/"
-
-    # drop query + fragment (tracking)
-    return urlunsplit((scheme, netloc, path, "", ""))
-
-
-def _domain_from_url(url: str) -> str:
-    from urllib.parse import urlsplit
-
-    parts = urlsplit(url)
-    host = (parts.netloc or "").strip().lower()
-    if "@" in host:
-        host = host.split("@", 1)[1]
-    if ":" in host:
-        host = host.split(":", 1)[0]
-    if host.startswith("www."):
-        host = host[4:]
-    return host
-
-
 def _is_blocked_domain(domain: str) -> bool:
     d = (domain or "").strip().lower()
     if not d:
@@ -111,14 +89,40 @@ def _is_blocked_domain(domain: str) -> bool:
     return False
 
 
-def discover(cfg, dry_run: bool = False) -> List[Dict]:
+def snippet_contacts(title: str, snippet: str, domain: str = "") -> tuple[List[str], List[str]]:
+    """(emails, phones) shown in a search result's title/snippet.
+
+    Addresses cut off by the snippet ("info@acme.co...") are dropped; addresses on the
+    result's own domain come first.
+    """
+    from dap.crawler import extract_emails, extract_phones
+
+    text = f"{title or ''} {snippet or ''}"
+    emails = [e for e in extract_emails(text) if not text.split(e, 1)[1].startswith(("...", "\u2026"))]
+    emails.sort(key=lambda e: registrable_domain(e.rsplit("@", 1)[1]) != domain)
+    return emails, extract_phones("", text)
+
+
+def discover(cfg, dry_run: bool = False, shard=None, packs=None) -> List[Dict]:
     """Phase 1 — Keyword discovery.
 
     Executes Serper searches for enabled keyword packs and returns seed candidates:
-      {"url": "https://...", "domain": "example.com", "source_keyword": "...", "query": "...", "pack": "..."}
+      {"url": "https://...", "domain": "example.com", "source_keyword": "...", "query": "...", "pack": "...",
+       "title": "...", "snippet": "...", "emails": [...], "phones": [...]}
+
+    `emails`/`phones` are read from the result's title and snippet (see `snippet_contacts`).
 
     This function does NOT write to Sheets.
     """
+    return list(iter_discover(cfg, dry_run=dry_run, shard=shard, packs=packs))
+
+
+def iter_discover(cfg, dry_run: bool = False, shard=None, packs=None) -> Iterator[Dict]:
+    """Like `discover`, but yields each candidate as soon as its search returns.
+
+    With a `shard` (dap.sharding.Shard), only the queries that hash to it are run.
+    With `packs` (pack names, e.g. a campaign's), only those enabled packs are searched.
+    """
 
     from dap.discovery.provider_serper import serper_search
 
@@ -133,6 +137,8 @@ def discover(cfg, dry_run: bool = False) -> List[Dict]:
             continue
 
         pack_name = str(pack.get("name") or "").strip() or "unnamed_pack"
+        if packs is not None and pack_name not in packs:
+            continue
         keywords = pack.get("keywords") or []
         geo = pack.get("geo") or []
 
@@ -150,9 +156,11 @@ def discover(cfg, dry_run: bool = False) -> List[Dict]:
             else:
                 queries.append({"query": kw_s, "pack": pack_name, "source_keyword": kw_s})
 
-    # Execute searches and collect candidates (domain-level unique within this function)
+    if shard is not None:
+        queries = [q for q in queries if shard.owns(q["query"])]
+
+    # Execute searches and yield candidates (domain-level unique within this function)
     seen_domains = set()
-    out: List[Dict] = []
 
     for q in queries:
         results = serper_search(q["query"], limit=10)
@@ -161,25 +169,28 @@ def discover(cfg, dry_run: bool = False) -> List[Dict]:
             if not link:
                 continue
 
-            norm_url = _normalize_url(link)
-            domain = _domain_from_url(norm_url)
+            norm_url = normalize_url(link)
+            domain = registrable_domain(norm_url)
             if not domain:
                 continue
-            if _is_blocked_domain(domain):
+            if _is_blocked_domain(url_key(norm_url)) or _is_blocked_domain(domain):
                 continue
 
             if domain in seen_domains:
                 continue
             seen_domains.add(domain)
 
-            out.append(
-                {
-                    "url": norm_url,
-                    "domain": domain,
-                    "source_keyword": q["source_keyword"],
-                    "query": q["query"],
-                    "pack": q["pack"],
-                }
-            )
-
-    return out
+            title = item.get("title") or ""
+            snippet = item.get("snippet") or ""
+            emails, phones = snippet_contacts(title, snippet, domain)
+            yield {
+                "url": norm_url,
+                "domain": domain,
+                "source_keyword": q["source_keyword"],
+                "query": q["query"],
+                "pack": q["pack"],
+                "title": title,
+                "snippet": snippet,
+                "emails": emails,
+                "phones": phones,
+            }
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Set
+from typing import Any, Callable, Container, Dict, List, Set
+
+from dap.suppression import normalize_email
 
 
 def _utc_now_iso() -> str:
@@ -12,11 +14,11 @@ def send_emails(
     cfg: Any,
     prospects: List[Dict[str, Any]],
     updates: List[Dict[str, Any]],
-    contacted_emails: Set[str],
+    contacted_emails: Container[str],
 ) -> Dict[str, Any]:
     """Builds the email send queue AND the sheet log updates.
 
-    NOTE: This function still does NOT send SMTP. It only prepares:
+    NOTE: This function does NOT send SMTP (see `deliver_emails`). It only prepares:
       - to_email: list of {prospect, email}
       - log_updates: list of row updates keyed by website_url
     """
@@ -34,8 +36,15 @@ def send_emails(
         raw = p.get("all_emails") or p.get("primary_email") or ""
         emails = [e.strip() for e in raw.split(",") if e.strip()]
 
-        # only take emails we haven't contacted
-        selected = [e for e in emails if e not in contacted_emails]
+        # only take emails we haven't contacted (compared normalized: case, plus-tags, suppressed domains)
+        selected = []
+        seen: Set[str] = set()
+        for e in emails:
+            key = normalize_email(e)
+            if not key or key in seen or key in contacted_emails:
+                continue
+            seen.add(key)
+            selected.append(e)
         if not selected:
             continue
 
@@ -53,3 +62,93 @@ def send_emails(
         )
 
     return {"to_email": to_email, "log_updates": log_updates}
+
+
+def build_log_updates(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Builds one sheet row update per prospect from send outcomes.
+
+    entries: list of {website_url, email, ok, message_id, error, at}
+    """
+    by_url: Dict[str, Dict[str, Any]] = {}
+    for e in entries:
+        acc = by_url.setdefault(e["website_url"], {"sent": [], "ids": [], "errors": [], "at": ""})
+        if e["ok"]:
+            acc["sent"].append(e["email"])
+            acc["ids"].append(e.get("message_id", ""))
+        else:
+            acc["errors"].append(f"{e['email']}: {e.get('error', '')}")
+        acc["at"] = max(acc["at"], e.get("at") or _utc_now_iso())
+
+    log_updates: List[Dict[str, Any]] = []
+    for url, acc in by_url.items():
+        if acc["sent"]:
+            log_updates.append(
+                {
+                    "website_url": url,
+                    "status": "contacted",
+                    "send_status": "sent",
+                    "last_emailed_at": acc["at"],
+                    "email_sent_at": acc["at"],
+                    "emailed_to": ",".join(acc["sent"]),
+                    "email_provider_message_id": ",".join(i for i in acc["ids"] if i),
+                }
+            )
+        else:
+            log_updates.append(
+                {
+                    "website_url": url,
+                    "send_status": "failed",
+                    "notes": f"email failed: {'; '.join(acc['errors'])}"[:300],
+                }
+            )
+    return log_updates
+
+
+def deliver_emails(
+    to_email: List[Dict[str, Any]],
+    sender: Any,
+    template: Dict[str, str],
+    on_result: Callable[[Dict[str, Any], Any], None] | None = None,
+) -> Dict[str, Any]:
+    """Sends the queue built by `send_emails` and builds the matching sheet log updates.
+
+    sender: an SmtpSender (see dap.smtp_sender).
+    on_result: optional callback(item, SendResult), called as soon as each message finishes.
+    Returns:
+      - results: list of SendResult, aligned with to_email
+      - sent_count: number of messages accepted by the SMTP server
+      - log_updates: one row update per prospect, keyed by website_url
+    """
+    from dap.smtp_sender import build_message
+
+    messages = []
+    for x in to_email:
+        p = x["prospect"]
+        fields = dict(p)
+        fields["email"] = x["email"]
+        messages.append(build_message(sender.cfg.from_addr, x["email"], template, fields))
+
+    callback = None
+    if on_result is not None:
+        callback = lambda i, res: on_result(to_email[i], res)  # noqa: E731
+
+    results = sender.send(messages, on_result=callback)
+    now = _utc_now_iso()
+
+    entries = [
+        {
+            "website_url": x["prospect"].get("website_url", ""),
+            "email": x["email"],
+            "ok": res.ok,
+            "message_id": res.message_id,
+            "error": res.error,
+            "at": now,
+        }
+        for x, res in zip(to_email, results)
+    ]
+
+    return {
+        "results": results,
+        "sent_count": sum(1 for r in results if r.ok),
+        "log_updates": build_log_updates(entries),
+    }
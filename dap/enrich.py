@@ -1,80 +1,238 @@
 # dap/enrich.py
 
-from urllib.parse import urlsplit, urlunsplit
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, List
 from datetime import datetime
 import html
 import re
 
+from dap.urls import canonical_url, url_key
 
-def enrich(prospects, crawl_results):
-    updates = []
 
-    def _clean_company_name(t: str) -> str:
+_TITLE_SPLIT_RE = re.compile(r"\s*(?:\||—|–| - | :: | : )\s*")
+_WS_RE = re.compile(r"\s+")
+
+_DEFAULT_NAME_WORDS = {
+    "generic_words": ["attorney", "attorneys", "lawyer", "lawyers", "immigration", "criminal", "defense"],
+    "geo_words": ["New Orleans", "Louisiana", "Baton Rouge", "Alexandria", "Lafayette"],
+    "include_keyword_pack_geo": False,
+    "brand_words": ["law", "llc", "pllc", "pc", "inc", "ltd", "group", "firm", "partners", "associates", "network"],
+    "strip_suffixes": ["homepage", "home"],
+}
+
+
+def _word_re(words: Iterable[str]) -> re.Pattern | None:
+    # multi-word terms ("New Orleans") match across any whitespace; lookarounds rather than \b
+    # so terms that start or end with punctuation ("C++") still match as whole words
+    alts = {r"\s+".join(re.escape(part) for part in str(w).split()) for w in words if str(w).strip()}
+    alts = sorted(alts, key=len, reverse=True)
+    if not alts:
+        return None
+    return re.compile(r"(?<!\w)(" + "|".join(alts) + r")(?!\w)", re.I)
+
+
+class CompanyNameCleaner:
+    """Picks the brand-looking chunk of a page title (e.g. "Zollinger Law").
+
+    Patterns are compiled once from word lists (config/company_names.yml) and results
+    are memoized, since the same titles repeat across sites and runs. Words match
+    literally (regex characters are escaped); a malformed config raises ValueError
+    when the cleaner is built.
+    """
+
+    def __init__(
+        self,
+        generic_words: Iterable[str],
+        brand_words: Iterable[str],
+        strip_suffixes: Iterable[str] = ("homepage", "home"),
+        max_memo: int = 100_000,
+    ):
+        self._generic_re = _word_re(generic_words)
+        self._brand_re = _word_re(brand_words)
+        suffix = _word_re(strip_suffixes)
+        self._suffix_re = re.compile(r"\s*" + suffix.pattern + r"\s*$", re.I) if suffix else None
+        self._memo: Dict[str, str] = {}
+        self._max_memo = max_memo
+
+    @classmethod
+    def from_config(cls, path: Path | None = None) -> "CompanyNameCleaner":
+        words = dict(_DEFAULT_NAME_WORDS)
+        path = path or Path(__file__).resolve().parents[1] / "config" / "company_names.yml"
+        if path.exists():
+            import yaml  # type: ignore
+
+            data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+            if not isinstance(data, dict):
+                raise ValueError(f"{path.name} must be a mapping of word lists")
+            for key, val in data.items():
+                if key not in _DEFAULT_NAME_WORDS:
+                    raise ValueError(f"{path.name}: unknown key {key!r} (expected one of {', '.join(_DEFAULT_NAME_WORDS)})")
+                if key == "include_keyword_pack_geo":
+                    continue
+                # a bare string would otherwise be matched character by character
+                if val is not None and (not isinstance(val, list) or not all(isinstance(w, str) for w in val)):
+                    raise ValueError(f"{path.name}: {key} must be a list of words, got {val!r}")
+            words.update(data)
+
+        generic = list(words.get("generic_words") or []) + list(words.get("geo_words") or [])
+        if words.get("include_keyword_pack_geo"):
+            from dap.discovery.search_seed import _load_keywords_yml
+
+            for pack in _load_keywords_yml().get("packs", []):
+                if isinstance(pack, dict):
+                    generic.extend(str(g) for g in (pack.get("geo") or []))
+
+        return cls(generic, words.get("brand_words") or [], words.get("strip_suffixes") or [])
+
+    def has_brand_word(self, s: str) -> bool:
+        return self._brand_re is not None and self._brand_re.search(s or "") is not None
+
+    def _score(self, s: str) -> int:
+        sc = 0
+        if self._brand_re is not None and self._brand_re.search(s):
+            sc += 5
+        if self._generic_re is None or not self._generic_re.search(s):
+            sc += 3
+        if any(ch.isupper() for ch in s):
+            sc += 1
+        if len(s) <= 40:
+            sc += 2
+        elif len(s) <= 60:
+            sc += 1
+        return sc
+
+    def _clean(self, t: str) -> str:
         t = html.unescape((t or "").strip())
         if not t:
             return ""
 
-        # Split on common title separators into chunks
-        chunks = [c.strip() for c in re.split(r"\s*(?:\||—|–| - | :: | : )\s*", t) if c.strip()]
+        # Split on common title separators into whitespace-normalized chunks
+        chunks = [_WS_RE.sub(" ", c).strip() for c in _TITLE_SPLIT_RE.split(t)]
+        chunks = [c for c in chunks if c]
         if not chunks:
             return ""
 
-        # Heuristic: prefer the chunk that looks like a real brand name (e.g., "Zollinger Law")
-        generic_re = re.compile(r"\b(attorney|attorneys|lawyer|lawyers|immigration|criminal|defense|new\s+orleans|louisiana|baton\s+rouge|alexandria|lafayette)\b", re.I)
-        brand_re = re.compile(r"\b(law|llc|pllc|pc|inc|ltd|group|firm|partners|associates|network)\b", re.I)
-
-        def score(s: str) -> int:
-            s2 = re.sub(r"\s+", " ", s).strip()
-            sc = 0
-            if brand_re.search(s2):
-                sc += 5
-            if not generic_re.search(s2):
-                sc += 3
-            if any(ch.isupper() for ch in s2):
-                sc += 1
-            if len(s2) <= 40:
-                sc += 2
-            elif len(s2) <= 60:
-                sc += 1
-            return sc
-
-        best = max(chunks, key=score)
-        best = re.sub(r"\s*\b(homepage|home)\b\s*$", "", best, flags=re.I).strip()
-        best = re.sub(r"\s+", " ", best).strip()
+        best = max(chunks, key=self._score)
+        if self._suffix_re is not None:
+            best = self._suffix_re.sub("", best).strip()
         return best[:80]
 
-    def _norm(u: str) -> str:
-        u = (u or "").strip()
-        if not u:
-            return ""
-        p = urlsplit(u)
-        if not p.scheme:
-            p = urlsplit("https://" + u)
-        return urlunsplit((p.scheme, p.netloc, "", "", ""))
+    def clean(self, title: str) -> str:
+        hit = self._memo.get(title)
+        if hit is None:
+            hit = self._clean(title)
+            if len(self._memo) >= self._max_memo:
+                self._memo.clear()
+            self._memo[title] = hit
+        return hit
+
+    def clean_many(self, titles: Iterable[str]) -> List[str]:
+        clean = self.clean
+        return [clean(t) for t in titles]
+
+
+_cleaner: CompanyNameCleaner | None = None
 
-    by_url = {_norm(r.get("url")): r for r in (crawl_results or []) if r.get("url")}
+
+def company_name_cleaner() -> CompanyNameCleaner:
+    """Process-wide cleaner, built from config on first use."""
+    global _cleaner
+    if _cleaner is None:
+        _cleaner = CompanyNameCleaner.from_config()
+    return _cleaner
+
+
+def _is_crawl_failure(r) -> bool:
+    status = r.get("status")
+    return status == "error" or (isinstance(status, int) and status >= 400)
+
+
+def enrich(prospects, crawl_results, cache=None):
+    """Builds prospect row updates from crawl results.
+
+    If a result's `content_hash` matches the prospect's `content_hash` column or the
+    optional local `cache` (a ContentHashCache), the page is unchanged: only
+    `last_checked_at` (and the failure counter reset) is emitted.
+    """
+    updates = []
+
+    by_url = {url_key(r.get("url")): r for r in (crawl_results or []) if r.get("url")}
+    # crawl results parsed by dap.crawler.parse_page already carry company_name
+    titles = [r.get("title", "") for r in by_url.values() if "company_name" not in r]
+    company_names = dict(zip(titles, company_name_cleaner().clean_many(titles)))
 
     for p in prospects or []:
-        url = _norm(p.get("website_url"))
+        url = canonical_url(p.get("website_url"))
         if not url:
             continue
 
-        r = by_url.get(url)
+        r = by_url.get(url_key(url))
         if not r:
             continue
 
-        primary = (r.get("primary_email") or "").strip()
-        updates.append(
-            {
+        now = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+        content_hash = (r.get("content_hash") or "").strip()
+        prev_hash = (p.get("content_hash") or "").strip() or (cache.get(url) if cache is not None else "")
+        prev_fails = (p.get("crawl_fail_count") or "").strip()
+
+        if content_hash and content_hash == prev_hash:
+            # unchanged page, but still this crawl's outcome (clears an earlier error)
+            update = {
                 "website_url": url,
-                "company_name": _clean_company_name(r.get("title", "")),
-                "title": r.get("title", ""),
-                "description": r.get("description", ""),
-                "primary_email": primary,
-                "all_emails": r.get("all_emails", ""),
-                "contact_method": "email" if primary else "",
-                "last_checked_at": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+                "last_checked_at": now,
+                "http_status": r.get("http_status", ""),
+                "scrape_error": r.get("scrape_error", ""),
             }
-        )
+            if prev_fails not in ("", "0"):
+                update["crawl_fail_count"] = "0"
+            updates.append(update)
+            continue
+
+        primary = (r.get("primary_email") or "").strip()
+        update = {
+            "website_url": url,
+            "company_name": r["company_name"] if "company_name" in r else company_names.get(r.get("title", ""), ""),
+            "title": r.get("title", ""),
+            "description": r.get("description", ""),
+            "primary_email": primary,
+            "all_emails": r.get("all_emails", ""),
+            "contact_method": "email" if primary else "",
+            "last_checked_at": now,
+            # optional v1.1 columns; apply_enrichment skips any the sheet lacks
+            "phone_numbers": r.get("phone_numbers", ""),
+            "language": r.get("language", ""),
+            "http_status": r.get("http_status", ""),
+            "scrape_error": r.get("scrape_error", ""),
+        }
+        if content_hash:
+            update["content_hash"] = content_hash
+            if cache is not None:
+                cache.set(url, content_hash)
+
+        # Track consecutive crawl failures so dead sites can be archived
+        if _is_crawl_failure(r):
+            update["crawl_fail_count"] = str((int(prev_fails) if prev_fails.isdigit() else 0) + 1)
+        elif prev_fails not in ("", "0"):
+            update["crawl_fail_count"] = "0"
+
+        updates.append(update)
 
     return updates
+
+
+def enrich_stream(prospects, crawl_results, cache=None):
+    """Streaming `enrich`: yields (crawl_result, updates) as each crawl result arrives.
+
+    Prospects are indexed by URL once, so each result costs O(1) instead of a full scan.
+    """
+    by_url = {}
+    for p in prospects or []:
+        key = url_key(p.get("website_url"))
+        if key:
+            by_url.setdefault(key, []).append(p)
+
+    for r in crawl_results:
+        matches = by_url.get(url_key(r.get("url"))) if r.get("url") else None
+        yield r, (enrich(matches, [r], cache=cache) if matches else [])
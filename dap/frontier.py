@@ -0,0 +1,187 @@
+# dap/frontier.py
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from dap.pipeline import from_snippet
+from dap.sharding import row_domain
+from dap.state import state_dir
+
+
+@dataclass(frozen=True)
+class Weights:
+    """Score contributions; higher scores are crawled first."""
+
+    new_seed: float = 2.0  # never checked (fresh discovery)
+    stale_per_30d: float = 1.0  # per 30 days since last_checked_at, capped at 1 period
+    pack: float = 1.0  # times the pack `priority` from keywords.yml (default 1.0)
+    failure: float = -0.75  # per consecutive crawl failure
+    brand: float = 0.5  # company name / title looks like a business name
+    deferred: float = 0.5  # per earlier run that deferred this domain, capped at 3 runs
+    snippet_contact: float = -2.0  # phone already seeded from the search snippet (no email yet)
+
+
+def _parse_iso(s: str) -> datetime | None:
+    s = (s or "").strip()
+    if not s:
+        return None
+    try:
+        return datetime.fromisoformat(s.replace("Z", ""))
+    except ValueError:
+        return None
+
+
+def load_pack_priorities() -> Dict[str, float]:
+    """{source_keyword: pack priority}; packs may set `priority:` in keywords.yml (default 1.0)."""
+    from dap.discovery.search_seed import _load_keywords_yml
+
+    out: Dict[str, float] = {}
+    for pack in _load_keywords_yml().get("packs", []):
+        if not isinstance(pack, dict):
+            continue
+        prio = float(pack.get("priority", 1.0) or 0.0)
+        for kw in pack.get("keywords") or []:
+            kw_s = str(kw).strip().lower()
+            if kw_s:
+                out[kw_s] = max(out.get(kw_s, 0.0), prio)
+    return out
+
+
+class Prioritizer:
+    """Scores prospect rows from signals already on the sheet: source keyword/pack,
+    recency of the last check, past crawl failures, brand hints, and earlier deferrals."""
+
+    def __init__(
+        self,
+        pack_priority: Dict[str, float] | None = None,
+        deferred: Dict[str, Dict[str, Any]] | None = None,
+        weights: Weights = Weights(),
+        has_brand: Any = None,
+        now: datetime | None = None,
+    ):
+        self.pack_priority = pack_priority or {}
+        self.deferred = deferred or {}
+        self.w = weights
+        self.has_brand = has_brand or (lambda s: False)
+        self.now = now or datetime.utcnow()
+
+    @classmethod
+    def from_config(cls) -> "Prioritizer":
+        from dap.enrich import company_name_cleaner
+
+        return cls(load_pack_priorities(), load_deferred(), has_brand=company_name_cleaner().has_brand_word)
+
+    def score(self, row: Dict[str, Any]) -> float:
+        w = self.w
+        sc = 0.0
+
+        checked = _parse_iso(row.get("last_checked_at", ""))
+        if checked is None:
+            sc += w.new_seed
+        else:
+            sc += w.stale_per_30d * min(max((self.now - checked).days, 0) / 30.0, 1.0)
+
+        kw = (row.get("source_keyword") or "").strip().lower()
+        if kw:
+            sc += w.pack * self.pack_priority.get(kw, 1.0)
+
+        fails = (row.get("crawl_fail_count") or "").strip()
+        if fails.isdigit():
+            sc += w.failure * int(fails)
+
+        if self.has_brand(row.get("company_name") or row.get("title") or ""):
+            sc += w.brand
+
+        if from_snippet(row):
+            sc += w.snippet_contact
+
+        times = int(self.deferred.get(row_domain(row), {}).get("count", 0))
+        sc += w.deferred * min(times, 3)
+        return round(sc, 4)
+
+    def order(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Rows by descending score; ties keep sheet order."""
+        return sorted(rows, key=self.score, reverse=True)
+
+
+class Budget:
+    """Admission control for the crawl: wall-clock seconds since `started` and HTTP requests.
+
+    A zero limit means unlimited. Sites already being crawled finish; new ones are refused
+    once either limit is reached.
+    """
+
+    def __init__(self, time_s: float = 0.0, requests: int = 0, started: float | None = None):
+        self.time_s = time_s
+        self.requests = requests
+        self.started = time.monotonic() if started is None else started
+        self.used_requests = 0
+        self.reason = ""
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.time_s > 0 or self.requests > 0
+
+    def admit(self) -> bool:
+        with self._lock:
+            if self.reason:
+                return False
+            if self.time_s > 0 and time.monotonic() - self.started >= self.time_s:
+                self.reason = "time"
+            elif self.requests > 0 and self.used_requests >= self.requests:
+                self.reason = "requests"
+            return not self.reason
+
+    def charge(self, n: int) -> None:
+        with self._lock:
+            self.used_requests += n
+
+
+# run_daily runs of several campaigns share one process (dap.campaigns)
+_deferred_lock = threading.Lock()
+
+
+def _deferred_path() -> Path:
+    return state_dir() / "frontier_deferred.json"
+
+
+def load_deferred() -> Dict[str, Dict[str, Any]]:
+    path = _deferred_path()
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8") or "{}")
+
+
+def save_deferred(deferred: Iterable[Dict[str, Any]], crawled: Iterable[Dict[str, Any]], run_id: str = "") -> int:
+    """Records deferred crawl items (they score higher next run) and forgets crawled ones.
+    Returns the number of domains deferred by this run."""
+    with _deferred_lock:
+        return _save_deferred(deferred, crawled, run_id)
+
+
+def _save_deferred(deferred: Iterable[Dict[str, Any]], crawled: Iterable[Dict[str, Any]], run_id: str) -> int:
+    data = load_deferred()
+    for it in crawled:
+        data.pop(row_domain(it), None)
+    now = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+    n = 0
+    for it in deferred:
+        dom = row_domain(it)
+        if not dom:
+            continue
+        entry = data.setdefault(dom, {"count": 0})
+        entry.update(count=int(entry.get("count", 0)) + 1, url=it.get("url", ""), last_deferred_at=now, run_id=run_id)
+        n += 1
+    path = _deferred_path()
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    tmp.replace(path)
+    return n
@@ -0,0 +1,86 @@
+# dap/merge_runs.py
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from dap.pipeline import seed_row
+from dap.sharding import group_dir, merge_run_rows, read_shard_logs
+from dap.sheets.archive import ArchiveRules, archive_prospects, load_archive_index
+from dap.sheets.client import load_sheets_config
+from dap.sheets.writers import append_run_log, upsert_prospects
+from dap.urls import registrable_domain
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Combine the per-shard logs of a sharded run into one runs row.")
+    parser.add_argument("--run-group", required=True, help="Run group passed to the sharded run_daily processes.")
+    parser.add_argument("--shards", type=int, default=0, help="Shard count N the run was started with; every shard 0..N-1 must have reported.")
+    parser.add_argument("--allow-partial", action="store_true", help="Merge even if some shards have not reported.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the merged row without writing to Sheets.")
+    parser.add_argument("--no-archive", action="store_true", help="Skip archiving (sharded runs leave it to the merge).")
+    parser.add_argument("--archive-contacted-days", type=int, default=30)
+    parser.add_argument("--archive-max-failures", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    marker = group_dir(args.run_group) / "merged.json"
+    if marker.exists():
+        print(f"already merged run_group={args.run_group}")
+        return 0
+
+    logs = read_shard_logs(args.run_group)
+    if not logs:
+        print(f"ERROR no shard logs for run_group={args.run_group} in {group_dir(args.run_group)}")
+        return 1
+
+    counts = {int(x["shard"].split("/")[1]) for x in logs}
+    if args.shards:
+        counts.add(args.shards)
+    if len(counts) != 1:
+        print(f"ERROR shard logs disagree on shard count: {sorted(counts)}")
+        return 1
+    expected = counts.pop()
+    missing = sorted(set(range(expected)) - {int(x["shard"].split("/")[0]) for x in logs})
+    if missing and not args.allow_partial:
+        # shards on other hosts only show up here through a shared DAP_RUNS_DIR
+        print(f"ERROR missing shards {missing} of {expected} in {group_dir(args.run_group)} (use --allow-partial to merge anyway)")
+        return 1
+
+    row = merge_run_rows(args.run_group, [x["row"] for x in logs])
+    if missing:
+        row["top_error"] = (f"missing shards {missing}; " + row["top_error"])[:200]
+
+    # Domains a shard discovered but did not own; seeded here so no two shards write the same row
+    handoff = {}
+    for x in logs:
+        for d in x.get("handoff", []):
+            handoff.setdefault(registrable_domain(d.get("domain") or ""), d)
+    handoff.pop("", None)
+
+    if args.dry_run:
+        print(json.dumps(row, indent=1))
+        print(f"[DRY-RUN] would seed handoff={len(handoff)}")
+        return 0
+
+    cfg = load_sheets_config()
+    archived = load_archive_index(cfg)["domains"]
+    seeded = upsert_prospects(cfg, [seed_row(d) for dom, d in handoff.items() if dom not in archived], key="domain")
+    print(f"seeded_handoff={seeded}")
+
+    if not args.no_archive:
+        rules = ArchiveRules(
+            contacted_older_than_days=args.archive_contacted_days,
+            max_crawl_failures=args.archive_max_failures,
+        )
+        print(f"archived={archive_prospects(cfg, rules)}")
+
+    append_run_log(cfg, row)
+    marker.write_text(json.dumps(row), encoding="utf-8")
+    hosts = sorted({x.get("host", "") for x in logs} - {""})
+    print(f"merged run_group={args.run_group} shards={len(logs)}/{expected} hosts={','.join(hosts)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
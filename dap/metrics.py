@@ -0,0 +1,190 @@
+# dap/metrics.py
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from dap.state import state_dir
+from dap.tracing import Tracer
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+# Sheets API methods counted as reads; everything else under sheets.* is a write.
+_SHEETS_READS = {"get_all_values", "row_values", "col_values", "get", "batch_get", "open"}
+
+
+def _labels(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(key: LabelKey, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _fmt_num(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf"
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+
+class Registry:
+    """Minimal counters, gauges and histograms with Prometheus/OpenMetrics text output.
+
+    Counters and histograms are cumulative: `load()`/`save()` carry them across runs
+    (cron-style processes) so scrapers see monotonic series. Gauges describe the last run.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.help: Dict[str, str] = {}
+        self.types: Dict[str, str] = {}
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Dict[str, Any]]] = {}
+        self.buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def _declare(self, name: str, kind: str, help_text: str) -> None:
+        self.types.setdefault(name, kind)
+        self.help.setdefault(name, help_text)
+
+    def inc(self, name: str, help_text: str, value: float = 1.0, **labels: Any) -> None:
+        with self._lock:
+            self._declare(name, "counter", help_text)
+            series = self.counters.setdefault(name, {})
+            key = _labels(labels)
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, help_text: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._declare(name, "gauge", help_text)
+            self.gauges.setdefault(name, {})[_labels(labels)] = float(value)
+
+    def observe(self, name: str, help_text: str, value: float, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **labels: Any) -> None:
+        with self._lock:
+            self._declare(name, "histogram", help_text)
+            bks = self.buckets.setdefault(name, tuple(buckets))
+            h = self.histograms.setdefault(name, {}).setdefault(
+                _labels(labels), {"buckets": [0] * len(bks), "sum": 0.0, "count": 0}
+            )
+            for i, le in enumerate(bks):
+                if value <= le:
+                    h["buckets"][i] += 1
+            h["sum"] += value
+            h["count"] += 1
+
+    def render(self, openmetrics: bool = False) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self.types):
+                kind = self.types[name]
+                family = name[: -len("_total")] if openmetrics and kind == "counter" and name.endswith("_total") else name
+                lines.append(f"# HELP {family} {self.help[name]}")
+                lines.append(f"# TYPE {family} {kind}")
+                if kind == "counter":
+                    for key, v in sorted(self.counters.get(name, {}).items()):
+                        lines.append(f"{name}{_fmt_labels(key)} {_fmt_num(v)}")
+                elif kind == "gauge":
+                    for key, v in sorted(self.gauges.get(name, {}).items()):
+                        lines.append(f"{name}{_fmt_labels(key)} {_fmt_num(v)}")
+                else:
+                    bks = self.buckets[name]
+                    for key, h in sorted(self.histograms.get(name, {}).items()):
+                        for le, n in zip(bks, h["buckets"]):
+                            lines.append(f"{name}_bucket{_fmt_labels(key, [('le', _fmt_num(le))])} {n}")
+                        lines.append(f"{name}_bucket{_fmt_labels(key, [('le', '+Inf')])} {h['count']}")
+                        lines.append(f"{name}_sum{_fmt_labels(key)} {_fmt_num(h['sum'])}")
+                        lines.append(f"{name}_count{_fmt_labels(key)} {h['count']}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path, openmetrics: bool = False) -> None:
+        """Atomic write (tmp + rename), as the node-exporter textfile collector expects."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.render(openmetrics=openmetrics), encoding="utf-8")
+        tmp.replace(path)
+
+    # --- cumulative state ---------------------------------------------------
+
+    def save(self, path: Path | None = None) -> None:
+        path = path or state_dir() / "metrics_state.json"
+        with self._lock:
+            data = {
+                "help": self.help,
+                "types": self.types,
+                "counters": {n: [[list(map(list, k)), v] for k, v in s.items()] for n, s in self.counters.items()},
+                "histograms": {n: [[list(map(list, k)), h] for k, h in s.items()] for n, s in self.histograms.items()},
+                "buckets": {n: list(b) for n, b in self.buckets.items()},
+            }
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "Registry":
+        reg = cls()
+        path = path or state_dir() / "metrics_state.json"
+        if not path.exists():
+            return reg
+        data = json.loads(path.read_text(encoding="utf-8") or "{}")
+        for name, kind in data.get("types", {}).items():
+            if kind == "gauge":
+                continue
+            reg.types[name] = kind
+            reg.help[name] = data.get("help", {}).get(name, "")
+        for name, series in data.get("counters", {}).items():
+            reg.counters[name] = {tuple(map(tuple, k)): v for k, v in series}
+        for name, series in data.get("histograms", {}).items():
+            reg.histograms[name] = {tuple(map(tuple, k)): h for k, h in series}
+        reg.buckets = {n: tuple(b) for n, b in data.get("buckets", {}).items()}
+        return reg
+
+
+def record_run(registry: Registry, tracer: Tracer, counts: Dict[str, int], ok: bool) -> Registry:
+    """Folds one run's trace spans and final counts into `registry`."""
+    for s in list(tracer.spans):
+        name = s["name"]
+        secs = s["duration_ms"] / 1000.0
+        err = s.get("error", "")
+
+        if s["kind"] == "stage":
+            registry.observe("dap_stage_duration_seconds", "Pipeline stage duration.", secs, stage=name)
+        elif name == "fetch":
+            registry.inc("dap_fetches_total", "Page fetches.", outcome="error" if err else "ok")
+            registry.observe("dap_fetch_duration_seconds", "Page fetch latency.", secs)
+            registry.inc("dap_fetch_bytes_total", "Bytes fetched.", float(s["attrs"].get("bytes", 0) or 0))
+            if err:
+                registry.inc("dap_fetch_errors_total", "Page fetch errors by class.", error_class=err)
+        elif name == "serper.search":
+            registry.inc("dap_serper_calls_total", "Serper search calls.", outcome="error" if err else "ok")
+        elif name.startswith("sheets."):
+            method = name.split(".", 1)[1]
+            kind = "reads" if method in _SHEETS_READS else "writes"
+            registry.inc(f"dap_sheets_{kind}_total", f"Google Sheets API {kind}.", method=method)
+            if str(s["attrs"].get("status", "")) == "429":
+                registry.inc("dap_sheets_throttles_total", "Google Sheets API calls rejected with 429.", method=method)
+
+    for key, value in counts.items():
+        registry.inc(f"dap_{key}_total", f"Pipeline {key.replace('_', ' ')}.", float(value))
+
+    registry.inc("dap_runs_total", "Pipeline runs.", outcome="ok" if ok else "error")
+    registry.set("dap_last_run_duration_seconds", "Duration of the last run.", tracer.elapsed_ms() / 1000.0)
+    registry.set("dap_last_run_success", "1 if the last run succeeded.", 1 if ok else 0)
+    registry.set("dap_last_run_timestamp_seconds", "Start time of the last run.", tracer.started_at)
+    return registry
@@ -0,0 +1,211 @@
+# dap/outbox.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from dap.state import state_dir
+
+# queued -> sending -> sent | failed; a transient failure goes back to queued when re-enqueued,
+# until `final` (bounced, delivery unknown, or out of attempts)
+QUEUED = "queued"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    idem_key    TEXT PRIMARY KEY,
+    website_url TEXT NOT NULL,
+    email       TEXT NOT NULL,
+    state       TEXT NOT NULL,
+    payload     TEXT NOT NULL DEFAULT '{}',
+    message_id  TEXT NOT NULL DEFAULT '',
+    error       TEXT NOT NULL DEFAULT '',
+    run_id      TEXT NOT NULL DEFAULT '',
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    synced      INTEGER NOT NULL DEFAULT 0,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    final       INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS outbox_state ON outbox (state);
+CREATE INDEX IF NOT EXISTS outbox_unsynced ON outbox (synced, state);
+"""
+
+
+def _utc_now_iso() -> str:
+    return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+
+def outbox_path(campaign: str = "") -> Path:
+    """One outbox file per campaign, so concurrent campaigns never claim, recover or sync each other's mail."""
+    return state_dir() / (f"outbox_{campaign}.sqlite3" if campaign else "outbox.sqlite3")
+
+
+# resolved path -> Outbox instances open on it in this process (see Outbox.recover)
+_open: Dict[str, int] = {}
+_open_lock = threading.Lock()
+
+
+def idempotency_key(website_url: str, email: str) -> str:
+    raw = f"{(website_url or '').strip().lower()}|{(email or '').strip().lower()}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class Outbox:
+    """Durable local email outbox (SQLite), keyed by (website_url, email).
+
+    Every message is recorded as `queued` before it is sent and moved to `sending`
+    (committed) right before the SMTP transaction, so a crashed run never re-sends:
+    anything left in `sending` is marked failed on recovery instead of retried.
+    Other failures are retried by a later `enqueue` unless they are final: a bounce,
+    an unknown delivery, or `max_attempts` reached.
+    Finished entries stay `synced = 0` until their status is flushed back to the sheet.
+    """
+
+    def __init__(self, path: Path | None = None, max_attempts: int = 3):
+        self.path = path or outbox_path()
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        cols = {r["name"] for r in self._db.execute("PRAGMA table_info(outbox)")}
+        with self._db:
+            # outboxes created before retries: existing failures stay final
+            if "attempts" not in cols:
+                self._db.execute("ALTER TABLE outbox ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            if "final" not in cols:
+                self._db.execute("ALTER TABLE outbox ADD COLUMN final INTEGER NOT NULL DEFAULT 0")
+                self._db.execute("UPDATE outbox SET final = 1 WHERE state = ?", (FAILED,))
+        self._key: str | None = str(Path(self.path).resolve())
+        with _open_lock:
+            _open[self._key] = _open.get(self._key, 0) + 1
+
+    def close(self) -> None:
+        if self._key is None:
+            return
+        with _open_lock:
+            _open[self._key] -= 1
+            if not _open[self._key]:
+                del _open[self._key]
+        self._key = None
+        self._db.close()
+
+    def __enter__(self) -> "Outbox":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def recover(self) -> int:
+        """Marks entries stuck in `sending` by a crashed run as failed (never re-sent).
+
+        Skipped (returns 0) while another Outbox on the same file is open in this process:
+        its `sending` entries are in flight, not stuck.
+        """
+        with _open_lock:
+            if _open.get(self._key, 0) > 1:
+                return 0
+            with self._lock, self._db:
+                cur = self._db.execute(
+                    "UPDATE outbox SET state = ?, error = ?, updated_at = ?, synced = 0, final = 1 WHERE state = ?",
+                    (FAILED, "interrupted during send; delivery unknown", _utc_now_iso(), SENDING),
+                )
+                return cur.rowcount
+
+    def known(self, website_url: str, email: str) -> bool:
+        """True unless the pair is new or its last send failed transiently (and may be retried)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM outbox WHERE idem_key = ? AND NOT (state = ? AND final = 0)",
+                (idempotency_key(website_url, email), FAILED),
+            ).fetchone()
+        return row is not None
+
+    def enqueue(self, to_email: Iterable[Dict[str, Any]], run_id: str = "") -> int:
+        """Records {prospect, email} items as queued.
+
+        Items already in the outbox are ignored, except transient failures, which are queued again.
+        """
+        now = _utc_now_iso()
+        rows = []
+        for x in to_email:
+            url = x["prospect"].get("website_url", "")
+            rows.append(
+                (idempotency_key(url, x["email"]), url, x["email"], QUEUED, json.dumps(x["prospect"]), run_id, now, now)
+            )
+        with self._lock, self._db:
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT INTO outbox (idem_key, website_url, email, state, payload, run_id, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (idem_key) DO UPDATE SET state = excluded.state, payload = excluded.payload,"
+                " run_id = excluded.run_id, updated_at = excluded.updated_at"
+                " WHERE outbox.state = ? AND outbox.final = 0",
+                [r + (FAILED,) for r in rows],
+            )
+            return self._db.total_changes - before
+
+    def claim(self, limit: int) -> List[Dict[str, Any]]:
+        """Moves up to `limit` queued entries (oldest first) to `sending` and returns them as {prospect, email, idem_key}."""
+        with self._lock, self._db:
+            rows = self._db.execute(
+                "SELECT idem_key, email, payload FROM outbox WHERE state = ? ORDER BY created_at, rowid LIMIT ?",
+                (QUEUED, max(limit, 0)),
+            ).fetchall()
+            self._db.executemany(
+                "UPDATE outbox SET state = ?, attempts = attempts + 1, updated_at = ? WHERE idem_key = ?",
+                [(SENDING, _utc_now_iso(), r["idem_key"]) for r in rows],
+            )
+        return [{"prospect": json.loads(r["payload"]), "email": r["email"], "idem_key": r["idem_key"]} for r in rows]
+
+    def mark_result(self, idem_key: str, ok: bool, message_id: str = "", error: str = "", final: bool = False) -> None:
+        """`final`: a failure that must not be retried (bounce, unknown delivery)."""
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE outbox SET state = ?, message_id = ?, error = ?, updated_at = ?, synced = 0,"
+                " final = CASE WHEN ? OR attempts >= ? THEN 1 ELSE 0 END WHERE idem_key = ?",
+                (SENT if ok else FAILED, message_id, error[:300], _utc_now_iso(), int(final), self.max_attempts, idem_key),
+            )
+
+    def release(self, idem_key: str) -> None:
+        """Puts a claimed entry that was never attempted back in the queue (e.g. SMTP login failed)."""
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE outbox SET state = ?, attempts = attempts - 1, updated_at = ? WHERE idem_key = ? AND state = ?",
+                (QUEUED, _utc_now_iso(), idem_key, SENDING),
+            )
+
+    def unsynced(self) -> List[Dict[str, Any]]:
+        """Finished (sent/failed) entries whose status has not been flushed to the sheet yet."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT idem_key, website_url, email, state, message_id, error, updated_at FROM outbox"
+                " WHERE synced = 0 AND state IN (?, ?) ORDER BY updated_at, rowid",
+                (SENT, FAILED),
+            ).fetchall()
+        return [
+            {
+                "idem_key": r["idem_key"],
+                "website_url": r["website_url"],
+                "email": r["email"],
+                "ok": r["state"] == SENT,
+                "message_id": r["message_id"],
+                "error": r["error"],
+                "at": r["updated_at"],
+            }
+            for r in rows
+        ]
+
+    def mark_synced(self, idem_keys: Iterable[str]) -> None:
+        with self._lock, self._db:
+            self._db.executemany("UPDATE outbox SET synced = 1 WHERE idem_key = ?", [(k,) for k in idem_keys])
@@ -0,0 +1,125 @@
+# dap/parse_pool.py
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from dap.crawler import parse_page, parse_pages
+
+
+class ParsePool:
+    """Runs dap.crawler.parse_page in worker processes so regex-heavy parsing does not
+    hold the GIL while crawl threads wait on the network.
+
+    Crawl threads call `parse(body)` and block until their page is parsed. A dispatcher
+    thread groups pending pages into chunks of up to `chunk_size` (waiting at most
+    `flush_ms` for a chunk to fill) and sends each chunk to the pool in one round trip.
+
+    With `workers=0` everything is parsed inline. Small runs stay inline too: the pool is
+    only started after the first `inline_below` pages, and a broken pool falls back to
+    inline parsing for the rest of the run.
+    """
+
+    def __init__(self, workers: int = 0, chunk_size: int = 16, flush_ms: float = 2.0, inline_below: int = 50):
+        self.workers = workers
+        self.chunk_size = max(chunk_size, 1)
+        self.flush_s = flush_ms / 1000.0
+        self.inline_below = inline_below
+        self.pages = 0
+        self.pooled = 0
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[bytes, Future]] = []
+        self._executor: ProcessPoolExecutor | None = None
+        self._dispatcher: threading.Thread | None = None
+        self._closed = False
+        self._broken = False
+
+    def parse(self, body: bytes) -> Dict[str, Any]:
+        if self.workers <= 0:
+            return parse_page(body)
+        with self._cond:
+            self.pages += 1
+            inline = self._closed or self._broken or self.pages <= self.inline_below
+            if not inline:
+                self._start()
+                fut: Future = Future()
+                self._pending.append((body, fut))
+                self._cond.notify()
+        if inline:
+            return parse_page(body)
+        return fut.result()
+
+    def _start(self) -> None:
+        # caller holds self._cond
+        if self._executor is not None:
+            return
+        # spawn, not fork: the parent is multi-threaded (crawl workers, write-behind)
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._dispatcher = threading.Thread(target=self._dispatch, name="dap-parse-dispatch", daemon=True)
+        self._dispatcher.start()
+
+    def _next_chunk(self) -> List[Tuple[bytes, Future]]:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            deadline = time.monotonic() + self.flush_s
+            while 0 < len(self._pending) < self.chunk_size and not self._closed:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                self._cond.wait(left)
+            chunk, self._pending = self._pending[: self.chunk_size], self._pending[self.chunk_size :]
+            return chunk
+
+    def _dispatch(self) -> None:
+        while True:
+            chunk = self._next_chunk()
+            if not chunk:
+                return  # closed and drained
+            try:
+                if self._broken:
+                    raise RuntimeError("parse pool unavailable")
+                fut = self._executor.submit(parse_pages, [body for body, _ in chunk])
+            except Exception as e:
+                self._fallback(chunk, e)
+                continue
+            self.pooled += len(chunk)
+            fut.add_done_callback(lambda f, chunk=chunk: self._deliver(f, chunk))
+
+    def _deliver(self, fut: Future, chunk: List[Tuple[bytes, Future]]) -> None:
+        try:
+            pages = fut.result()
+        except Exception as e:
+            self._fallback(chunk, e)
+            return
+        for (_, waiter), page in zip(chunk, pages):
+            waiter.set_result(page)
+
+    def _fallback(self, chunk: List[Tuple[bytes, Future]], err: Exception) -> None:
+        if not self._broken:
+            self._broken = True
+            print(f"WARNING parse pool failed ({type(err).__name__}: {err}); parsing inline")
+        for body, waiter in chunk:
+            try:
+                waiter.set_result(parse_page(body))
+            except Exception as e:
+                waiter.set_exception(e)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
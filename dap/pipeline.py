@@ -0,0 +1,338 @@
+# dap/pipeline.py
+
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from dap.sharding import row_domain
+from dap.urls import canonical_url, registrable_domain, url_key
+
+_DONE = object()
+
+
+class Cancelled(Exception):
+    """Raised inside a stage when another stage failed and the pipeline is shutting down."""
+
+
+SNIPPET_SOURCE = "serper_snippet"
+
+
+def seed_row(d: Dict[str, Any]) -> Dict[str, str]:
+    """Prospect row for a discovered candidate.
+
+    Emails/phones found in the search snippet are seeded directly; a row seeded with an
+    email is never crawled (see `crawl_item`), one with only a phone is crawled last
+    (dap.frontier). Both are marked with contact_source=serper_snippet.
+    """
+    company_name = d.get("name") or d.get("company_name") or ""
+    if not company_name and d.get("title"):
+        from dap.enrich import company_name_cleaner
+
+        company_name = company_name_cleaner().clean(d["title"])
+    row = {
+        "domain": registrable_domain(d.get("domain") or d.get("url") or ""),
+        "website_url": d.get("url", ""),
+        "company_name": company_name,
+        "source_keyword": d.get("source_keyword", ""),
+        "status": "discovered",
+        "notes": f"seeded via serper query={d.get('query', '')}",
+    }
+    emails = list(d.get("emails") or [])
+    phones = list(d.get("phones") or [])
+    if emails or phones:
+        row["contact_source"] = SNIPPET_SOURCE
+        row["notes"] += f" | contact from {SNIPPET_SOURCE}"
+    if emails:
+        row.update(primary_email=emails[0], all_emails=",".join(emails), contact_method="email")
+    if phones:
+        row["phone_numbers"] = ",".join(phones)
+    return row
+
+
+def from_snippet(row: Dict[str, str]) -> bool:
+    """True for prospects whose contact details were seeded from a search snippet."""
+    return row.get("contact_source") == SNIPPET_SOURCE or f"contact from {SNIPPET_SOURCE}" in (row.get("notes") or "")
+
+
+def crawl_item(row: Dict[str, str]) -> Dict[str, str] | None:
+    """Crawl item for a prospect row that still needs email enrichment, else None."""
+    if not row.get("website_url") or (row.get("primary_email") or "").strip():
+        return None
+    return {"url": canonical_url(row["website_url"]), "domain": row_domain(row)}
+
+
+def build_crawl_items(prospects: Iterable[Dict[str, str]], limit: int = 0) -> List[Dict[str, str]]:
+    """Crawl items for rows without an email, deduped by domain, in sheet order."""
+    seen = set()
+    out = []
+    for row in prospects:
+        it = crawl_item(row)
+        if it is None:
+            continue
+        key = it["domain"] or it["url"]
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(it)
+        if limit > 0 and len(out) >= limit:
+            break
+    return out
+
+
+class Channel:
+    """Bounded queue between stages. Blocks producers when full (backpressure).
+
+    Iteration ends once all `producers` have called `close()`. Every blocking call
+    wakes up periodically and raises Cancelled once the pipeline's stop event is set.
+    A `prioritized` channel hands out the lowest `priority` first among queued items
+    (FIFO among equals); the end marker always sorts last.
+    """
+
+    def __init__(self, stop: threading.Event, maxsize: int = 100, producers: int = 1, prioritized: bool = False):
+        self._q: queue.Queue = queue.PriorityQueue(maxsize=maxsize) if prioritized else queue.Queue(maxsize=maxsize)
+        self._prioritized = prioritized
+        self._seq = itertools.count()
+        self._stop = stop
+        self._producers = producers
+        self._closed = 0
+        self._lock = threading.Lock()
+
+    def put(self, item: Any, priority: float = 0.0) -> None:
+        if self._prioritized:
+            item = (float("inf") if item is _DONE else priority, next(self._seq), item)
+        while True:
+            if self._stop.is_set():
+                raise Cancelled()
+            try:
+                self._q.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def get(self, timeout: float | None = None) -> Any:
+        """Next item, _DONE at the end, or None if `timeout` passes without one."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._stop.is_set():
+                raise Cancelled()
+            wait = 0.2 if deadline is None else min(0.2, max(deadline - time.monotonic(), 0))
+            try:
+                item = self._q.get(timeout=wait)
+            except queue.Empty:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+                continue
+            if self._prioritized:
+                item = item[2]
+            if item is _DONE:
+                self.put(_DONE)  # let other consumers see the end too
+            return item
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed += 1
+            last = self._closed == self._producers
+        if last:
+            self.put(_DONE)
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            item = self.get()
+            if item is _DONE:
+                return
+            yield item
+
+
+class StageGraph:
+    """Runs stage functions in threads; the first error cancels every other stage."""
+
+    def __init__(self) -> None:
+        self.stop = threading.Event()
+        self.errors: List[BaseException] = []
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def channel(self, maxsize: int = 100, producers: int = 1, prioritized: bool = False) -> Channel:
+        return Channel(self.stop, maxsize=maxsize, producers=producers, prioritized=prioritized)
+
+    def spawn(self, name: str, fn: Callable[..., None], *args: Any) -> None:
+        def target() -> None:
+            try:
+                fn(*args)
+            except Cancelled:
+                pass
+            except BaseException as e:
+                with self._lock:
+                    self.errors.append(e)
+                self.stop.set()
+
+        t = threading.Thread(target=target, name=f"dap-{name}", daemon=True)
+        self._threads.append(t)
+        t.start()
+
+    def join(self) -> None:
+        """Waits for all stages; re-raises the first stage error."""
+        for t in self._threads:
+            t.join()
+        if self.errors:
+            raise self.errors[0]
+
+
+def run_streaming(
+    cfg: Any,
+    prospects: List[Dict[str, str]],
+    existing_domains: set,
+    discover_iter: Callable[[], Iterable[Dict[str, Any]]],
+    upsert: Callable[[Any, List[Dict[str, str]]], int],
+    crawl: Callable[[Dict[str, str]], Dict[str, Any] | None],
+    enrich: Callable[[List[Dict[str, str]], List[Dict[str, Any]]], List[Dict[str, Any]]],
+    writer: Any,
+    limit: int = 0,
+    crawl_workers: int = 4,
+    seed_batch_size: int = 25,
+    seed_flush_s: float = 2.0,
+    queue_size: int = 100,
+    tracer: Any = None,
+    stop: threading.Event | None = None,
+    priority: Callable[[Dict[str, str]], float] | None = None,
+) -> Dict[str, Any]:
+    """Overlapped discovery -> seed -> crawl -> enrich -> write.
+
+    Existing rows that still need an email are crawled right away; discovered domains
+    are upserted in batches and flow into crawling once their rows exist. Crawl
+    results are enriched as they arrive and handed to `writer` (a WriteBehindWriter).
+    With `priority` (a row score, e.g. dap.frontier.Prioritizer.score) queued crawl
+    items are taken highest score first.
+
+    Seeds the same rows and crawls the same items as the sequential run_daily path
+    (discover_and_crawl_sequential); only the order of results and updates differs.
+    With `limit`, crawling waits until seeding is done so existing and new rows are
+    ranked together before the limit is applied, as the sequential path does.
+
+    Setting `stop` (graceful shutdown) ends discovery and crawling early; seeds and
+    results already in flight are still written.
+    """
+    stopping = stop.is_set if stop is not None else (lambda: False)
+    graph = StageGraph()
+    candidates = graph.channel(queue_size)
+    crawl_items = graph.channel(queue_size, prioritized=priority is not None)
+    results = graph.channel(queue_size, producers=max(crawl_workers, 1))
+
+    by_url: Dict[str, List[Dict[str, str]]] = {}
+    index_lock = threading.Lock()
+
+    def index(rows: Iterable[Dict[str, str]]) -> None:
+        with index_lock:
+            for p in rows:
+                key = url_key(p.get("website_url", ""))
+                if key:
+                    by_url.setdefault(key, []).append(p)
+
+    index(prospects)
+    out: Dict[str, Any] = {"seeded_count": 0, "seeded_rows": [], "crawl_items": [], "crawl_results": [], "updates": []}
+
+    def _span(name: str):
+        return tracer.stage(name) if tracer is not None else nullcontext()
+
+    def discover_stage() -> None:
+        with _span("discover"):
+            for d in discover_iter():
+                if stopping():
+                    break
+                candidates.put(d)
+        candidates.close()
+
+    def seed_stage() -> None:
+        seen = set()
+        emitted = 0
+        # with a limit, rank existing and newly seeded rows together once seeding is done,
+        # as the sequential path does; otherwise crawl rows as soon as they exist
+        hold = limit > 0
+
+        def ranked(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
+            return sorted(rows, key=priority, reverse=True) if priority is not None else rows
+
+        def emit(row: Dict[str, str]) -> None:
+            nonlocal emitted
+            it = crawl_item(row)
+            if it is None or (limit > 0 and emitted >= limit):
+                return
+            key = it["domain"] or it["url"]
+            if key in seen:
+                return
+            seen.add(key)
+            emitted += 1
+            out["crawl_items"].append(it)
+            crawl_items.put(it, -priority(row) if priority is not None else 0.0)
+
+        if not hold:
+            # existing rows first, then newly seeded ones as they are written
+            for row in ranked(prospects):
+                emit(row)
+
+        pending: List[Dict[str, str]] = []
+        known = set(existing_domains)
+
+        def flush() -> None:
+            if not pending:
+                return
+            with _span("seed"):
+                out["seeded_count"] += upsert(cfg, list(pending))
+            out["seeded_rows"].extend(pending)
+            index(pending)
+            if not hold:
+                for row in pending:
+                    emit(row)
+            pending.clear()
+
+        while True:
+            d = candidates.get(timeout=seed_flush_s)
+            if d is _DONE:
+                break
+            if d is None:
+                flush()  # discovery is slow: don't hold seeds back
+                continue
+            dom = registrable_domain(d.get("domain") or "")
+            if not dom or dom in known:
+                continue
+            known.add(dom)
+            pending.append(seed_row(d))
+            if len(pending) >= seed_batch_size:
+                flush()
+        flush()
+        if hold:
+            for row in ranked(prospects + out["seeded_rows"]):
+                emit(row)
+        crawl_items.close()
+
+    def crawl_stage() -> None:
+        for it in crawl_items:
+            if stopping():
+                continue  # drain without crawling so upstream never blocks
+            r = crawl(it)
+            if r is not None:
+                results.put(r)
+        results.close()
+
+    def enrich_stage() -> None:
+        for r in results:
+            out["crawl_results"].append(r)
+            with index_lock:
+                matches = list(by_url.get(url_key(r.get("url", "")), []))
+            ups = enrich(matches, [r]) if matches else []
+            out["updates"].extend(ups)
+            writer.submit(ups)
+
+    graph.spawn("discover", discover_stage)
+    graph.spawn("seed", seed_stage)
+    for i in range(max(crawl_workers, 1)):
+        graph.spawn(f"crawl-{i}", crawl_stage)
+    graph.spawn("enrich", enrich_stage)
+    graph.join()
+
+    return out
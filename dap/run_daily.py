@@ -1,182 +1,452 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
 import uuid
+from contextlib import nullcontext
 from datetime import datetime
-from urllib.parse import urlparse
 
-from dap.sheets.client import load_sheets_config
-from dap.sheets.readers import read_all_prospects, read_contacted_emails
-from dap.sheets.writers import append_run_log, upsert_prospects
-from dap.crawler import run as crawl_urls
-
-from dap.enrich import enrich
-from dap.sheets.writers_enrich import apply_enrichment
-from dap.email import send_emails
+# Keep module-level imports light: stage dependencies (Sheets/Google auth, crawler,
+# SMTP, SQLite stores) are imported inside the functions where each stage needs them.
+# tests/test_import_time.py guards this.
+from dap.sharding import Shard, row_domain, write_shard_log
+from dap.state import state_dir
+from dap.tracing import start_run
+from dap.urls import registrable_domain
 
 
 def utc_now_iso() -> str:
     return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
 
-def main() -> int:
+def write_metrics(args: argparse.Namespace, tracer, counts: dict[str, int], ok: bool) -> None:
+    """Folds this run into the cumulative metrics and writes the textfile. Never fails the run."""
+    try:
+        from dap.metrics import Registry, record_run
+
+        registry = Registry.load()
+        record_run(registry, tracer, counts, ok=ok)
+        registry.save()
+        registry.write_textfile(args.metrics_file, openmetrics=args.metrics_format == "openmetrics")
+    except Exception as e:
+        print(f"WARN metrics not written: {e}")
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser()
     parser.add_argument("--dry-run", action="store_true", help="Run without external side effects.")
     parser.add_argument("--no-email", action="store_true", help="Skip email stage (placeholder for now).")
     parser.add_argument("--limit", type=int, default=0, help="Limit number of URLs to crawl (0 = no limit).")
     parser.add_argument("--live", action="store_true", help="Actually send emails (safety gate).")
     parser.add_argument("--max-emails", type=int, default=5, help="Max emails to process per run.")
-    args = parser.parse_args()
+    parser.add_argument("--write-batch-size", type=int, default=25, help="Flush enrichment writes every N updates while crawling.")
+    parser.add_argument("--no-archive", action="store_true", help="Skip archiving contacted/dead prospects.")
+    parser.add_argument("--archive-contacted-days", type=int, default=30, help="Archive contacted prospects older than N days (0 = never).")
+    parser.add_argument("--archive-max-failures", type=int, default=3, help="Archive prospects after N consecutive crawl failures (0 = never).")
+    parser.add_argument("--sequential", action="store_true", help="Run stages one after another instead of the overlapped pipeline.")
+    parser.add_argument("--crawl-workers", type=int, default=4, help="Concurrent crawl workers in the overlapped pipeline.")
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=int(os.getenv("DAP_PARSE_WORKERS", "0")),
+        help="Worker processes for page parsing (0 = parse inline on the crawl threads).",
+    )
+    parser.add_argument("--parse-chunk-size", type=int, default=16, help="Pages sent to a parse worker per round trip.")
+    parser.add_argument("--time-budget", type=float, default=0.0, help="Stop starting new site crawls after N seconds of run time (0 = no limit).")
+    parser.add_argument("--request-budget", type=int, default=0, help="Stop starting new site crawls after N HTTP requests (0 = no limit).")
+    parser.add_argument(
+        "--shard",
+        type=Shard.parse,
+        default=None,
+        help="Process only shard i of N (0-based, e.g. 0/4), split by a stable hash of the domain. Shards on several hosts"
+        " need a shared DAP_RUNS_DIR for dap.merge_runs; outbox and suppression state stay per host, and other hosts'"
+        " sends reach them through the sheet's contacted rows on their next run, so keep N fixed between runs.",
+    )
+    parser.add_argument(
+        "--run-group",
+        default=os.getenv("DAP_RUN_GROUP", "") or datetime.utcnow().strftime("%Y%m%d"),
+        help="Groups the shards of one run; merge their logs with `python -m dap.merge_runs --run-group X`.",
+    )
+    parser.add_argument("--profile", action="store_true", help="Capture cProfile output for the whole run.")
+    parser.add_argument(
+        "--metrics-file",
+        default=os.getenv("DAP_METRICS_TEXTFILE", ""),
+        help="Write run metrics to this textfile (node-exporter textfile collector), e.g. /var/lib/node_exporter/dap.prom.",
+    )
+    parser.add_argument("--metrics-format", choices=("prometheus", "openmetrics"), default="prometheus", help="Metrics textfile format.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not args.profile:
+        return run(args)
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(run, args)
+    finally:
+        path = state_dir("profiles") / f"{utc_now_iso().replace(':', '')}.prof"
+        profiler.dump_stats(str(path))
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+        print(f"profile={path}")
+
+
+def _owned(args: argparse.Namespace, rows: list[dict]) -> list[dict]:
+    return rows if args.shard is None else [r for r in rows if args.shard.owns_row(r)]
+
+
+def _content_cache(args: argparse.Namespace):
+    from dap.content_cache import ContentHashCache
+
+    campaign = getattr(args, "campaign", "")
+    return ContentHashCache.load(state_dir() / f"content_hashes_{campaign}.json" if campaign else None)
+
+
+def discover_and_crawl_sequential(args, cfg, tracer, sheet_rows, existing_domains, priority, crawl, handoff) -> dict:
+    """Discover, seed, re-read, then crawl/enrich/write one stage after another (also used for --dry-run).
+
+    Returns the seeded count, the (re-read) sheet rows and this run's prospects, the crawl
+    items count, crawl results, updates and rows written.
+    """
+    from dap.discovery.search_seed import discover
+    from dap.enrich import enrich_stream
+    from dap.pipeline import build_crawl_items, seed_row
+    from dap.sheets.readers import read_all_prospects
+    from dap.sheets.write_behind import WriteBehindWriter
+    from dap.sheets.writers import upsert_prospects
+
+    stop = getattr(args, "stop", None)
+    out = {"crawl_results": [], "updates": [], "written_count": 0}
+
+    with tracer.stage("discover"):
+        discovered = discover(cfg, dry_run=args.dry_run, shard=args.shard, packs=getattr(args, "packs", None))
+    print(f"discovered={len(discovered)}")
+
+    # Seed discovered domains into prospects (domain-level dedupe)
+    rows_to_seed = []
+    for d in discovered:
+        dom = registrable_domain(d.get("domain") or "")
+        if not dom or dom in existing_domains:
+            continue
+        if args.shard is not None and not args.shard.owns(dom):
+            handoff.append(d)
+            continue
+        rows_to_seed.append(seed_row(d))
+
+    if args.dry_run:
+        seeded_count = len(rows_to_seed)
+    else:
+        with tracer.stage("seed"):
+            seeded_count = upsert_prospects(cfg, rows_to_seed, key="domain")
 
+    # rows seeded with an email from the search snippet skip the crawl entirely
+    print(f"seeded_discovery={seeded_count} resolved_from_snippet={sum(1 for r in rows_to_seed if r.get('primary_email'))}")
+
+    # Reload prospects so newly seeded rows enter crawl phase
+    if not args.dry_run and seeded_count > 0:
+        with tracer.stage("read_prospects"):
+            sheet_rows = read_all_prospects(cfg)
+    prospects = _owned(args, sheet_rows)
+
+    # Build crawl items, highest priority first
+    # MINIMAL FIX: only crawl rows that still need email enrichment (domain-level dedupe)
+    crawl_items = build_crawl_items(sorted(prospects, key=priority, reverse=True), limit=args.limit)
+
+    # crawl + enrich step; enrichment updates are written behind the crawl
+    if not args.dry_run:
+        content_cache = _content_cache(args)
+        crawled = (r for r in map(crawl, crawl_items) if r is not None)
+        with tracer.stage("crawl_enrich_write"), WriteBehindWriter(cfg, batch_size=args.write_batch_size) as writer:
+            for r, ups in enrich_stream(prospects, crawled, cache=content_cache):
+                if stop is not None and stop.is_set():
+                    break
+                out["crawl_results"].append(r)
+                out["updates"].extend(ups)
+                writer.submit(ups)
+        out["written_count"] = writer.written
+        content_cache.save()
+
+    out.update(seeded_count=seeded_count, sheet_rows=sheet_rows, prospects=prospects, urls_seeded_count=len(crawl_items))
+    return out
+
+
+def discover_and_crawl_streaming(args, cfg, tracer, sheet_rows, existing_domains, priority, crawl, handoff) -> dict:
+    """Discovery -> seed -> crawl -> enrich -> write overlapped via bounded queues (dap.pipeline).
+
+    Returns the same keys as `discover_and_crawl_sequential`.
+    """
+    from dap.discovery.search_seed import iter_discover
+    from dap.enrich import enrich
+    from dap.pipeline import run_streaming
+    from dap.sheets.write_behind import WriteBehindWriter
+    from dap.sheets.writers import upsert_prospects
+
+    prospects = _owned(args, sheet_rows)
+
+    def discover_owned():
+        for d in iter_discover(cfg, shard=args.shard, packs=getattr(args, "packs", None)):
+            if args.shard is None or args.shard.owns_row(d):
+                yield d
+            elif registrable_domain(d.get("domain") or "") not in existing_domains:
+                handoff.append(d)
+
+    content_cache = _content_cache(args)
+    with tracer.stage("pipeline"), WriteBehindWriter(cfg, batch_size=args.write_batch_size) as writer:
+        out = run_streaming(
+            cfg,
+            prospects,
+            existing_domains,
+            discover_iter=discover_owned,
+            upsert=lambda c, rows: upsert_prospects(c, rows, key="domain"),
+            crawl=crawl,
+            enrich=lambda ps, rs: enrich(ps, rs, cache=content_cache),
+            writer=writer,
+            limit=args.limit,
+            crawl_workers=args.crawl_workers,
+            seed_batch_size=args.write_batch_size,
+            tracer=tracer,
+            stop=getattr(args, "stop", None),
+            priority=priority,
+        )
+    content_cache.save()
+
+    print(f"seeded_discovery={out['seeded_count']} resolved_from_snippet={sum(1 for r in out['seeded_rows'] if r.get('primary_email'))}")
+    return {
+        "seeded_count": out["seeded_count"],
+        "sheet_rows": sheet_rows + out["seeded_rows"],
+        "prospects": prospects + out["seeded_rows"],
+        "urls_seeded_count": len(out["crawl_items"]),
+        "crawl_results": out["crawl_results"],
+        "updates": out["updates"],
+        "written_count": writer.written,
+    }
+
+
+def run(args: argparse.Namespace) -> int:
     run_id = str(uuid.uuid4())
     started_at = utc_now_iso()
+    # Set by dap.campaigns when several campaigns run in one process: one tracer, one parse
+    # pool, one crawl (each site fetched once) and one suppression index shared by all of them
+    shared = getattr(args, "shared", None)
+    campaign = getattr(args, "campaign", "")
+    tracer = shared.tracer if shared is not None else start_run(run_id)
 
     urls_seeded_count = 0
+    deferred_count = 0
     sites_scraped_count = 0
     emails_sent_count = 0
+    emails_queued_count = 0
     errors_count = 0
     top_error = ""
     enriched_count = 0
     written_count = 0
 
-    try:
-        cfg = load_sheets_config()
-
-        # Phase 1: Discovery (stub wiring)
-        from dap.discovery.search_seed import discover
-
-        discovered = discover(cfg, dry_run=args.dry_run)
-        print(f"discovered={len(discovered)}")
-
-        prospects = read_all_prospects(cfg)
-
-        # Phase 1b: Seed discovered domains into prospects (domain-level dedupe)
-        existing_domains = {
-            (p.get("domain", "") or "").strip().lower()
-            for p in prospects
-            if (p.get("domain", "") or "").strip()
+    def run_log_row(finished_at: str) -> dict[str, str]:
+        summary = tracer.summary()
+        fetch = summary["calls"].get("fetch", {})
+        return {
+            "run_id": run_id,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "urls_seeded_count": str(urls_seeded_count),
+            "sites_scraped_count": str(sites_scraped_count),
+            "enriched_count": str(enriched_count),
+            "written_count": str(written_count),
+            "deferred_count": str(deferred_count),
+            "emails_sent_count": str(emails_sent_count),
+            "errors_count": str(errors_count),
+            "top_error": top_error[:200],
+            "duration_ms": str(int(summary["duration_ms"])),
+            "stage_durations_ms": json.dumps({k: int(v) for k, v in summary["stages"].items()}),
+            "fetch_p90_ms": str(int(fetch.get("p90_ms", 0))),
+            "bytes_fetched": str(fetch.get("bytes", 0)),
         }
 
-        rows_to_seed = []
-        for d in discovered:
-            dom = (d.get("domain", "") or "").strip().lower()
-            if not dom or dom in existing_domains:
-                continue
-
-            rows_to_seed.append(
-                {
-                    "domain": dom,
-                    "website_url": d.get("url", ""),
-                    "company_name": d.get("title") or d.get("name") or d.get("company_name") or "",
-                    "source_keyword": d.get("source_keyword", ""),
-                    "status": "discovered",
-                    "notes": f"seeded via serper query={d.get('query', '')}",
-                }
-            )
-
-        if args.dry_run:
-            seeded_count = len(rows_to_seed)
+    from dap.sheets.archive import ArchiveRules, archive_prospects, load_archive_index
+    from dap.sheets.client import load_sheets_config
+    from dap.sheets.columns import missing_feature_columns, validate_schema
+    from dap.sheets.readers import read_all_prospects, read_contacted_emails
+    from dap.sheets.writers import append_run_log
+    from dap.sheets.writers_enrich import apply_enrichment
+    from dap.email import build_log_updates, deliver_emails, send_emails
+    from dap.frontier import Budget, Prioritizer, save_deferred
+    from dap.suppression import SuppressionIndex
+    from dap.crawler import crawl_one
+    from dap.parse_pool import ParsePool
+
+    # Set by dap.serve on shutdown: stop crawling, finish in-flight writes, skip email
+    stop = getattr(args, "stop", None)
+
+    # Crawl admission: highest-priority sites first, new crawls refused once a budget is spent
+    budget = Budget(time_s=args.time_budget, requests=args.request_budget)
+    deferred = []
+    admitted = []
+
+    # Discovered domains owned by another shard; seeded by the merge step instead
+    handoff = []
+
+    # Page parsing off the crawl threads; small runs and --parse-workers 0 parse inline
+    parse_pool = shared.parse_pool if shared is not None else ParsePool(args.parse_workers, chunk_size=args.parse_chunk_size)
+    crawl_site = shared.crawl if shared is not None else crawl_one
+
+    def sheets_config():
+        return getattr(args, "sheets_config", None) or load_sheets_config()
+
+    def log_run(cfg, finished_at: str) -> None:
+        if args.shard is not None:
+            path = write_shard_log(args.run_group, args.shard, run_log_row(finished_at), handoff)
+            print(f"shard={args.shard} run_group={args.run_group} shard_log={path}")
         else:
-            seeded_count = upsert_prospects(cfg, rows_to_seed, key="domain")
-
-        print(f"seeded_discovery={seeded_count}")
-
-        # Reload prospects so newly seeded rows enter crawl phase
-        if not args.dry_run and seeded_count > 0:
-            prospects = read_all_prospects(cfg)
-
-        contacted_emails = set(read_contacted_emails(prospects))
-
-        # Phase 2: Build crawl items
-        # MINIMAL FIX: only crawl rows that still need email enrichment
-        crawl_items = [
-            {"url": row.get("website_url"), "domain": (row.get("domain") or "")}
-            for row in prospects
-            if row.get("website_url") and not (row.get("primary_email") or "").strip()
-        ]
-
-        # Phase 2.x: domain-level dedupe before crawling
-        _seen = set()
-        _deduped = []
-        for it in crawl_items:
-            dom = (it.get("domain") or "").strip().lower()
-            if not dom:
-                dom = urlparse(it["url"]).netloc.strip().lower()
-            key = dom or it["url"].strip().lower()
-            if key in _seen:
-                continue
-            _seen.add(key)
-            _deduped.append({"url": it["url"], "domain": dom})
-        crawl_items = _deduped
-
-        if args.limit > 0:
-            crawl_items = crawl_items[: args.limit]
-
-        urls_seeded_count = len(crawl_items)
-        # crawl step
-        if not args.dry_run:
-            crawl_results = crawl_urls(crawl_items)
-        else:
-            crawl_results = []
-
-        sites_scraped_count = len([r for r in crawl_results if isinstance(r, dict)])
+            append_run_log(cfg, run_log_row(finished_at))
 
-        updates = enrich(prospects, crawl_results) if crawl_results else []
-        enriched_count = len(updates)
-
-        if not args.dry_run:
-            written_count = apply_enrichment(cfg, updates)
-        # email stage
-        # DRY-RUN EMAIL SUMMARY (no side effects)
-        if args.dry_run and not args.no_email:
-            email_result = send_emails(cfg, prospects, updates, contacted_emails)
-            would_email = email_result.get("to_email", [])
-            print(f"[DRY-RUN] would_queue_emails={len(would_email)} (max_emails={args.max_emails})")
-
-        # email stage
-        if not args.dry_run and not args.no_email and args.live:
-            email_result = send_emails(cfg, prospects, updates, contacted_emails)
-            to_email = email_result.get("to_email", [])
-            log_updates = email_result.get("log_updates", [])
-
-            # Basic rate limiting (configurable)
-            to_email = to_email[: args.max_emails]
-
-            # NOTE: SMTP send still not implemented; this is the queue size.
-            emails_sent_count = len(to_email)
-
-            # Write send-log fields back to sheet (status/contacted + timestamps + emailed_to)
-            if log_updates:
-                # Only log prospects that actually made it into the rate-limited queue
-                allowed_urls = {x["prospect"].get("website_url") for x in to_email}
-                filtered_logs = [u for u in log_updates if u.get("website_url") in allowed_urls]
-
-                if filtered_logs:
-                    log_written = apply_enrichment(cfg, filtered_logs)
-                    written_count += log_written
-        else:
-            emails_sent_count = 0
+    try:
+        cfg = sheets_config()
+
+        # Header-only schema check; also warms the column maps the writers use
+        with tracer.stage("schema"):
+            for sheet, missing in validate_schema(cfg).items():
+                if missing:
+                    print(f"WARNING {sheet} sheet missing v1 columns: {','.join(missing)}")
+            for col, effect in missing_feature_columns(cfg).items():
+                print(f"WARNING prospects sheet missing {col} column: {effect}")
+
+        # One full read of prospects, shared by archiving, seeding dedupe and crawl selection
+        with tracer.stage("read_prospects"):
+            sheet_rows = read_all_prospects(cfg)
+        # before archiving removes rows from sheet_rows
+        contacted_in_sheet = read_contacted_emails(sheet_rows)
+
+        # Phase 0: Archive contacted/dead prospects to keep the hot sheet small.
+        # Sharded runs leave it to dap.merge_runs: deleting rows would shift other shards' writes.
+        if not args.no_archive and args.shard is None:
+            with tracer.stage("archive"):
+                rules = ArchiveRules(
+                    contacted_older_than_days=args.archive_contacted_days,
+                    max_crawl_failures=args.archive_max_failures,
+                )
+                archived_count = archive_prospects(cfg, rules, dry_run=args.dry_run, rows=sheet_rows)
+                print(f"{'[DRY-RUN] would_archive' if args.dry_run else 'archived'}={archived_count}")
+
+        # Archived prospects still count for discovery dedupe and email suppression
+        archive_index = load_archive_index(cfg)
+
+        prioritizer = Prioritizer.from_config()
+
+        def budgeted_crawl(item):
+            if (stop is not None and stop.is_set()) or not budget.admit():
+                deferred.append(item)
+                return None
+            admitted.append(item)
+            r = crawl_site(item, parse=parse_pool.parse)
+            budget.charge((r or {}).get("fetch_count", 1))
+            return r
+
+        # Phases 1-2: discovery, seeding, crawl, enrich and write; overlapped unless --sequential
+        existing_domains = {d for d in map(row_domain, sheet_rows) if d} | archive_index["domains"]
+        phase = discover_and_crawl_sequential if args.sequential or args.dry_run else discover_and_crawl_streaming
+        out = phase(args, cfg, tracer, sheet_rows, existing_domains, prioritizer.score, budgeted_crawl, handoff)
+
+        seeded_count = out["seeded_count"]
+        sheet_rows = out["sheet_rows"]
+        prospects = out["prospects"]
+        crawl_results = out["crawl_results"]
+        updates = out["updates"]
+        urls_seeded_count = out["urls_seeded_count"]
+        written_count = out["written_count"]
+
+        if deferred or admitted:
+            deferred_count = save_deferred(deferred, admitted, run_id=run_id)
+        if deferred_count:
+            print(f"deferred={deferred_count} budget={budget.reason or 'shutdown'} (prioritized next run)")
+
+        # Persistent suppression index. The sheet's contacted addresses are added every run
+        # (sends by other hosts or shards, manual edits; known ones are ignored); the archive
+        # is imported once per spreadsheet: later archived rows were added while still on the sheet.
+        with (nullcontext(shared.suppression) if shared is not None else SuppressionIndex()) as contacted_emails:
+            contacted_emails.add_many(contacted_in_sheet)
+            source = f"archive:{cfg.spreadsheet_id}"
+            if not contacted_emails.seeded(source):
+                with tracer.stage("suppression_seed"):
+                    print(f"suppression_seeded={contacted_emails.seed(source, archive_index['emails'])}")
+
+            sites_scraped_count = len([r for r in crawl_results if isinstance(r, dict)])
+            enriched_count = len(updates)
+            # email stage
+            # DRY-RUN EMAIL SUMMARY (no side effects)
+            if args.dry_run and not args.no_email:
+                email_result = send_emails(cfg, prospects, updates, contacted_emails)
+                would_email = email_result.get("to_email", [])
+                print(f"[DRY-RUN] would_queue_emails={len(would_email)} (max_emails={args.max_emails})")
+
+            # email stage (through the durable outbox, so a crashed run never re-sends)
+            if stop is not None and stop.is_set():
+                print("shutdown requested: skipping email stage")
+            elif not args.dry_run and not args.no_email and args.live:
+                from dap.outbox import Outbox, outbox_path
+                from dap.smtp_sender import SmtpSender, load_email_template, load_smtp_config
+
+                with tracer.stage("email"), Outbox(outbox_path(campaign)) as outbox:
+                    recovered = outbox.recover()
+                    if recovered:
+                        print(f"outbox_recovered_interrupted={recovered}")
+
+                    email_result = send_emails(cfg, prospects, updates, contacted_emails)
+                    to_email = [
+                        x
+                        for x in email_result.get("to_email", [])
+                        if not outbox.known(x["prospect"].get("website_url", ""), x["email"])
+                    ]
+
+                    # Basic rate limiting (configurable); leftovers from an interrupted run go first
+                    emails_queued_count = outbox.enqueue(to_email[: args.max_emails], run_id=run_id)
+                    batch = outbox.claim(args.max_emails)
+                    send_error = ""
+
+                    def on_send_result(x, res):
+                        if res.fatal:
+                            # sender-side failure: not attempted, stays queued for the next run
+                            outbox.release(x["idem_key"])
+                            return
+                        outbox.mark_result(x["idem_key"], res.ok, res.message_id, res.error, final=res.permanent or res.unknown)
+                        if res.ok:
+                            contacted_emails.add(x["email"])
+                        elif res.permanent:
+                            contacted_emails.add_bounce(x["email"])
+
+                    if batch:
+                        sender = SmtpSender(load_smtp_config())
+                        delivery = deliver_emails(
+                            batch,
+                            sender,
+                            load_email_template(),
+                            on_result=on_send_result,
+                        )
+                        emails_sent_count = delivery["sent_count"]
+                        stopped = [r.error for r in delivery["results"] if r.fatal]
+                        send_error = next((e for e in stopped if not e.startswith("not sent")), "")
+
+                    # Flush send-log fields back to sheet in one batch (includes unsynced entries from earlier runs)
+                    pending = outbox.unsynced()
+                    if pending:
+                        written_count += apply_enrichment(cfg, build_log_updates(pending))
+                        outbox.mark_synced(e["idem_key"] for e in pending)
+                    if send_error:
+                        raise RuntimeError(f"email sending stopped: {send_error}")
+            else:
+                emails_sent_count = 0
 
         finished_at = utc_now_iso()
 
         if not args.dry_run:
-            append_run_log(
-                cfg,
-                {
-                    "run_id": run_id,
-                    "started_at": started_at,
-                    "finished_at": finished_at,
-                    "urls_seeded_count": str(urls_seeded_count),
-                    "sites_scraped_count": str(sites_scraped_count),
-                    "enriched_count": str(enriched_count),
-                    "written_count": str(written_count),
-                    "emails_sent_count": str(emails_sent_count),
-                    "errors_count": str(errors_count),
-                    "top_error": top_error,
-                },
-            )
+            with tracer.stage("run_log"):
+                log_run(cfg, finished_at)
         else:
-            print("[DRY-RUN] would append runs log row")
+            print(f"[DRY-RUN] would {'write shard log' if args.shard is not None else 'append runs log row'}")
 
         print(
             f"seeded={seeded_count} scraped={sites_scraped_count} enriched={enriched_count} written={written_count} emailed={emails_sent_count}"
@@ -191,28 +461,30 @@ def main() -> int:
 
         try:
             if not args.dry_run:
-                cfg = load_sheets_config()
-                append_run_log(
-                    cfg,
-                    {
-                        "run_id": run_id,
-                        "started_at": started_at,
-                        "finished_at": finished_at,
-                        "urls_seeded_count": str(urls_seeded_count),
-                        "sites_scraped_count": str(sites_scraped_count),
-                        "enriched_count": str(enriched_count),
-                        "written_count": str(written_count),
-                        "emails_sent_count": str(emails_sent_count),
-                        "errors_count": str(errors_count),
-                        "top_error": top_error[:200],
-                    },
-                )
+                log_run(sheets_config() if args.shard is None else None, finished_at)
         except Exception:
             pass
 
         print(f"ERROR run_id={run_id} err={top_error}")
         return 1
 
+    finally:
+        if shared is None:
+            parse_pool.close()
+        if shared is None and parse_pool.pooled:
+            print(f"parse_pool workers={parse_pool.workers} pages={parse_pool.pages} pooled={parse_pool.pooled}")
+        print(f"trace={tracer.write_json()}")
+        if args.metrics_file:
+            counts = {
+                "emails_queued": emails_queued_count,
+                "emails_sent": emails_sent_count,
+                "sites_scraped": sites_scraped_count,
+                "rows_written": written_count,
+                "sites_deferred": deferred_count,
+                "run_errors": errors_count,
+            }
+            write_metrics(args, tracer, counts, ok=errors_count == 0)
+
 
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,209 @@
+# dap/serve.py
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List
+
+from dap.tracing import get_tracer
+
+
+def _iso(ts: float | None) -> str:
+    if ts is None:
+        return ""
+    return datetime.fromtimestamp(ts, timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def next_run_at(now: float, last_start: float | None, interval_s: float, at: str = "") -> float:
+    """Next cycle start: daily at `at` ("HH:MM", UTC) if given, else `interval_s` after the last start."""
+    if at:
+        hh, mm = (int(x) for x in at.split(":", 1))
+        today = datetime.fromtimestamp(now, timezone.utc).replace(hour=hh, minute=mm, second=0, microsecond=0)
+        t = today.timestamp()
+        return t if t > now else (today + timedelta(days=1)).timestamp()
+    if last_start is None:
+        return now
+    return last_start + interval_s
+
+
+class Service:
+    """Warm pipeline process: runs `run_fn(args)` on a schedule until stopped.
+
+    Everything cached at module level stays warm between cycles: the authorized Sheets
+    client and worksheet handles (dap.sheets.client), the parsed keywords.yml, the
+    pooled Serper session and the company-name cleaner. `stop()` lets the current
+    cycle finish its in-flight writes (see the `stop` event in run_daily) and exits.
+    """
+
+    def __init__(
+        self,
+        make_args: Callable[[], argparse.Namespace],
+        run_fn: Callable[[argparse.Namespace], int],
+        interval_s: float = 86400.0,
+        at: str = "",
+        max_cycles: int = 0,
+    ):
+        self.make_args = make_args
+        self.run_fn = run_fn
+        self.interval_s = interval_s
+        self.at = at
+        self.max_cycles = max_cycles
+        self.stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.state = "idle"
+        self.cycles = 0
+        self.failures = 0
+        self.next_run: float | None = None
+        self.last_run: Dict[str, Any] = {}
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "pid": os.getpid(),
+                "started_at": _iso(self.started_at),
+                "uptime_s": round(time.time() - self.started_at, 1),
+                "cycles": self.cycles,
+                "failures": self.failures,
+                "next_run_at": _iso(self.next_run),
+                "last_run": dict(self.last_run),
+            }
+
+    def stop(self) -> None:
+        with self._lock:
+            if self.state != "stopped":
+                self.state = "stopping"
+        self.stop_event.set()
+
+    def run_cycle(self) -> int:
+        args = self.make_args()
+        args.stop = self.stop_event
+        with self._lock:
+            self.state = "running"
+        t0 = time.time()
+        try:
+            code = self.run_fn(args)
+        except Exception as e:  # a failing cycle must not kill the service
+            print(f"ERROR cycle failed: {e}")
+            code = 1
+        with self._lock:
+            self.cycles += 1
+            self.failures += 1 if code else 0
+            self.last_run = {
+                "run_id": get_tracer().run_id,
+                "started_at": _iso(t0),
+                "finished_at": _iso(time.time()),
+                "duration_s": round(time.time() - t0, 1),
+                "exit_code": code,
+            }
+            self.state = "stopping" if self.stop_event.is_set() else "idle"
+        return code
+
+    def serve_forever(self) -> None:
+        last_start = None
+        while not self.stop_event.is_set():
+            nxt = next_run_at(time.time(), last_start, self.interval_s, self.at)
+            with self._lock:
+                self.next_run = nxt
+            if self.stop_event.wait(max(nxt - time.time(), 0)):
+                break
+            last_start = time.time()
+            self.run_cycle()
+            if self.max_cycles and self.cycles >= self.max_cycles:
+                break
+        with self._lock:
+            self.state = "stopped"
+            self.next_run = None
+
+
+def start_status_server(service: Service, host: str, port: int) -> ThreadingHTTPServer:
+    """GET /healthz (200 while the scheduler is up), /status (JSON) and /metrics (last textfile state)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def _send(self, code: int, body: str, ctype: str = "application/json") -> None:
+            data = body.encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            st = service.status()
+            if self.path == "/healthz":
+                ok = st["state"] in ("idle", "running")
+                self._send(200 if ok else 503, json.dumps({"ok": ok, "state": st["state"]}))
+            elif self.path == "/status":
+                self._send(200, json.dumps(st, indent=1))
+            elif self.path == "/metrics":
+                from dap.metrics import Registry
+
+                self._send(200, Registry.load().render(), "text/plain; version=0.0.4")
+            else:
+                self._send(404, json.dumps({"error": "not found"}))
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="dap-status", daemon=True).start()
+    return server
+
+
+def main(argv: List[str] | None = None) -> int:
+    from dap.run_daily import build_parser, run
+
+    parser = argparse.ArgumentParser(
+        description="Run the DAP pipeline in a warm long-running process. Unknown options are passed to run_daily.",
+    )
+    parser.add_argument("--interval-minutes", type=float, default=1440.0, help="Minutes between cycle starts.")
+    parser.add_argument("--at", default="", help="Run daily at HH:MM UTC instead of every --interval-minutes.")
+    parser.add_argument("--max-cycles", type=int, default=0, help="Exit after N cycles (0 = run until stopped).")
+    parser.add_argument("--host", default=os.getenv("DAP_SERVE_HOST", "127.0.0.1"), help="Status endpoint bind address.")
+    parser.add_argument("--port", type=int, default=int(os.getenv("DAP_SERVE_PORT", "8787")), help="Status endpoint port (0 = off).")
+    args, run_argv = parser.parse_known_args(argv)
+
+    build_parser().parse_args(run_argv)  # fail fast on bad run_daily options
+
+    service = Service(
+        # fresh parse per cycle so date-based defaults (e.g. --run-group) follow the calendar
+        make_args=lambda: build_parser().parse_args(run_argv),
+        run_fn=run,
+        interval_s=args.interval_minutes * 60,
+        at=args.at,
+        max_cycles=args.max_cycles,
+    )
+
+    def on_signal(signum, frame):
+        if service.stop_event.is_set():
+            raise KeyboardInterrupt  # second signal: stop waiting for in-flight writes
+        print(f"signal {signum}: finishing in-flight work, then exiting")
+        service.stop()
+
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+
+    server = start_status_server(service, args.host, args.port) if args.port else None
+    if server:
+        print(f"status endpoint http://{args.host}:{server.server_address[1]}/status")
+    try:
+        service.serve_forever()
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+    print(f"stopped cycles={service.cycles} failures={service.failures}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
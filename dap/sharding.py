@@ -0,0 +1,121 @@
+# dap/sharding.py
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import socket
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+from dap.state import state_dir
+from dap.urls import registrable_domain
+
+
+def shard_of(key: str, count: int) -> int:
+    """Stable shard number for `key` (same on every machine and Python process)."""
+    d = hashlib.blake2b((key or "").strip().lower().encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(d, "big") % max(count, 1)
+
+
+def row_domain(row: Dict[str, Any]) -> str:
+    """Registrable domain of a prospect row or crawl item (`domain` column, else its URL)."""
+    return registrable_domain(row.get("domain") or row.get("website_url") or row.get("url") or "")
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Shard `index` of `count` (0-based). Domains and discovery queries are split by stable hash."""
+
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, spec: str) -> "Shard":
+        """Parses "i/N", e.g. "0/4" .. "3/4"."""
+        try:
+            i, n = (int(x) for x in spec.split("/", 1))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected i/N, got {spec!r}")
+        if n < 1 or not 0 <= i < n:
+            raise argparse.ArgumentTypeError(f"shard index must be in 0..N-1, got {spec!r}")
+        return cls(i, n)
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def owns(self, key: str) -> bool:
+        return shard_of(key, self.count) == self.index
+
+    def owns_row(self, row: Dict[str, Any]) -> bool:
+        dom = row_domain(row)
+        return bool(dom) and self.owns(dom)
+
+
+# --- per-shard run logs ------------------------------------------------------
+
+
+def group_dir(run_group: str) -> Path:
+    """Where the shards of `run_group` leave their logs for dap.merge_runs.
+
+    Local state by default, which only works when every shard runs on this host. Shards
+    on several hosts need DAP_RUNS_DIR set to a directory they all share (e.g. a network
+    mount), or the merge cannot see the other hosts' shards.
+    """
+    base = os.getenv("DAP_RUNS_DIR", "").strip()
+    if not base:
+        return state_dir("runs", run_group)
+    path = Path(base) / run_group
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def write_shard_log(run_group: str, shard: Shard, run_row: Dict[str, str], handoff: List[Dict[str, Any]]) -> Path:
+    """Stores one shard's runs row plus discovered domains owned by other shards."""
+    path = group_dir(run_group) / f"shard-{shard.index}-of-{shard.count}.json"
+    tmp = path.with_suffix(".tmp")
+    log = {"shard": str(shard), "host": socket.gethostname(), "row": run_row, "handoff": handoff}
+    tmp.write_text(json.dumps(log), encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def read_shard_logs(run_group: str) -> List[Dict[str, Any]]:
+    return [
+        json.loads(p.read_text(encoding="utf-8"))
+        for p in sorted(group_dir(run_group).glob("shard-*-of-*.json"))
+    ]
+
+
+def merge_run_rows(run_group: str, rows: List[Dict[str, str]]) -> Dict[str, str]:
+    """Combines per-shard runs rows into one: counts are summed, times span all shards,
+    stage durations and fetch p90 take the slowest shard."""
+
+    def total(col: str) -> str:
+        return str(sum(int(r.get(col) or 0) for r in rows))
+
+    stages: Dict[str, int] = {}
+    for r in rows:
+        for k, v in json.loads(r.get("stage_durations_ms") or "{}").items():
+            stages[k] = max(stages.get(k, 0), int(v))
+
+    errors = [r["top_error"] for r in rows if r.get("top_error")]
+    return {
+        "run_id": run_group,
+        "started_at": min(r.get("started_at", "") for r in rows),
+        "finished_at": max(r.get("finished_at", "") for r in rows),
+        "urls_seeded_count": total("urls_seeded_count"),
+        "sites_scraped_count": total("sites_scraped_count"),
+        "enriched_count": total("enriched_count"),
+        "written_count": total("written_count"),
+        "deferred_count": total("deferred_count"),
+        "emails_sent_count": total("emails_sent_count"),
+        "errors_count": total("errors_count"),
+        "top_error": errors[0][:200] if errors else "",
+        "duration_ms": str(max(int(r.get("duration_ms") or 0) for r in rows)),
+        "stage_durations_ms": json.dumps(stages),
+        "fetch_p90_ms": str(max(int(r.get("fetch_p90_ms") or 0) for r in rows)),
+        "bytes_fetched": total("bytes_fetched"),
+    }
@@ -0,0 +1,208 @@
+# dap/sheets/archive.py
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from dap.state import state_dir
+from dap.tracing import get_tracer
+from dap.urls import registrable_domain
+
+from .client import SheetsConfig, open_archive_worksheet, open_worksheets
+from .columns import column_map, header_index, remember_header
+from .schema import ARCHIVE_COLUMNS_EXTRA
+
+
+@dataclass(frozen=True)
+class ArchiveRules:
+    contacted_older_than_days: int = 30
+    max_crawl_failures: int = 3
+
+
+def _now_iso() -> str:
+    return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+
+def _ensure_row_width(row: list[Any], width: int) -> list[str]:
+    out = [(str(x) if x is not None else "") for x in row]
+    if len(out) < width:
+        out.extend([""] * (width - len(out)))
+    return out[:width]
+
+
+def _parse_iso(s: str) -> datetime | None:
+    s = (s or "").strip()
+    if not s:
+        return None
+    try:
+        return datetime.fromisoformat(s.rstrip("Z"))
+    except ValueError:
+        return None
+
+
+def archive_reason(row: dict[str, str], rules: ArchiveRules, now: datetime) -> str:
+    """Returns why a prospect row should be archived, or "" to keep it hot."""
+    status = (row.get("status", "") or "").strip().lower()
+    if status == "contacted" and rules.contacted_older_than_days > 0:
+        ts = None
+        for col in ("email_sent_at", "last_emailed_at", "last_checked_at"):
+            ts = _parse_iso(row.get(col, ""))
+            if ts:
+                break
+        if ts and now - ts >= timedelta(days=rules.contacted_older_than_days):
+            return f"contacted>{rules.contacted_older_than_days}d"
+
+    if rules.max_crawl_failures > 0:
+        try:
+            fails = int((row.get("crawl_fail_count", "") or "0").strip())
+        except ValueError:
+            fails = 0
+        if fails >= rules.max_crawl_failures:
+            return f"crawl_failures>={rules.max_crawl_failures}"
+
+    return ""
+
+
+def _contiguous_ranges(row_nums: list[int]) -> list[tuple[int, int]]:
+    """[5, 6, 7, 10] -> [(5, 7), (10, 10)] (1-based, inclusive)."""
+    out: list[tuple[int, int]] = []
+    for n in sorted(row_nums):
+        if out and out[-1][1] == n - 1:
+            out[-1] = (out[-1][0], n)
+        else:
+            out.append((n, n))
+    return out
+
+
+def archive_prospects(
+    cfg: SheetsConfig,
+    rules: ArchiveRules,
+    dry_run: bool = False,
+    rows: list[dict[str, str]] | None = None,
+) -> int:
+    """Moves prospects matching `rules` to the archive worksheet.
+
+    One read of `prospects` (none if `rows`, the unmodified result of read_all_prospects,
+    is given; archived rows are then removed from it), one append to `archive`, one
+    batched delete. Rows are appended and the local index is saved before rows are
+    deleted, so a crash leaves duplicates, never losses.
+    Returns number of rows archived (or that would be archived, in dry-run).
+    """
+    prospects_ws, _ = open_worksheets(cfg)
+    if rows is None:
+        values = prospects_ws.get_all_values()
+        if not values:
+            return 0
+        header = list(remember_header(cfg, prospects_ws, values[0]).header)
+        grid = [_ensure_row_width(r, len(header)) for r in values[1:]]
+    else:
+        if not rows:
+            return 0
+        header = list(column_map(cfg, prospects_ws).header)
+        grid = [[r.get(h, "") for h in header] for r in rows]
+    now = datetime.utcnow()
+    archived_at = _now_iso()
+
+    moved: list[tuple[int, list[str], str]] = []
+    for i, row in enumerate(grid, start=2):
+        reason = archive_reason(dict(zip(header, row)), rules, now)
+        if reason:
+            moved.append((i, row, reason))
+
+    if dry_run or not moved:
+        return len(moved)
+
+    archive_header = header + [c for c in ARCHIVE_COLUMNS_EXTRA if c not in header]
+    archive_ws = open_archive_worksheet(cfg, archive_header)
+    existing_header = [h.strip() for h in (archive_ws.row_values(1) or archive_header)]
+    idx = header_index(existing_header)
+
+    to_append: list[list[str]] = []
+    for _, row, reason in moved:
+        out = [""] * len(existing_header)
+        for col, val in list(zip(header, row)) + [("archived_at", archived_at), ("archive_reason", reason)]:
+            if col in idx and val:
+                out[idx[col]] = val
+        to_append.append(out)
+
+    archive_ws.append_rows(to_append, value_input_option="USER_ENTERED")
+
+    # Index before deleting: the index is only rebuilt when missing, so rows deleted
+    # without being indexed would silently lose dedupe and suppression.
+    index = load_archive_index(cfg)
+    for _, row, _ in moved:
+        _index_row(index, dict(zip(header, row)))
+    _save_archive_index(cfg, index)
+
+    # Delete bottom-up so earlier row numbers stay valid within the single batch request.
+    requests = [
+        {
+            "deleteDimension": {
+                "range": {
+                    "sheetId": prospects_ws.id,
+                    "dimension": "ROWS",
+                    "startIndex": start - 1,
+                    "endIndex": end,
+                }
+            }
+        }
+        for start, end in reversed(_contiguous_ranges([n for n, _, _ in moved]))
+    ]
+    with get_tracer().span("sheets.delete_rows", sheet=cfg.prospects_sheet_name, rows=len(moved)):
+        prospects_ws.spreadsheet.batch_update({"requests": requests})
+
+    if rows is not None:
+        gone = {n for n, _, _ in moved}
+        rows[:] = [r for i, r in enumerate(rows, start=2) if i not in gone]
+
+    return len(moved)
+
+
+# --- Local archive index (domains + emails) ---------------------------------
+#
+# Archived rows must still count for discovery dedupe and email suppression.
+# Rather than reading the (ever-growing) archive sheet every run, keep a small
+# local index that is updated on each move and rebuilt from the sheet if missing.
+
+
+def _index_path(cfg: SheetsConfig):
+    return state_dir() / f"archive_index_{cfg.spreadsheet_id}.json"
+
+
+def _index_row(index: dict[str, set[str]], row: dict[str, str]) -> None:
+    dom = registrable_domain(row.get("domain") or row.get("website_url") or "")
+    if dom:
+        index["domains"].add(dom)
+    for col in ("primary_email", "all_emails", "emailed_to"):
+        for e in (row.get(col, "") or "").split(","):
+            e = e.strip().lower()
+            if e:
+                index["emails"].add(e)
+
+
+def _save_archive_index(cfg: SheetsConfig, index: dict[str, set[str]]) -> None:
+    path = _index_path(cfg)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({k: sorted(v) for k, v in index.items()}), encoding="utf-8")
+    tmp.replace(path)
+
+
+def load_archive_index(cfg: SheetsConfig) -> dict[str, set[str]]:
+    """Returns {"domains": set, "emails": set} for every archived prospect."""
+    path = _index_path(cfg)
+    if path.exists():
+        data = json.loads(path.read_text(encoding="utf-8") or "{}")
+        return {"domains": set(data.get("domains", [])), "emails": set(data.get("emails", []))}
+
+    index: dict[str, set[str]] = {"domains": set(), "emails": set()}
+    archive_ws = open_archive_worksheet(cfg)
+    values = archive_ws.get_all_values() if archive_ws is not None else []
+    if values:
+        header = [h.strip() for h in values[0]]
+        for r in values[1:]:
+            _index_row(index, dict(zip(header, _ensure_row_width(r, len(header)))))
+    _save_archive_index(cfg, index)
+    return index
@@ -1,13 +1,18 @@
 # dap/sheets/client.py
 
+from __future__ import annotations
+
 import os
+import threading
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from dap.tracing import get_tracer
 
-import gspread
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-import pickle
-from dotenv import load_dotenv
+# gspread / google-auth / dotenv are imported where they are needed, so importing
+# this module (and dap.run_daily) stays cheap for --help, dry runs and tests.
+if TYPE_CHECKING:
+    import gspread
 
 
 @dataclass(frozen=True)
@@ -16,14 +21,19 @@ class SheetsConfig:
     prospects_sheet_name: str = "prospects"
     runs_sheet_name: str = "runs"
     credentials_path: str = ""
+    archive_sheet_name: str = "archive"
 
 
-def load_sheets_config() -> SheetsConfig:
+def load_sheets_config(spreadsheet_id: str = "") -> SheetsConfig:
+    """Sheets settings from the environment (.env); `spreadsheet_id` overrides GOOGLE_SHEETS_SPREADSHEET_ID."""
+    from dotenv import load_dotenv
+
     load_dotenv()
     
-    spreadsheet_id = os.getenv("GOOGLE_SHEETS_SPREADSHEET_ID", "").strip()
+    spreadsheet_id = spreadsheet_id.strip() or os.getenv("GOOGLE_SHEETS_SPREADSHEET_ID", "").strip()
     prospects_name = os.getenv("GOOGLE_SHEETS_WORKSHEET_NAME", "prospects").strip()
     runs_name = os.getenv("GOOGLE_SHEETS_RUNS_WORKSHEET_NAME", "runs").strip()
+    archive_name = os.getenv("GOOGLE_SHEETS_ARCHIVE_WORKSHEET_NAME", "archive").strip()
     cred_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "").strip()
 
     if not spreadsheet_id:
@@ -36,11 +46,18 @@ def load_sheets_config() -> SheetsConfig:
         prospects_sheet_name=prospects_name,
         runs_sheet_name=runs_name,
         credentials_path=cred_path,
+        archive_sheet_name=archive_name,
     )
 
 
 def _client_from_oauth(credentials_path: str) -> gspread.Client:
     """Use OAuth Desktop App flow"""
+    import pickle
+
+    import gspread
+    from google.auth.transport.requests import Request
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
     
     creds = None
@@ -66,13 +83,103 @@ def _client_from_oauth(credentials_path: str) -> gspread.Client:
     return gspread.authorize(creds)
 
 
+_clients: dict[str, gspread.Client] = {}
+_worksheets: dict[tuple[str, str, str], gspread.Worksheet] = {}
+_clients_lock = threading.Lock()
+
+
+def _client(credentials_path: str) -> gspread.Client:
+    """Authorized client, created on first use and reused for the rest of the process."""
+    with _clients_lock:
+        gc = _clients.get(credentials_path)
+        if gc is None:
+            gc = _clients[credentials_path] = _client_from_oauth(credentials_path)
+        return gc
+
+
+def _worksheet(cfg: SheetsConfig, name: str) -> gspread.Worksheet:
+    """Worksheet handle by title; spreadsheet metadata is fetched once per process, not per call."""
+    key = (cfg.credentials_path, cfg.spreadsheet_id, name)
+    with _clients_lock:
+        ws = _worksheets.get(key)
+    if ws is None:
+        ws = _client(cfg.credentials_path).open_by_key(cfg.spreadsheet_id).worksheet(name)
+        with _clients_lock:
+            ws = _worksheets.setdefault(key, ws)
+    return ws
+
+
+def reset_cache() -> None:
+    """Drops cached clients, worksheet handles and column maps (e.g. after a worksheet was renamed)."""
+    from .columns import reset_column_cache
+
+    with _clients_lock:
+        _clients.clear()
+        _worksheets.clear()
+    reset_column_cache()
+
+
+class TracedWorksheet:
+    """Worksheet proxy that records a `sheets.<method>` span around every API call."""
+
+    _CALLS = {
+        "get_all_values",
+        "row_values",
+        "col_values",
+        "get",
+        "batch_get",
+        "update",
+        "batch_update",
+        "append_row",
+        "append_rows",
+    }
+
+    def __init__(self, ws: gspread.Worksheet):
+        self._ws = ws
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._ws, name)
+        if name not in self._CALLS or not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            with get_tracer().span(f"sheets.{name}", sheet=self._ws.title) as sp:
+                try:
+                    return attr(*args, **kwargs)
+                except Exception as e:
+                    # e.g. gspread.exceptions.APIError; 429 = throttled
+                    sp["attrs"]["status"] = getattr(getattr(e, "response", None), "status_code", "")
+                    raise
+
+        return call
+
+
 def open_worksheets(cfg: SheetsConfig) -> tuple[gspread.Worksheet, gspread.Worksheet]:
     """
     Returns (prospects_ws, runs_ws) from the configured spreadsheet.
     """
-    gc = _client_from_oauth(cfg.credentials_path)
-    sh = gc.open_by_key(cfg.spreadsheet_id)
+    with get_tracer().span("sheets.open", sheet=cfg.prospects_sheet_name):
+        prospects_ws = _worksheet(cfg, cfg.prospects_sheet_name)
+        runs_ws = _worksheet(cfg, cfg.runs_sheet_name)
+    return TracedWorksheet(prospects_ws), TracedWorksheet(runs_ws)
+
+
+def open_archive_worksheet(cfg: SheetsConfig, header: list[str] | None = None) -> gspread.Worksheet | None:
+    """
+    Returns the archive worksheet, creating it with `header` if it does not exist yet.
+    Returns None if it does not exist and no header was given.
+    """
+    with get_tracer().span("sheets.open", sheet=cfg.archive_sheet_name):
+        from gspread import WorksheetNotFound
 
-    prospects_ws = sh.worksheet(cfg.prospects_sheet_name)
-    runs_ws = sh.worksheet(cfg.runs_sheet_name)
-    return prospects_ws, runs_ws
\ No newline at end of file
+        try:
+            return TracedWorksheet(_worksheet(cfg, cfg.archive_sheet_name))
+        except WorksheetNotFound:
+            if not header:
+                return None
+            sh = _client(cfg.credentials_path).open_by_key(cfg.spreadsheet_id)
+            ws = sh.add_worksheet(title=cfg.archive_sheet_name, rows=1, cols=max(len(header), 1))
+            ws.append_row(header, value_input_option="USER_ENTERED")
+            with _clients_lock:
+                _worksheets[(cfg.credentials_path, cfg.spreadsheet_id, cfg.archive_sheet_name)] = ws
+            return TracedWorksheet(ws)
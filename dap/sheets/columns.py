@@ -0,0 +1,107 @@
+# dap/sheets/columns.py
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from .client import SheetsConfig, open_worksheets
+from .schema import PROSPECT_COLUMNS_V1, PROSPECT_FEATURE_COLUMNS, RUNS_COLUMNS_V1
+
+
+@lru_cache(maxsize=64)
+def _index(header: tuple[str, ...]) -> dict[str, int]:
+    return {h: i for i, h in enumerate(header) if h}
+
+
+def header_index(header: list[str]) -> dict[str, int]:
+    """{column: position} for a header row. Shared and memoized; do not mutate the result."""
+    return _index(tuple(h.strip() for h in header))
+
+
+@dataclass(frozen=True)
+class ColumnMap:
+    """A worksheet's header row and its column positions."""
+
+    header: tuple[str, ...]
+    index: dict[str, int] = field(compare=False)
+
+    @classmethod
+    def from_header(cls, header: list[str]) -> "ColumnMap":
+        header_t = tuple(h.strip() for h in header)
+        return cls(header_t, _index(header_t))
+
+    def row(self, values: dict[str, Any]) -> list[str]:
+        """A full-width row with each known, non-empty value in its column."""
+        out = [""] * len(self.header)
+        for col, val in values.items():
+            if col in self.index and val:
+                out[self.index[col]] = val
+        return out
+
+    def missing(self, required: list[str]) -> list[str]:
+        return [c for c in required if c not in self.index]
+
+
+# (spreadsheet_id, worksheet title) -> ColumnMap, for the life of the process
+_maps: dict[tuple[str, str], ColumnMap] = {}
+_maps_lock = threading.Lock()
+
+
+def _key(cfg: SheetsConfig | None, ws: Any) -> tuple[str, str]:
+    return (cfg.spreadsheet_id if cfg is not None else "", ws.title)
+
+
+def remember_header(cfg: SheetsConfig | None, ws: Any, header: list[str]) -> ColumnMap:
+    """Caches the header seen by a full-sheet read, so later header-only lookups are free."""
+    cmap = ColumnMap.from_header(header)
+    with _maps_lock:
+        _maps[_key(cfg, ws)] = cmap
+    return cmap
+
+
+def column_map(cfg: SheetsConfig | None, ws: Any, refresh: bool = False) -> ColumnMap:
+    """Column map of `ws`, read from its header row only (`row_values(1)`) on first use.
+
+    Cached per process; `refresh=True` re-reads the header (e.g. once per run in dap.serve).
+    """
+    key = _key(cfg, ws)
+    if not refresh:
+        with _maps_lock:
+            cmap = _maps.get(key)
+        if cmap is not None:
+            return cmap
+    header = ws.row_values(1)
+    if not header:
+        raise RuntimeError(f"{ws.title} sheet is empty (missing header row).")
+    return remember_header(cfg, ws, header)
+
+
+def reset_column_cache() -> None:
+    with _maps_lock:
+        _maps.clear()
+
+
+def validate_schema(cfg: SheetsConfig | None) -> dict[str, list[str]]:
+    """Reads the `prospects` and `runs` header rows (two small reads) and caches their maps.
+
+    Returns the missing v1 columns per sheet; writers skip columns a sheet lacks, so the
+    caller decides whether that is fatal. Raises if a sheet has no header row at all.
+    """
+    prospects_ws, runs_ws = open_worksheets(cfg)
+    return {
+        "prospects": column_map(cfg, prospects_ws, refresh=True).missing(PROSPECT_COLUMNS_V1),
+        "runs": column_map(cfg, runs_ws, refresh=True).missing(RUNS_COLUMNS_V1),
+    }
+
+
+def missing_feature_columns(cfg: SheetsConfig | None) -> dict[str, str]:
+    """{column: what is off without it} for the PROSPECT_FEATURE_COLUMNS the prospects sheet lacks.
+
+    Uses the cached header map (free after validate_schema).
+    """
+    prospects_ws, _ = open_worksheets(cfg)
+    cmap = column_map(cfg, prospects_ws)
+    return {c: effect for c, effect in PROSPECT_FEATURE_COLUMNS.items() if c not in cmap.index}
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 from typing import Any
 
+from dap.suppression import normalize_email
+
 from .client import SheetsConfig, open_worksheets
+from .columns import remember_header
 from .schema import PROSPECT_COLUMNS_V1
 
 
@@ -28,21 +31,24 @@ def read_all_prospects(cfg: SheetsConfig) -> list[dict[str, str]]:
     if not values:
         return []
 
-    header = [h.strip() for h in values[0]]
+    header = list(remember_header(cfg, prospects_ws, values[0]).header)
     data_rows = values[1:]
     return _rows_to_dicts(header, data_rows)
 
 
 def read_contacted_emails(prospects: list[dict[str, str]]) -> set[str]:
     """
-    Builds a suppression set of primary emails already contacted.
-    Uses `status == 'contacted'` and `primary_email` field if present.
+    Builds a suppression set of emails already contacted (normalized, see dap.suppression).
+    Uses `primary_email` of rows with `status == 'contacted'` plus every `emailed_to` address.
     """
     contacted: set[str] = set()
     for p in prospects:
         status = (p.get("status", "") or "").strip().lower()
+        addrs = (p.get("emailed_to", "") or "").split(",")
         if status == "contacted":
-            email = (p.get("primary_email", "") or "").strip().lower()
+            addrs.append(p.get("primary_email", "") or "")
+        for a in addrs:
+            email = normalize_email(a)
             if email:
                 contacted.add(email)
     return contacted
@@ -30,6 +30,21 @@ PROSPECT_COLUMNS_OPTIONAL_V11: list[str] = [
     "scrape_error",
     "email_sent_at",
     "email_provider_message_id",
+    "crawl_fail_count",
+    "content_hash",
+    "contact_source",  # e.g. serper_snippet: emails/phones seeded from the search result
+]
+
+# Optional prospects columns that a feature depends on, and what is off without them.
+# run_daily warns once per run for each one the sheet lacks (writers skip missing columns silently).
+PROSPECT_FEATURE_COLUMNS: dict[str, str] = {
+    "crawl_fail_count": "crawl failures are not counted (no failure penalty in the crawl order, no failure archiving)",
+}
+
+# Extra columns on the `archive` worksheet (appended after the prospects header).
+ARCHIVE_COLUMNS_EXTRA: list[str] = [
+    "archived_at",
+    "archive_reason",
 ]
 
 # Minimal columns for the `runs` worksheet.
@@ -43,3 +58,14 @@ RUNS_COLUMNS_V1: list[str] = [
     "errors_count",
     "top_error",
 ]
+
+# Optional `runs` columns (written only if present in the sheet header).
+RUNS_COLUMNS_OPTIONAL: list[str] = [
+    "enriched_count",
+    "written_count",
+    "deferred_count",
+    "duration_ms",
+    "stage_durations_ms",
+    "fetch_p90_ms",
+    "bytes_fetched",
+]
@@ -0,0 +1,141 @@
+# dap/sheets/write_behind.py
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from .client import SheetsConfig
+from .writers_enrich import ProspectRows, apply_enrichment
+
+_STOP = object()
+
+
+class WriteBehindWriter:
+    """Background writer that flushes enrichment updates to the prospects sheet in batches.
+
+    Updates are submitted while crawling continues; a worker thread flushes them with
+    `apply_enrichment` once `batch_size` updates are pending or `flush_interval_s` has
+    passed since the last flush. `close()` does a final flush and re-raises any write error.
+    The queue holds at most `max_pending` updates: `submit` blocks while it is full, so a
+    slow sheet slows the crawl down instead of piling up memory (like pipeline.Channel).
+    The prospects sheet is read once per writer (see ProspectRows), not once per flush.
+
+        with WriteBehindWriter(cfg) as writer:
+            for r in crawl_results:
+                writer.submit(enrich(prospects, [r]))
+        written = writer.written
+    """
+
+    def __init__(
+        self,
+        cfg: SheetsConfig,
+        batch_size: int = 25,
+        flush_interval_s: float = 5.0,
+        max_pending: int | None = None,
+        write_fn: Callable[[SheetsConfig, List[Dict[str, Any]]], int] | None = None,
+    ):
+        self.cfg = cfg
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval_s = flush_interval_s
+        if write_fn is None:
+            self.rows = ProspectRows(cfg)
+            write_fn = lambda c, ups: apply_enrichment(c, ups, rows=self.rows)  # noqa: E731
+        self.write_fn = write_fn
+        self.written = 0
+        self.flushes = 0
+        self.max_pending = max(max_pending or self.batch_size * 4, self.batch_size)
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_pending)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._worker, name="dap-write-behind", daemon=True)
+        self._started = False
+        self._closed = False
+
+    def start(self) -> "WriteBehindWriter":
+        if not self._started:
+            self._thread.start()
+            self._started = True
+        return self
+
+    def submit(self, updates: List[Dict[str, Any]]) -> None:
+        """Queues updates for writing. Raises the worker's error if a previous flush failed."""
+        self._raise_if_failed()
+        if self._closed:
+            raise RuntimeError("WriteBehindWriter is closed")
+        for up in updates or []:
+            self._put(up)
+
+    def close(self) -> int:
+        """Final flush; waits for the worker and re-raises any write error. Returns rows written."""
+        if not self._closed:
+            self._closed = True
+            if self._started:
+                if self._error is None:
+                    self._put(_STOP)
+                self._thread.join()
+        self._raise_if_failed()
+        return self.written
+
+    def __enter__(self) -> "WriteBehindWriter":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Still flush what we have, but don't mask the original error.
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"write-behind flush failed: {self._error}") from self._error
+
+    def _put(self, item: Any) -> None:
+        """Blocks while the queue is full; wakes up periodically so a dead worker raises instead of hanging."""
+        while True:
+            self._raise_if_failed()
+            try:
+                self._queue.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def _flush(self, pending: List[Dict[str, Any]]) -> None:
+        if not pending:
+            return
+        self.written += self.write_fn(self.cfg, pending)
+        self.flushes += 1
+
+    def _worker(self) -> None:
+        pending: List[Dict[str, Any]] = []
+        oldest = 0.0  # when the oldest pending update arrived
+        try:
+            while True:
+                try:
+                    if pending:
+                        timeout = max(self.flush_interval_s - (time.monotonic() - oldest), 0.0)
+                        item = self._queue.get(timeout=timeout)
+                    else:
+                        item = self._queue.get()
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    self._flush(pending)
+                    return
+                if item is not None:
+                    if not pending:
+                        oldest = time.monotonic()
+                    pending.append(item)
+
+                due = pending and time.monotonic() - oldest >= self.flush_interval_s
+                if len(pending) >= self.batch_size or due:
+                    self._flush(pending)
+                    pending = []
+        except BaseException as e:
+            self._error = e
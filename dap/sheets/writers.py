@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Any
 
 from .client import SheetsConfig, open_worksheets
+from .columns import column_map, remember_header
 from .schema import PROSPECT_COLUMNS_V1, RUNS_COLUMNS_V1
 
 
@@ -14,10 +15,6 @@ def _now_iso() -> str:
     return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
 
-def _header_index(header: list[str]) -> dict[str, int]:
-    return {h.strip(): i for i, h in enumerate(header) if h.strip()}
-
-
 def _ensure_row_width(row: list[Any], width: int) -> list[str]:
     out = [(str(x) if x is not None else "") for x in row]
     if len(out) < width:
@@ -51,8 +48,8 @@ def upsert_prospects(cfg: SheetsConfig, rows: list[dict[str, str]], key: str = "
     if not values:
         raise RuntimeError("Prospects sheet is empty (missing header row).")
 
-    header = [h.strip() for h in values[0]]
-    idx = _header_index(header)
+    cmap = remember_header(cfg, prospects_ws, values[0])
+    header, idx = cmap.header, cmap.index
 
     if key not in idx:
         raise RuntimeError(f"Upsert key '{key}' not found in sheet header.")
@@ -75,10 +72,7 @@ def upsert_prospects(cfg: SheetsConfig, rows: list[dict[str, str]], key: str = "
 
         hit = lookup.get(target_val)
         if hit is None:
-            new_row = [""] * len(header)
-            for col, val in row_dict.items():
-                if col in idx and val:
-                    new_row[idx[col]] = val
+            new_row = cmap.row(row_dict)
             to_append.append(new_row)
             # reserve in lookup so duplicates in this batch don't double-insert
             lookup[target_val] = (-1, new_row)
@@ -132,20 +126,11 @@ def upsert_prospects(cfg: SheetsConfig, rows: list[dict[str, str]], key: str = "
 def append_run_log(cfg: SheetsConfig, run_row: dict[str, str]) -> None:
     """
     Appends a single run summary row to the `runs` worksheet.
+
+    Only the header row is read (once per process, see dap.sheets.columns), so the cost
+    does not grow with run history.
     """
     _, runs_ws = open_worksheets(cfg)
-    values = runs_ws.get_all_values()
-    if not values:
-        raise RuntimeError("Runs sheet is empty (missing header row).")
-
-    header = [h.strip() for h in values[0]]
-    idx = _header_index(header)
-
-    row = [""] * len(header)
-    for col, val in run_row.items():
-        if col in idx and val:
-            row[idx[col]] = val
-
-    runs_ws.append_row(row, value_input_option="USER_ENTERED")
+    runs_ws.append_row(column_map(cfg, runs_ws).row(run_row), value_input_option="USER_ENTERED")
 
 
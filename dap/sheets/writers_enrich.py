@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 from typing import Any, Dict, List
-from urllib.parse import urlsplit, urlunsplit
+from dap.urls import url_key
 
 from .client import SheetsConfig, open_worksheets
+from .columns import remember_header
 
-
-def _header_index(header: list[str]) -> dict[str, int]:
-    return {h.strip(): i for i, h in enumerate(header) if h.strip()}
+# Outcome of the latest crawl: an empty value in an update means "no error / no status"
+# and clears the cell, so a site that recovers does not keep its old scrape_error.
+CLEARABLE_COLUMNS = ("http_status", "scrape_error")
 
 
 def _ensure_row_width(row: list[Any], width: int) -> list[str]:
@@ -19,107 +20,175 @@ def _ensure_row_width(row: list[Any], width: int) -> list[str]:
     return out[:width]
 
 
-def apply_enrichment(cfg: SheetsConfig, updates: List[Dict[str, Any]]) -> int:
-    """Writes enrichment updates back to prospects, keyed by website_url.
-
-    - Never overwrites non-empty cells with empty values.
-    - Notes appends with " | ".
-    """
-    if not updates:
-        return 0
-
-    def _norm(u: str) -> str:
-        u = (u or "").strip()
-        if not u:
-            return ""
-        p = urlsplit(u)
-        if not p.scheme:
-            p = urlsplit("https://" + u)
-        return urlunsplit((p.scheme, p.netloc, "", "", ""))
-
-    prospects_ws, _ = open_worksheets(cfg)
-    values = prospects_ws.get_all_values()
-    if not values:
-        raise RuntimeError("Prospects sheet is empty (missing header row).")
+def _col_letter(j: int) -> str:
+    """A1 column letters for 0-based column `j` (0 -> A, 26 -> AA)."""
+    out = ""
+    j += 1
+    while j:
+        j, r = divmod(j - 1, 26)
+        out = chr(65 + r) + out
+    return out
 
-    header = [h.strip() for h in values[0]]
-    idx = _header_index(header)
 
-    if "website_url" not in idx:
-        raise RuntimeError("Prospects sheet missing required column: website_url")
+class ProspectRows:
+    """Prospects rows by website_url join key (dap.urls.url_key), read once and kept current.
 
-    # Map normalized website_url -> (row_num, row_values)
-    rows_by_url: dict[str, tuple[int, list[str]]] = {}
-    for i, r in enumerate(values[1:], start=2):
-        row = _ensure_row_width(r, len(header))
-        url = _norm(row[idx["website_url"]])
-        if url:
-            rows_by_url[url] = (i, row)
+    Written rows are updated in place, so a long-lived instance (one per WriteBehindWriter)
+    costs one full read per run instead of one per flush. A key that is missing triggers
+    one re-read (rows seeded since the last read are appended at the end of the sheet).
+    Before writing, `verify` re-checks the website_url column, so rows deleted or archived
+    mid-run never redirect a write to another row.
+    """
 
-    writes = 0
+    def __init__(self, cfg: SheetsConfig):
+        self.cfg = cfg
+        self.ws: Any = None
+        self.header: tuple[str, ...] = ()
+        self.idx: dict[str, int] = {}
+        self.by_url: dict[str, tuple[int, list[str]]] = {}
+        self.absent: set[str] = set()  # still missing after a re-read; don't re-read for them again
+        self.reads = 0
+        self._fresh = False  # loaded since the last write: row numbers are current
+
+    def load(self) -> None:
+        if self.ws is None:
+            self.ws, _ = open_worksheets(self.cfg)
+        values = self.ws.get_all_values()
+        self.reads += 1
+        if not values:
+            raise RuntimeError("Prospects sheet is empty (missing header row).")
+
+        cmap = remember_header(self.cfg, self.ws, values[0])
+        self.header, self.idx = cmap.header, cmap.index
+        if "website_url" not in self.idx:
+            raise RuntimeError("Prospects sheet missing required column: website_url")
+
+        self.by_url = {}
+        for i, r in enumerate(values[1:], start=2):
+            row = _ensure_row_width(r, len(self.header))
+            url = url_key(row[self.idx["website_url"]])
+            if url:
+                self.by_url[url] = (i, row)
+        self._fresh = True
+
+    def resolve(self, keys: List[str]) -> None:
+        """Loads on first use; re-reads once if any of `keys` is not known yet."""
+        if self.ws is None or any(k not in self.by_url and k not in self.absent for k in keys):
+            self.load()
+            self.absent.update(k for k in keys if k not in self.by_url)
+
+    def verify(self, rows: dict[int, str]) -> bool:
+        """True if every {row number: url key} still matches the sheet (one read of the website_url column)."""
+        if self._fresh or not rows:
+            return True
+        col = self.ws.col_values(self.idx["website_url"] + 1)
+        return all(n <= len(col) and url_key(col[n - 1]) == key for n, key in rows.items())
+
+
+def _plan(rows: ProspectRows, updates: List[Dict[str, Any]]) -> dict[str, tuple[int, list[str], set[int]]]:
+    """{url key: (row number, merged row, changed column positions)} for the rows `updates` change."""
+    idx = rows.idx
+    planned: dict[str, tuple[int, list[str], set[int]]] = {}
 
     for up in updates:
-        url = _norm(up.get("website_url") or up.get("url") or "")
+        url = url_key(up.get("website_url") or up.get("url") or "")
         if not url:
             continue
 
-        hit = rows_by_url.get(url)
-        if not hit:
-            continue
-
-        row_num, existing = hit
-        updated = existing[:]
-        changed = False
+        if url in planned:
+            # later updates to the same row in this batch build on the earlier ones
+            row_num, updated, cols = planned[url]
+        else:
+            hit = rows.by_url.get(url)
+            if not hit:
+                continue
+            row_num, existing = hit
+            updated, cols = existing[:], set()
 
         for col, val in up.items():
             if col not in idx:
                 continue
 
             v = "" if val is None else str(val).strip()
-            if not v:
+            if not v and col not in CLEARABLE_COLUMNS:
                 continue
 
             j = idx[col]
+            before = updated[j]
 
             if col == "notes":
-                if updated[j]:
-                    updated[j] = f"{updated[j]} | {v}"
-                else:
-                    updated[j] = v
-                changed = True
-
-            elif col == "last_checked_at":
-                # Always update timestamp
-                if updated[j] != v:
-                    updated[j] = v
-                    changed = True
-
-            elif col == "last_emailed_at":
-                # Always update email timestamp
-                if updated[j] != v:
-                    updated[j] = v
-                    changed = True
-
-            elif col == "emailed_to":
-                # Always update last emailed recipient(s)
-                if updated[j] != v:
-                    updated[j] = v
-                    changed = True
-
-            elif col == "status":
-                # Always update status (e.g., discovered -> contacted)
-                if updated[j] != v:
-                    updated[j] = v
-                    changed = True
-
-            else:
+                updated[j] = f"{updated[j]} | {v}" if updated[j] else v
+
+            elif col in ("last_checked_at", "last_emailed_at", "emailed_to", "status"):
+                # Always update timestamps, last emailed recipient(s) and status (e.g. discovered -> contacted)
+                updated[j] = v
+
+            elif col in ("crawl_fail_count", "content_hash", "http_status", "scrape_error"):
+                # Always update crawl outcome fields (failure counter can reset to 0)
+                updated[j] = v
+
+            elif col in ("send_status", "email_sent_at", "email_provider_message_id"):
+                # Always update send outcome (queued -> sent/failed)
+                updated[j] = v
+
+            elif not updated[j]:
                 # Only fill blanks for other fields
-                if not updated[j]:
-                    updated[j] = v
-                    changed = True
+                updated[j] = v
 
-        if changed:
-            prospects_ws.update(f"A{row_num}", [updated], value_input_option="USER_ENTERED")
-            writes += 1
+            if updated[j] != before:
+                cols.add(j)
+
+        if cols:
+            planned[url] = (row_num, updated, cols)
+
+    return planned
+
+
+def _cell_ranges(row_num: int, row: list[str], cols: set[int]) -> List[Dict[str, Any]]:
+    """One A1 range per run of adjacent changed columns, e.g. C5:E5."""
+    out: List[Dict[str, Any]] = []
+    run: list[int] = []
+    for j in sorted(cols) + [-2]:
+        if run and j != run[-1] + 1:
+            a, b = run[0], run[-1]
+            a1 = f"{_col_letter(a)}{row_num}" + (f":{_col_letter(b)}{row_num}" if b > a else "")
+            out.append({"range": a1, "values": [row[a : b + 1]]})
+            run = []
+        run.append(j)
+    return out
+
+
+def apply_enrichment(cfg: SheetsConfig, updates: List[Dict[str, Any]], rows: ProspectRows | None = None) -> int:
+    """Writes enrichment updates back to prospects, keyed by website_url, in one batch_update.
+
+    - Never overwrites non-empty cells with empty values, except CLEARABLE_COLUMNS present
+      in the update.
+    - Notes appends with " | ".
+    - Writes only the changed cells, after checking their rows have not moved.
+
+    Pass a long-lived `rows` (ProspectRows) to avoid re-reading the sheet on every call.
+    Returns the number of rows changed.
+    """
+    if not updates:
+        return 0
+
+    rows = rows or ProspectRows(cfg)
+    rows.resolve([k for k in (url_key(up.get("website_url") or up.get("url") or "") for up in updates) if k])
+
+    planned = _plan(rows, updates)
+    if not rows.verify({n: url for url, (n, _, _) in planned.items()}):
+        # rows were deleted or archived since the last read: re-read and plan against the current sheet
+        rows.load()
+        planned = _plan(rows, updates)
+    if not planned:
+        return 0
 
-    return writes
+    # One API call for all changed cells
+    batch = []
+    for url, (row_num, row, cols) in sorted(planned.items(), key=lambda kv: kv[1][0]):
+        batch.extend(_cell_ranges(row_num, row, cols))
+    rows.ws.batch_update(batch, value_input_option="USER_ENTERED")
+    for url, (row_num, row, _) in planned.items():
+        rows.by_url[url] = (row_num, row)
+    rows._fresh = False
+    return len(planned)
@@ -0,0 +1,299 @@
+# dap/smtp_sender.py
+
+from __future__ import annotations
+
+import os
+import queue
+import re
+import smtplib
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from email.message import EmailMessage
+from email.utils import format_datetime, make_msgid
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List
+
+
+@dataclass(frozen=True)
+class SmtpConfig:
+    host: str
+    from_addr: str
+    port: int = 587
+    username: str = ""
+    password: str = ""
+    use_starttls: bool = True
+    use_ssl: bool = False
+    timeout_s: int = 30
+    pool_size: int = 2
+    max_messages_per_connection: int = 100
+    max_per_minute: int = 60
+    max_per_domain_per_minute: int = 10
+
+
+def load_smtp_config() -> SmtpConfig:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    host = os.getenv("SMTP_HOST", "").strip()
+    from_addr = os.getenv("SMTP_FROM", "").strip()
+    if not host:
+        raise RuntimeError("Missing env var: SMTP_HOST")
+    if not from_addr:
+        raise RuntimeError("Missing env var: SMTP_FROM")
+
+    def _int(name: str, default: int) -> int:
+        v = os.getenv(name, "").strip()
+        return int(v) if v else default
+
+    def _bool(name: str, default: bool) -> bool:
+        v = os.getenv(name, "").strip().lower()
+        return default if not v else v in ("1", "true", "yes", "on")
+
+    return SmtpConfig(
+        host=host,
+        from_addr=from_addr,
+        port=_int("SMTP_PORT", 587),
+        username=os.getenv("SMTP_USERNAME", "").strip(),
+        password=os.getenv("SMTP_PASSWORD", ""),
+        use_starttls=_bool("SMTP_STARTTLS", True),
+        use_ssl=_bool("SMTP_SSL", False),
+        timeout_s=_int("SMTP_TIMEOUT_S", 30),
+        pool_size=_int("SMTP_POOL_SIZE", 2),
+        max_messages_per_connection=_int("SMTP_MAX_MESSAGES_PER_CONNECTION", 100),
+        max_per_minute=_int("SMTP_MAX_PER_MINUTE", 60),
+        max_per_domain_per_minute=_int("SMTP_MAX_PER_DOMAIN_PER_MINUTE", 10),
+    )
+
+
+def load_email_template(path: Path | None = None) -> Dict[str, str]:
+    """Returns {"subject": ..., "body": ...} format strings from config/email_template.yml."""
+    import yaml  # type: ignore
+
+    path = path or Path(__file__).resolve().parents[1] / "config" / "email_template.yml"
+    if not path.exists():
+        raise FileNotFoundError(f"email_template.yml not found at: {path}")
+    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    if not data.get("subject") or not data.get("body"):
+        raise ValueError("email_template.yml must define: subject, body")
+    return {"subject": str(data["subject"]), "body": str(data["body"])}
+
+
+class _Fields(dict):
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+def build_message(from_addr: str, to_addr: str, template: Dict[str, str], fields: Dict[str, Any]) -> EmailMessage:
+    values = _Fields({k: ("" if v is None else str(v)) for k, v in fields.items()})
+    msg = EmailMessage()
+    msg["From"] = from_addr
+    msg["To"] = to_addr
+    msg["Subject"] = template["subject"].format_map(values).strip()
+    msg["Date"] = format_datetime(datetime.now().astimezone())
+    msg["Message-ID"] = make_msgid(domain=from_addr.rsplit("@", 1)[-1] or None)
+    msg.set_content(template["body"].format_map(values))
+    return msg
+
+
+@dataclass
+class SendResult:
+    to_addr: str
+    ok: bool
+    message_id: str = ""
+    error: str = ""
+    permanent: bool = False  # recipient rejected with 5xx: don't retry this address (bounce)
+    fatal: bool = False  # sender-side failure (connect/auth/MAIL FROM): nothing sent, sending stopped
+    unknown: bool = False  # session lost after DATA: may have been delivered, never resend
+
+
+class RateLimiter:
+    """Sliding one-minute window limits: overall and per recipient domain. Thread-safe."""
+
+    def __init__(self, per_minute: int, per_domain_per_minute: int, clock: Callable[[], float] = time.monotonic):
+        self.per_minute = per_minute
+        self.per_domain = per_domain_per_minute
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._all: Deque[float] = deque()
+        self._by_domain: Dict[str, Deque[float]] = defaultdict(deque)
+
+    def _delay(self, window: Deque[float], limit: int, now: float) -> float:
+        while window and now - window[0] >= 60.0:
+            window.popleft()
+        if limit <= 0 or len(window) < limit:
+            return 0.0
+        return 60.0 - (now - window[0])
+
+    def acquire(self, domain: str) -> None:
+        """Blocks until one more message to `domain` is allowed, then records it."""
+        while True:
+            with self._lock:
+                now = self.clock()
+                dom = self._by_domain[domain]
+                wait = max(self._delay(self._all, self.per_minute, now), self._delay(dom, self.per_domain, now))
+                if wait <= 0:
+                    self._all.append(now)
+                    dom.append(now)
+                    return
+            time.sleep(min(wait, 1.0))
+
+
+_QUEUED_AS_RE = re.compile(r"(?:queued as|id=)\s*<?([A-Za-z0-9._@-]{6,})>?", re.I)
+
+
+class SmtpSender:
+    """Sends messages over a small pool of reused, authenticated SMTP connections.
+
+    Each pool worker keeps one session open and sends messages back-to-back on it,
+    reconnecting after `max_messages_per_connection` or on disconnect. Global and
+    per-recipient-domain rate limits are shared by all workers.
+    """
+
+    def __init__(self, cfg: SmtpConfig, limiter: RateLimiter | None = None):
+        self.cfg = cfg
+        self.limiter = limiter or RateLimiter(cfg.max_per_minute, cfg.max_per_domain_per_minute)
+
+    def _connect(self) -> smtplib.SMTP:
+        cfg = self.cfg
+        if cfg.use_ssl:
+            conn: smtplib.SMTP = smtplib.SMTP_SSL(cfg.host, cfg.port, timeout=cfg.timeout_s)
+        else:
+            conn = smtplib.SMTP(cfg.host, cfg.port, timeout=cfg.timeout_s)
+        conn.ehlo()
+        if cfg.use_starttls and not cfg.use_ssl:
+            conn.starttls()
+            conn.ehlo()
+        if cfg.username:
+            conn.login(cfg.username, cfg.password)
+        return conn
+
+    def _send_one(self, conn: smtplib.SMTP, msg: EmailMessage) -> SendResult:
+        to_addr = str(msg["To"])
+        code, resp = conn.mail(self.cfg.from_addr)
+        if code != 250:
+            # our sender address is refused: not about this recipient
+            conn.rset()
+            return SendResult(to_addr, False, error=f"MAIL {code} {resp!r}"[:200], fatal=True)
+        code, resp = conn.rcpt(to_addr)
+        if code not in (250, 251):
+            conn.rset()
+            return SendResult(to_addr, False, error=f"RCPT {code} {resp!r}"[:200], permanent=code >= 500)
+        try:
+            code, resp = conn.data(msg.as_bytes())
+        except smtplib.SMTPDataError as e:
+            # DATA command refused before the message was sent
+            code, resp = e.smtp_code, e.smtp_error
+        except (smtplib.SMTPServerDisconnected, OSError) as e:
+            # the server may have queued the message before the session dropped
+            return SendResult(to_addr, False, error=f"DATA {type(e).__name__}: {e}; delivery unknown"[:200], unknown=True)
+        text = resp.decode("utf-8", errors="ignore") if isinstance(resp, bytes) else str(resp)
+        if code != 250:
+            conn.rset()
+            # a 5xx after DATA is a bounce only if it is about this recipient
+            bounced = code >= 500 and to_addr.lower() in text.lower()
+            return SendResult(to_addr, False, error=f"DATA {code} {resp!r}"[:200], permanent=bounced)
+
+        # Prefer the provider's queue id; fall back to our own Message-ID header.
+        m = _QUEUED_AS_RE.search(text)
+        message_id = m.group(1) if m else str(msg["Message-ID"]).strip("<>")
+        return SendResult(to_addr, True, message_id=message_id)
+
+    def _worker(self, jobs: "queue.Queue", results: List[SendResult | None], on_result, stop: threading.Event) -> None:
+        conn: smtplib.SMTP | None = None
+        sent_on_conn = 0
+        try:
+            while True:
+                try:
+                    i, msg = jobs.get_nowait()
+                except queue.Empty:
+                    return
+
+                to_addr = str(msg["To"])
+                if stop.is_set():
+                    # another worker hit a sender-side failure: report the rest as not attempted
+                    result = SendResult(to_addr, False, error="not sent: sending stopped", fatal=True)
+                else:
+                    self.limiter.acquire(to_addr.rsplit("@", 1)[-1].lower())
+                    result, conn, sent_on_conn = self._attempt(conn, sent_on_conn, msg)
+                    if result.fatal:
+                        stop.set()
+                    if result.unknown or result.fatal:
+                        _quit(conn)
+                        conn = None
+                results[i] = result
+                if on_result is not None:
+                    on_result(i, result)
+        finally:
+            _quit(conn)
+
+    def _attempt(self, conn: smtplib.SMTP | None, sent_on_conn: int, msg: EmailMessage):
+        """Sends `msg`, reconnecting once if the session drops before DATA. Returns (result, conn, sent_on_conn)."""
+        to_addr = str(msg["To"])
+        retried = False
+        while True:
+            if conn is None or sent_on_conn >= self.cfg.max_messages_per_connection:
+                _quit(conn)
+                conn, sent_on_conn = None, 0
+                try:
+                    conn = self._connect()
+                except (smtplib.SMTPException, OSError) as e:
+                    # cannot connect or log in: a run error, not a bounce
+                    return SendResult(to_addr, False, error=f"connect {type(e).__name__}: {e}"[:200], fatal=True), None, 0
+            try:
+                return self._send_one(conn, msg), conn, sent_on_conn + 1
+            except OSError as e:  # smtplib.SMTPException included
+                if isinstance(e, smtplib.SMTPException) and not isinstance(e, smtplib.SMTPServerDisconnected):
+                    try:
+                        conn.rset()
+                    except Exception:
+                        conn = None
+                    return SendResult(to_addr, False, error=f"{type(e).__name__}: {e}"[:200]), conn, sent_on_conn
+                # dropped before DATA (see _send_one): reconnect once and retry
+                conn = None
+                if retried:
+                    return SendResult(to_addr, False, error=f"{type(e).__name__}: {e}"[:200]), None, 0
+                retried = True
+
+    def send(
+        self,
+        messages: List[EmailMessage],
+        on_result: Callable[[int, SendResult], None] | None = None,
+    ) -> List[SendResult]:
+        """Sends all messages; returns one SendResult per message, in order.
+
+        on_result(index, result) is called from the worker thread as each message finishes.
+        After a `fatal` result the remaining messages are not attempted; they come back
+        `fatal` too, so the caller can leave them queued.
+        """
+        if not messages:
+            return []
+
+        jobs: queue.Queue = queue.Queue()
+        for i, msg in enumerate(messages):
+            jobs.put((i, msg))
+        results: List[SendResult | None] = [None] * len(messages)
+
+        stop = threading.Event()
+        n_workers = max(1, min(self.cfg.pool_size, len(messages)))
+        workers = [
+            threading.Thread(target=self._worker, args=(jobs, results, on_result, stop), daemon=True) for _ in range(n_workers)
+        ]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+
+        return [r or SendResult(str(m["To"]), False, error="not sent") for r, m in zip(results, messages)]
+
+
+def _quit(conn: smtplib.SMTP | None) -> None:
+    if conn is None:
+        return
+    try:
+        conn.quit()
+    except Exception:
+        pass
@@ -0,0 +1,23 @@
+# dap/state.py
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+def _repo_root() -> Path:
+    # .../DAP/dap/state.py -> .../DAP
+    return Path(__file__).resolve().parents[1]
+
+
+def state_dir(*parts: str) -> Path:
+    """Returns (and creates) the local state directory, or a subdirectory of it.
+
+    Defaults to `<repo>/.dap_state`; override with DAP_STATE_DIR.
+    """
+    base = os.getenv("DAP_STATE_DIR", "").strip()
+    path = Path(base) if base else _repo_root() / ".dap_state"
+    path = path.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
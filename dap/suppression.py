@@ -0,0 +1,215 @@
+# dap/suppression.py
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import math
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+from dap.state import state_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS addresses (
+    addr     TEXT PRIMARY KEY,
+    reason   TEXT NOT NULL,
+    added_at TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS domains (
+    domain   TEXT PRIMARY KEY,
+    reason   TEXT NOT NULL,
+    added_at TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value BLOB
+) WITHOUT ROWID;
+"""
+
+
+def _utc_now_iso() -> str:
+    return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+
+def normalize_email(addr: str) -> str:
+    """Lowercases and drops the plus-tag: "Info+News@Example.COM" -> "info@example.com"."""
+    a = (addr or "").strip().strip("<>").lower()
+    if a.startswith("mailto:"):
+        a = a[7:]
+    local, sep, domain = a.rpartition("@")
+    if not sep or not local or not domain:
+        return ""
+    local = local.split("+", 1)[0]
+    return f"{local}@{domain}" if local else ""
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter over strings (double hashing on one blake2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(capacity, 1)
+        m = int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.m = max(((m + 7) // 8) * 8, 64)
+        self.k = max(int(round(self.m / self.capacity * math.log(2))), 1)
+        self.bits = bytearray(self.m // 8)
+
+    def _positions(self, s: str):
+        d = hashlib.blake2b(s.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        return ((h1 + i * h2) % self.m for i in range(self.k))
+
+    def add(self, s: str) -> None:
+        for p in self._positions(s):
+            self.bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, s: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(s))
+
+    def to_bytes(self) -> bytes:
+        return self.capacity.to_bytes(8, "little") + self.k.to_bytes(2, "little") + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        bloom = cls.__new__(cls)
+        bloom.capacity = int.from_bytes(data[:8], "little")
+        bloom.k = int.from_bytes(data[8:10], "little")
+        bloom.bits = bytearray(data[10:])
+        bloom.m = len(bloom.bits) * 8
+        return bloom
+
+
+class SuppressionIndex:
+    """Persistent email suppression index (SQLite) with a Bloom-filter front.
+
+    Addresses are normalized (case, plus-tags). Whole domains can be suppressed.
+    Lookups check the in-memory domain set, then the Bloom filter; only possible hits
+    reach the SQLite primary-key index. The index grows incrementally: each run adds
+    the contacted rows it already holds in memory plus its sends and bounces, and large
+    one-off sources (the archive) are imported once with `seed`.
+    Supports `addr in index`, so it can stand in for the old contacted-emails set.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or state_dir() / "suppression.sqlite3"
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._domains = {d for (d,) in self._db.execute("SELECT domain FROM domains")}
+        self._count = self._db.execute("SELECT COUNT(*) FROM addresses").fetchone()[0]
+        self._bloom = self._load_bloom()
+
+    def _load_bloom(self) -> BloomFilter:
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'bloom'").fetchone()
+        cnt = self._db.execute("SELECT value FROM meta WHERE key = 'bloom_count'").fetchone()
+        if row and cnt and int(cnt[0]) == self._count:
+            return BloomFilter.from_bytes(row[0])
+        return self._rebuild_bloom()
+
+    def _rebuild_bloom(self) -> BloomFilter:
+        bloom = BloomFilter(max(self._count * 2, 10_000))
+        for (addr,) in self._db.execute("SELECT addr FROM addresses"):
+            bloom.add(addr)
+        return bloom
+
+    def close(self) -> None:
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("bloom", self._bloom.to_bytes()), ("bloom_count", str(self._count))],
+            )
+        self._db.close()
+
+    def __enter__(self) -> "SuppressionIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, addr: str) -> bool:
+        a = normalize_email(addr)
+        if not a:
+            return False
+        if a.rsplit("@", 1)[1] in self._domains:
+            return True
+        if a not in self._bloom:
+            return False
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM addresses WHERE addr = ?", (a,)).fetchone() is not None
+
+    def add_many(self, addrs: Iterable[str], reason: str = "contacted") -> int:
+        """Adds addresses; returns how many were new."""
+        now = _utc_now_iso()
+        rows = [(a, reason, now) for a in {normalize_email(x) for x in addrs} if a]
+        if not rows:
+            return 0
+        with self._lock, self._db:
+            before = self._db.total_changes
+            self._db.executemany("INSERT OR IGNORE INTO addresses (addr, reason, added_at) VALUES (?, ?, ?)", rows)
+            added = self._db.total_changes - before
+            self._count += added
+            for a, _, _ in rows:
+                self._bloom.add(a)
+            if self._count > self._bloom.capacity:
+                self._bloom = self._rebuild_bloom()
+        return added
+
+    def seeded(self, source: str) -> bool:
+        """True once `seed(source, ...)` has run."""
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM meta WHERE key = ?", (f"seeded:{source}",)).fetchone() is not None
+
+    def seed(self, source: str, addrs: Iterable[str]) -> int:
+        """One-time import of already-contacted addresses from `source` (e.g. a spreadsheet id)."""
+        added = self.add_many(addrs)
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (f"seeded:{source}", _utc_now_iso()))
+        return added
+
+    def add(self, addr: str, reason: str = "contacted") -> bool:
+        return self.add_many([addr], reason) == 1
+
+    def add_bounce(self, addr: str) -> bool:
+        return self.add(addr, reason="bounce")
+
+    def suppress_domain(self, domain: str, reason: str = "manual") -> None:
+        d = (domain or "").strip().lower().lstrip("@")
+        if not d:
+            return
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO domains (domain, reason, added_at) VALUES (?, ?, ?)", (d, reason, _utc_now_iso())
+            )
+            self._domains.add(d)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Manage the local email suppression index.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name in ("add", "bounce", "add-domain", "check"):
+        sub.add_parser(name).add_argument("values", nargs="+")
+    args = parser.parse_args()
+
+    with SuppressionIndex() as index:
+        for v in args.values:
+            if args.cmd == "add":
+                index.add(v, reason="manual")
+            elif args.cmd == "bounce":
+                index.add_bounce(v)
+            elif args.cmd == "add-domain":
+                index.suppress_domain(v)
+            else:
+                print(f"{v}\t{'suppressed' if v in index else 'ok'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
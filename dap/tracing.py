@@ -0,0 +1,142 @@
+# dap/tracing.py
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from dap.state import state_dir
+
+
+def _percentile(sorted_vals: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_vals:
+        return 0.0
+    k = max(math.ceil(pct / 100.0 * len(sorted_vals)) - 1, 0)
+    return sorted_vals[min(k, len(sorted_vals) - 1)]
+
+
+class Tracer:
+    """Lightweight span recorder for one pipeline run.
+
+    Spans are plain dicts: {name, kind, start_ms, duration_ms, attrs, error?}.
+    kind is "stage" for pipeline phases and "call" for external calls
+    (serper.search, fetch, sheets.*). Thread-safe.
+    """
+
+    def __init__(self, run_id: str = ""):
+        self.run_id = run_id
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def span(self, name: str, kind: str = "call", **attrs: Any) -> Iterator[Dict[str, Any]]:
+        rec: Dict[str, Any] = {"name": name, "kind": kind, "attrs": attrs}
+        start = time.perf_counter()
+        rec["start_ms"] = round((start - self._t0) * 1000, 3)
+        try:
+            yield rec
+        except BaseException as e:
+            rec["error"] = type(e).__name__
+            raise
+        finally:
+            rec["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            with self._lock:
+                self.spans.append(rec)
+
+    def stage(self, name: str, **attrs: Any):
+        return self.span(name, kind="stage", **attrs)
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self._t0) * 1000, 3)
+
+    def stage_durations(self) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        with self._lock:
+            for s in self.spans:
+                if s["kind"] == "stage":
+                    out[s["name"]] = round(out.get(s["name"], 0.0) + s["duration_ms"], 3)
+        return out
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = list(self.spans)
+
+        calls: Dict[str, List[Dict[str, Any]]] = {}
+        hosts: Dict[str, List[Dict[str, Any]]] = {}
+        for s in spans:
+            if s["kind"] != "call":
+                continue
+            calls.setdefault(s["name"], []).append(s)
+            if s["name"] == "fetch":
+                hosts.setdefault(s["attrs"].get("host", ""), []).append(s)
+
+        def _stats(group: List[Dict[str, Any]]) -> Dict[str, Any]:
+            d = sorted(x["duration_ms"] for x in group)
+            return {
+                "count": len(group),
+                "errors": sum(1 for x in group if x.get("error")),
+                "total_ms": round(sum(d), 3),
+                "p50_ms": _percentile(d, 50),
+                "p90_ms": _percentile(d, 90),
+                "p99_ms": _percentile(d, 99),
+                "max_ms": d[-1] if d else 0.0,
+                "bytes": sum(int(x["attrs"].get("bytes", 0) or 0) for x in group),
+            }
+
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "duration_ms": self.elapsed_ms(),
+            "stages": self.stage_durations(),
+            "calls": {name: _stats(g) for name, g in sorted(calls.items())},
+            "fetch_hosts": {host: _stats(g) for host, g in sorted(hosts.items())},
+        }
+
+    def write_json(self, path: Path | None = None) -> Path:
+        """Writes summary and spans. Without `path`, writes to state/traces and keeps only the
+        newest DAP_TRACE_KEEP (default 100) traces there."""
+        prune = path is None
+        path = path or state_dir("traces") / f"{self.run_id or 'run'}.json"
+        with self._lock:
+            spans = list(self.spans)
+        path.write_text(json.dumps({"summary": self.summary(), "spans": spans}, indent=1), encoding="utf-8")
+        if prune:
+            prune_traces(path.parent, int(os.getenv("DAP_TRACE_KEEP", "100") or 100))
+        return path
+
+
+def prune_traces(directory: Path, keep: int) -> int:
+    """Deletes all but the `keep` newest *.json traces in `directory`; returns how many were deleted."""
+    traces = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    deleted = 0
+    for old in traces[max(keep, 1) :]:
+        try:
+            old.unlink()
+            deleted += 1
+        except OSError:
+            pass
+    return deleted
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """The tracer of the current run (instrumented modules record into this)."""
+    return _tracer
+
+
+def start_run(run_id: str) -> Tracer:
+    """Starts a fresh tracer for a new run and makes it current."""
+    global _tracer
+    _tracer = Tracer(run_id)
+    return _tracer
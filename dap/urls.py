@@ -0,0 +1,107 @@
+# dap/urls.py
+
+from __future__ import annotations
+
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit
+
+# One canonicalization for every stage (discovery, seeding, crawl, enrich, sheet joins,
+# sharding). All functions are pure and memoized: the same URLs and domains repeat
+# across rows, stages and (in dap.serve) runs.
+
+_CACHE_SIZE = 1 << 16
+
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+# Public suffixes with more than one label that we meet in practice, plus hosting
+# platforms that give every customer a subdomain. Without these, registrable_domain
+# would merge unrelated sites ("a.co.uk" / "b.co.uk", "x.wixsite.com" / "y.wixsite.com").
+# Not the full Public Suffix List; extend as new ones show up.
+MULTI_LABEL_SUFFIXES = frozenset(
+    {
+        "co.uk", "org.uk", "ac.uk", "gov.uk", "me.uk", "ltd.uk", "plc.uk",
+        "com.au", "net.au", "org.au", "co.nz", "org.nz", "co.za",
+        "co.cr", "or.cr", "fi.cr", "go.cr", "ac.cr", "ed.cr", "sa.cr",
+        "com.mx", "org.mx", "com.br", "com.ar", "com.co", "com.pa", "com.gt", "com.ni", "com.sv", "com.hn",
+        "co.jp", "co.kr", "com.cn", "com.hk", "com.sg", "co.in", "co.il",
+        "blogspot.com", "wordpress.com", "wixsite.com", "weebly.com", "squarespace.com", "godaddysites.com",
+        "business.site", "square.site", "myshopify.com", "webflow.io", "github.io", "netlify.app",
+        "herokuapp.com", "carrd.co", "site123.me", "jimdosite.com", "strikingly.com",
+    }
+)
+
+
+def _split(u: str):
+    u = (u or "").strip()
+    if not u:
+        return None
+    if u.startswith("//"):
+        u = "https:" + u
+    elif "://" not in u:
+        u = "https://" + u
+    return urlsplit(u)
+
+
+def _netloc(p) -> str:
+    """Lowercased host without userinfo, trailing dot or default port."""
+    host = (p.hostname or "").rstrip(".")
+    try:
+        port = p.port
+    except ValueError:
+        port = None
+    if port is not None and str(port) != _DEFAULT_PORTS.get(p.scheme.lower()):
+        return f"{host}:{port}"
+    return host
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def normalize_url(u: str) -> str:
+    """Full URL with scheme/host canonical and query/fragment dropped: "https://example.com/path"."""
+    p = _split(u)
+    if p is None or not p.hostname:
+        return ""
+    scheme = p.scheme.lower() or "https"
+    return urlunsplit((scheme, _netloc(p), p.path or "/", "", ""))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def canonical_url(u: str) -> str:
+    """Site root used for fetching and as the stored website_url: "https://www.example.com".
+
+    Keeps the scheme and a `www.` prefix (some sites only answer on one of them).
+    """
+    p = _split(u)
+    if p is None or not p.hostname:
+        return ""
+    return urlunsplit((p.scheme.lower() or "https", _netloc(p), "", "", ""))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def url_key(u: str) -> str:
+    """Join key for matching rows and crawl results: host without scheme or `www.`."""
+    p = _split(u)
+    if p is None or not p.hostname:
+        return ""
+    host = _netloc(p)
+    return host[4:] if host.startswith("www.") else host
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def registrable_domain(u: str) -> str:
+    """Domain a business registers ("shop.example.co.uk" -> "example.co.uk").
+
+    Accepts a URL or a bare host; used for domain-level dedupe, the `domain` column and sharding.
+    """
+    p = _split(u)
+    if p is None or not p.hostname:
+        return ""
+    host = (p.hostname or "").rstrip(".")
+    labels = host.split(".")
+    if len(labels) <= 2 or all(x.isdigit() for x in labels):
+        return host
+    n = 3 if ".".join(labels[-2:]) in MULTI_LABEL_SUFFIXES else 2
+    return ".".join(labels[-n:])
+
+
+def cache_info() -> dict:
+    return {f.__name__: f.cache_info()._asdict() for f in (normalize_url, canonical_url, url_key, registrable_domain)}
@@ -0,0 +1,92 @@
+import itertools
+import socketserver
+import threading
+
+import pytest
+
+
+class StubSmtpServer(socketserver.ThreadingTCPServer):
+    """Minimal local SMTP stand-in: EHLO, AUTH PLAIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT.
+
+    Recipients whose local part starts with "bounce" are rejected with 550; for "drop" the
+    server keeps the message but closes the connection before replying to DATA.
+    Set `.mail_reply` / `.auth_reply` to make MAIL FROM / AUTH fail.
+    Accepted messages are kept in `.messages` as (mail_from, rcpt_to, data).
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubSmtpHandler)
+        self.messages = []
+        self.connections = 0
+        self.mail_reply = "250 OK"
+        self.auth_reply = "235 2.7.0 Authentication successful"
+        self._ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def next_id(self):
+        with self.lock:
+            return f"STUB{next(self._ids):06d}"
+
+
+class _StubSmtpHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self._reply("220 stub ESMTP")
+        mail_from, rcpt_to = None, []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            cmd = raw.decode(errors="ignore").strip()
+            verb = cmd.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self.wfile.write(b"250-stub\r\n250-AUTH PLAIN\r\n250 PIPELINING\r\n")
+            elif verb == "AUTH":
+                self._reply(server.auth_reply)
+            elif verb == "MAIL":
+                mail_from, rcpt_to = cmd[10:].strip("<> "), []
+                self._reply(server.mail_reply)
+            elif verb == "RCPT":
+                addr = cmd[8:].strip("<> ")
+                if addr.lower().startswith("bounce"):
+                    self._reply("550 5.1.1 No such user")
+                else:
+                    rcpt_to.append(addr)
+                    self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line == b".\r\n":
+                        break
+                    lines.append(line)
+                with server.lock:
+                    server.messages.append((mail_from, list(rcpt_to), b"".join(lines)))
+                if any(r.lower().startswith("drop") for r in rcpt_to):
+                    return
+                self._reply(f"250 2.0.0 Ok: queued as {server.next_id()}")
+            elif verb in ("RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+@pytest.fixture
+def smtp_server():
+    server = StubSmtpServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,93 @@
+# tests/fakes.py
+#
+# In-memory Google Sheets double, shared by the unit tests and the offline benchmarks.
+
+from __future__ import annotations
+
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+
+class MemoryWorksheet:
+    """In-memory double of the gspread.Worksheet calls DAP makes (single-row A1 ranges).
+
+    `latency_ms` is added to every call to model the Sheets API round trip; `calls`
+    counts them per method.
+    """
+
+    def __init__(self, title: str, values: List[List[str]], latency_ms: float = 0.0):
+        self.title = title
+        self.values = [list(r) for r in values]
+        self.latency_s = latency_ms / 1000.0
+        self.calls: Dict[str, int] = {}
+
+    def _call(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+    def get_all_values(self) -> List[List[str]]:
+        self._call("get_all_values")
+        return [list(r) for r in self.values]
+
+    def row_values(self, row: int) -> List[str]:
+        self._call("row_values")
+        return list(self.values[row - 1]) if 0 < row <= len(self.values) else []
+
+    def append_row(self, row: List[str], value_input_option: str = "RAW") -> None:
+        self._call("append_row")
+        self.values.append([str(x) for x in row])
+
+    def append_rows(self, rows: List[List[str]], value_input_option: str = "RAW") -> None:
+        self._call("append_rows")
+        self.values.extend([str(x) for x in r] for r in rows)
+
+    def _set_row(self, a1: str, row: List[str]) -> None:
+        m = re.match(r"([A-Z]+)(\d+)", a1)
+        j = 0
+        for ch in m.group(1):
+            j = j * 26 + ord(ch) - 64
+        n = int(m.group(2))
+        while len(self.values) < n:
+            self.values.append([])
+        cur = self.values[n - 1]
+        cur.extend([""] * (j - 1 + len(row) - len(cur)))
+        cur[j - 1 : j - 1 + len(row)] = [str(x) for x in row]
+
+    def col_values(self, col: int) -> List[str]:
+        self._call("col_values")
+        out = [r[col - 1] if len(r) >= col else "" for r in self.values]
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    def update(self, a1: str, values: List[List[str]], value_input_option: str = "RAW") -> None:
+        self._call("update")
+        self._set_row(a1, values[0])
+
+    def batch_update(self, data: List[Dict[str, Any]], value_input_option: str = "RAW") -> None:
+        self._call("batch_update")
+        for d in data:
+            self._set_row(d["range"], d["values"][0])
+
+    def delete_rows(self, start: int, end: int | None = None) -> None:
+        self._call("delete_rows")
+        del self.values[start - 1 : (end or start)]
+
+
+@contextmanager
+def memory_sheets(prospects_ws: MemoryWorksheet, runs_ws: MemoryWorksheet) -> Iterator[None]:
+    """Points the dap.sheets readers/writers at in-memory worksheets."""
+    from dap.sheets import columns, readers, writers, writers_enrich
+
+    modules = (columns, readers, writers, writers_enrich)
+    saved = [m.open_worksheets for m in modules]
+    for m in modules:
+        m.open_worksheets = lambda cfg: (prospects_ws, runs_ws)
+    try:
+        yield
+    finally:
+        for m, fn in zip(modules, saved):
+            m.open_worksheets = fn
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from tests.fakes import MemoryWorksheet
+from dap.sheets import archive
+from dap.sheets.archive import ArchiveRules, _contiguous_ranges, archive_prospects, archive_reason, load_archive_index
+from dap.sheets.columns import reset_column_cache
+
+NOW = datetime(2026, 6, 1)
+HEADER = ["domain", "website_url", "primary_email", "status", "last_checked_at", "crawl_fail_count"]
+
+
+def test_archive_reason():
+    rules = ArchiveRules(contacted_older_than_days=30, max_crawl_failures=3)
+    assert archive_reason({"status": "contacted", "last_emailed_at": "2026-04-01T00:00:00Z"}, rules, NOW) == "contacted>30d"
+    assert archive_reason({"status": "Contacted", "email_sent_at": "2026-05-20T00:00:00Z"}, rules, NOW) == ""
+    assert archive_reason({"status": "contacted"}, rules, NOW) == ""
+    assert archive_reason({"crawl_fail_count": "3"}, rules, NOW) == "crawl_failures>=3"
+    assert archive_reason({"crawl_fail_count": "x"}, rules, NOW) == ""
+    assert archive_reason({"crawl_fail_count": "9"}, ArchiveRules(max_crawl_failures=0), NOW) == ""
+
+
+def test_contiguous_ranges():
+    assert _contiguous_ranges([10, 5, 7, 6]) == [(5, 7), (10, 10)]
+    assert _contiguous_ranges([]) == []
+
+
+class _Spreadsheet:
+    def batch_update(self, body):
+        raise RuntimeError("crashed before delete")
+
+
+def test_index_is_saved_before_rows_are_deleted(tmp_path, monkeypatch):
+    monkeypatch.setenv("DAP_STATE_DIR", str(tmp_path))
+    reset_column_cache()
+    prospects = MemoryWorksheet("prospects", [HEADER])
+    prospects.id, prospects.spreadsheet = 0, _Spreadsheet()
+    archive_ws = MemoryWorksheet("archive", [HEADER + ["archived_at", "archive_reason"]])
+    monkeypatch.setattr(archive, "open_worksheets", lambda cfg: (prospects, None))
+    monkeypatch.setattr(archive, "open_archive_worksheet", lambda cfg, header=None: archive_ws)
+
+    class Cfg:
+        spreadsheet_id = "s1"
+        prospects_sheet_name = "prospects"
+
+    rows = [
+        {"domain": "dead.example", "primary_email": "a@dead.example", "crawl_fail_count": "5"},
+        {"domain": "live.example"},
+    ]
+    with pytest.raises(RuntimeError, match="crashed"):
+        archive_prospects(Cfg(), ArchiveRules(), rows=rows)
+
+    assert prospects.calls == {"row_values": 1}  # header only; the rows were passed in
+    assert len(archive_ws.values) == 2
+    assert load_archive_index(Cfg()) == {"domains": {"dead.example"}, "emails": {"a@dead.example"}}
+    reset_column_cache()
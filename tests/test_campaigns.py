@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from dap.campaigns import SharedCrawl, load_campaigns
+from dap.outbox import Outbox, outbox_path
+from dap.suppression import SuppressionIndex
+
+
+def test_load_campaigns(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHEET_B", "sheet-b")
+    path = tmp_path / "campaigns.yml"
+    path.write_text(
+        "campaigns:\n"
+        "  - {name: a, enabled: true, spreadsheet_id: sheet-a, packs: [p1, p2]}\n"
+        "  - {name: b, enabled: true, spreadsheet_id_env: SHEET_B, packs: [p2], runs_sheet_name: runs_b}\n"
+        "  - {name: off, enabled: false, spreadsheet_id: x, packs: [p1]}\n"
+    )
+    a, b = load_campaigns(path)
+    assert (a.name, a.spreadsheet_id, a.packs) == ("a", "sheet-a", ("p1", "p2"))
+    assert (b.spreadsheet_id, b.runs_sheet_name) == ("sheet-b", "runs_b")
+
+    path.write_text("campaigns:\n  - {name: c, enabled: true, spreadsheet_id: x, packs: []}\n")
+    with pytest.raises(ValueError, match="pack"):
+        load_campaigns(path)
+
+
+def test_shared_crawl_fetches_each_domain_once():
+    calls = []
+
+    def crawl(item, parse=None):
+        calls.append(item["domain"])
+        time.sleep(0.05)
+        return {"url": item["url"], "fetch_count": 2}
+
+    shared = SharedCrawl(crawl, fetch_slots=2)
+    out = []
+    items = [{"domain": "a.example", "url": "https://a.example"}, {"domain": "a.example", "url": "https://www.a.example/x"}]
+    threads = [threading.Thread(target=lambda it=it: out.append(shared.crawl(it))) for it in items * 2]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ["a.example"]
+    assert (shared.crawled, shared.reused) == (1, 3)
+    assert sorted(r["fetch_count"] for r in out) == [0, 0, 0, 2]
+    assert {r["url"] for r in out} == {"https://a.example", "https://www.a.example"}
+
+
+def test_concurrent_campaigns_keep_outboxes_apart_and_share_suppression(tmp_path, monkeypatch):
+    monkeypatch.setenv("DAP_STATE_DIR", str(tmp_path))
+    claimed = threading.Barrier(2)
+    seen = {}
+
+    with SuppressionIndex() as suppression:
+
+        def campaign(name):
+            with Outbox(outbox_path(name)) as outbox:
+                outbox.recover()
+                site = [f"{name}{i}.example" for i in range(3)]
+                outbox.enqueue([{"prospect": {"website_url": f"https://{d}"}, "email": f"info@{d}"} for d in site])
+                batch = outbox.claim(10)
+                claimed.wait()  # both campaigns are sending now
+                for x in batch:
+                    outbox.mark_result(x["idem_key"], True, message_id=x["email"])
+                    suppression.add(x["email"])
+                claimed.wait()
+                seen[name] = {
+                    "batch": [x["email"] for x in batch],
+                    "synced": [e["email"] for e in outbox.unsynced()],
+                    "other_suppressed": all(f"info@{'b' if name == 'a' else 'a'}{i}.example" in suppression for i in range(3)),
+                }
+
+        threads = [threading.Thread(target=campaign, args=(n,)) for n in ("a", "b")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    for name in ("a", "b"):
+        own = [f"info@{name}{i}.example" for i in range(3)]
+        assert seen[name]["batch"] == own
+        assert sorted(seen[name]["synced"]) == own
+        assert seen[name]["other_suppressed"]
+
+
+def test_outbox_recover_skips_files_in_use_in_this_process(tmp_path):
+    path = tmp_path / "outbox.sqlite3"
+    with Outbox(path) as sending, Outbox(path) as other:
+        sending.enqueue([{"prospect": {"website_url": "https://a.example"}, "email": "info@a.example"}])
+        (x,) = sending.claim(1)
+        assert other.recover() == 0
+        sending.mark_result(x["idem_key"], True)
+    with Outbox(path) as outbox:
+        assert outbox.unsynced()[0]["ok"]
@@ -0,0 +1,60 @@
+import pytest
+
+from dap.enrich import CompanyNameCleaner
+
+
+def _cleaner(**words):
+    return CompanyNameCleaner(
+        words.get("generic_words", ["attorney", "lawyers", "New Orleans"]),
+        words.get("brand_words", ["law", "llc", "group"]),
+        words.get("strip_suffixes", ["homepage", "home"]),
+    )
+
+
+def test_strips_trailing_suffix_words():
+    clean = _cleaner().clean
+    assert clean("Zollinger Law Home") == "Zollinger Law"
+    assert clean("Zollinger Law Homepage | Attorney") == "Zollinger Law"
+    assert clean("Home Team Law") == "Home Team Law"  # only a trailing suffix goes
+    assert clean("Zollinger Law Homes") == "Zollinger Law Homes"  # whole words only
+
+
+def test_prefers_the_chunk_with_a_brand_word():
+    cleaner = _cleaner()
+    assert cleaner.clean("New Orleans Lawyers | Smith Group") == "Smith Group"
+    assert cleaner.clean("Best New  Orleans attorney - Acme LLC") == "Acme LLC"
+    assert cleaner.has_brand_word("Acme LLC")
+    assert not cleaner.has_brand_word("Lawyers in New Orleans")  # "law" only as a whole word
+    assert not _cleaner(brand_words=[]).has_brand_word("Acme LLC")
+
+
+def test_words_match_literally():
+    cleaner = _cleaner(brand_words=["[law", "C++"], strip_suffixes=["(home)"])
+    assert cleaner.has_brand_word("Smith [law")
+    assert not cleaner.has_brand_word("Smith l")
+    assert cleaner.clean("Smith C++ Group (home)") == "Smith C++ Group"
+
+
+def test_from_config_reads_word_lists(tmp_path):
+    path = tmp_path / "company_names.yml"
+    path.write_text("brand_words: [studio]\nstrip_suffixes: [welcome]\ninclude_keyword_pack_geo: false\n")
+    cleaner = CompanyNameCleaner.from_config(path)
+    assert cleaner.clean("Attorney Directory | Blue Studio Welcome") == "Blue Studio"
+    assert not cleaner.has_brand_word("Smith Law")
+
+
+@pytest.mark.parametrize(
+    "text, error",
+    [
+        ("brand_words: law\n", "brand_words must be a list"),
+        ("strip_suffixes: {home: 1}\n", "strip_suffixes must be a list"),
+        ("generic_words: [attorney, [lawyer]]\n", "generic_words must be a list"),
+        ("brand_word: [law]\n", "unknown key 'brand_word'"),
+        ("- law\n", "must be a mapping"),
+    ],
+)
+def test_from_config_rejects_malformed_lists(tmp_path, text, error):
+    path = tmp_path / "company_names.yml"
+    path.write_text(text)
+    with pytest.raises(ValueError, match=error):
+        CompanyNameCleaner.from_config(path)
@@ -0,0 +1,71 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dap.content_cache import ContentHashCache
+from dap.crawler import crawl_one
+from dap.enrich import enrich
+
+_PAGES = {
+    "/": (200, '<html lang="en-US"><title>Acme Law | Home</title>'
+               '<meta name="description" content="Relocation help">'
+               '<a href="tel:+1-504-555-1234">Call</a></html>'),
+    "/contact": (200, "<p>Write to hello@acme.example</p>"),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status, body = _PAGES.get(self.path, (404, "missing"))
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_crawl_one_extracts_v11_fields_in_one_pass(site):
+    r = crawl_one({"url": site + "/some/page?x=1"})
+
+    assert r["url"] == site
+    assert r["title"] == "Acme Law | Home"
+    assert r["primary_email"] == "hello@acme.example"
+    assert r["phone_numbers"] == "+15045551234"
+    assert r["language"] == "en-us"
+    assert r["http_status"] == "200"
+    assert r["scrape_error"] == ""
+
+
+def test_crawl_one_records_error_class():
+    r = crawl_one({"url": "http://127.0.0.1:9"}, timeout_s=2)
+
+    assert r["status"] == "error"
+    assert r["scrape_error"] == "URLError"
+
+
+def test_contact_page_change_under_unchanged_homepage_is_enriched(site, monkeypatch, tmp_path):
+    cache = ContentHashCache(tmp_path / "hashes.json")
+    monkeypatch.setitem(_PAGES, "/contact", (200, "<p>Call us</p>"))
+    prospect = {"website_url": site}
+
+    first = crawl_one({"url": site})
+    assert first["primary_email"] == ""
+    enrich([prospect], [first], cache=cache)
+
+    monkeypatch.setitem(_PAGES, "/contact", (200, "<p>Write to hello@acme.example</p>"))
+    second = crawl_one({"url": site})
+    assert second["content_hash"] != first["content_hash"]
+    (update,) = enrich([prospect], [second], cache=cache)
+    assert update["primary_email"] == "hello@acme.example"
@@ -0,0 +1,25 @@
+from dap.discovery.search_seed import snippet_contacts
+from dap.pipeline import build_crawl_items, seed_row
+
+
+def test_snippet_contacts_drop_truncated_and_prefer_own_domain():
+    emails, phones = snippet_contacts(
+        "Acme Law | Home",
+        "Write to info@acme.co... or hello@gmail.com, office@acmelaw.com. Call +506 2222 3333",
+        "acmelaw.com",
+    )
+    assert emails == ["office@acmelaw.com", "hello@gmail.com"]
+    assert phones == ["+50622223333"]
+
+
+def test_snippet_email_seeds_row_and_skips_crawl():
+    d = {"url": "https://acmelaw.com/", "domain": "acmelaw.com", "query": "q", "title": "Acme Law | Home",
+         "emails": ["office@acmelaw.com"], "phones": ["+50622223333"]}
+    row = seed_row(d)
+    assert row["primary_email"] == "office@acmelaw.com"
+    assert row["phone_numbers"] == "+50622223333"
+    assert row["contact_source"] == "serper_snippet"
+    assert row["company_name"] == "Acme Law"
+
+    phone_only = seed_row({**d, "url": "https://b.example", "domain": "b.example", "emails": []})
+    assert [it["domain"] for it in build_crawl_items([row, phone_only])] == ["b.example"]
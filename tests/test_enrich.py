@@ -0,0 +1,39 @@
+from tests.fakes import MemoryWorksheet, memory_sheets
+from dap.content_cache import ContentHashCache
+from dap.enrich import enrich
+from dap.sheets.readers import read_all_prospects
+from dap.sheets.writers_enrich import apply_enrichment
+
+
+def test_enrich_short_circuits_unchanged_content(tmp_path):
+    cache = ContentHashCache(tmp_path / "hashes.json")
+    prospects = [{"website_url": "https://example.com/about"}]
+    result = {"url": "https://example.com", "status": 200, "title": "Example Law | Home", "content_hash": "abc"}
+
+    first = enrich(prospects, [result], cache=cache)
+    assert first[0]["company_name"] == "Example Law"
+    assert first[0]["content_hash"] == "abc"
+
+    second = enrich(prospects, [result], cache=cache)
+    assert set(second[0]) == {"website_url", "last_checked_at", "http_status", "scrape_error"}
+
+    changed = enrich(prospects, [dict(result, content_hash="def")], cache=cache)
+    assert changed[0]["content_hash"] == "def"
+
+
+def test_recovered_site_clears_stale_crawl_error(tmp_path):
+    header = ["website_url", "http_status", "scrape_error", "crawl_fail_count", "content_hash", "last_checked_at"]
+    ws = MemoryWorksheet("prospects", [header, ["https://example.com", "200", "", "", "abc", ""]])
+    cache = ContentHashCache(tmp_path / "hashes.json")
+    failed = {"url": "https://example.com", "status": 503, "http_status": "503", "scrape_error": "HTTPError"}
+    ok = {"url": "https://example.com", "status": 200, "http_status": "200", "scrape_error": "", "content_hash": "abc", "title": "Example"}
+
+    with memory_sheets(ws, MemoryWorksheet("runs", [["run_id"]])):
+        apply_enrichment(None, enrich(read_all_prospects(None), [failed], cache=cache))
+        row = read_all_prospects(None)[0]
+        assert (row["http_status"], row["scrape_error"], row["crawl_fail_count"]) == ("503", "HTTPError", "1")
+
+        # same page as before the outage: the content-hash short-circuit still records the outcome
+        apply_enrichment(None, enrich(read_all_prospects(None), [ok], cache=cache))
+        row = read_all_prospects(None)[0]
+        assert (row["http_status"], row["scrape_error"], row["crawl_fail_count"]) == ("200", "", "0")
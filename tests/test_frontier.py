@@ -0,0 +1,55 @@
+import time
+from datetime import datetime
+
+from dap.frontier import Budget, Prioritizer, load_deferred, save_deferred
+
+
+def test_priority_order_uses_sheet_signals():
+    p = Prioritizer(
+        pack_priority={"immigration lawyer": 2.0},
+        deferred={"late.example": {"count": 2}},
+        has_brand=lambda s: "law" in s.lower(),
+        now=datetime(2026, 6, 1),
+    )
+    rows = [
+        {"domain": "checked.example", "last_checked_at": "2026-05-31T00:00:00Z"},
+        {"domain": "failing.example", "crawl_fail_count": "3"},
+        {"domain": "new.example"},
+        {"domain": "pack.example", "source_keyword": "Immigration Lawyer"},
+        {"domain": "brand.example", "company_name": "Zollinger Law"},
+        {"domain": "late.example", "last_checked_at": "2026-05-31T00:00:00Z"},
+    ]
+    order = [r["domain"] for r in p.order(rows)]
+    assert order == ["pack.example", "brand.example", "new.example", "late.example", "checked.example", "failing.example"]
+
+
+def test_snippet_phone_rows_are_crawled_last():
+    p = Prioritizer(now=datetime(2026, 6, 1))
+    rows = [
+        {"domain": "phone.example", "notes": "seeded via serper query=q | contact from serper_snippet"},
+        {"domain": "new.example"},
+    ]
+    assert [r["domain"] for r in p.order(rows)] == ["new.example", "phone.example"]
+
+
+def test_budget_refuses_new_work_when_spent():
+    b = Budget(requests=3)
+    assert b.admit()
+    b.charge(3)
+    assert not b.admit()
+    assert b.reason == "requests"
+
+    t = Budget(time_s=5, started=time.monotonic() - 10)
+    assert not t.admit()
+    assert t.reason == "time"
+    assert Budget().admit() and not Budget().active
+
+
+def test_deferred_items_are_recorded_until_crawled(tmp_path, monkeypatch):
+    monkeypatch.setenv("DAP_STATE_DIR", str(tmp_path))
+    assert save_deferred([{"url": "https://a.example", "domain": "a.example"}], [], run_id="r1") == 1
+    save_deferred([{"url": "https://a.example", "domain": "a.example"}], [], run_id="r2")
+    assert load_deferred()["a.example"]["count"] == 2
+
+    save_deferred([], [{"url": "https://a.example", "domain": "a.example"}])
+    assert load_deferred() == {}
@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+# Cumulative `-X importtime` budget for `import dap.run_daily` (microseconds). Generous
+# enough for slow CI machines; pulling gspread/google-auth back in costs several times this.
+IMPORT_BUDGET_US = 150_000
+
+HEAVY_MODULES = ["gspread", "google.auth", "google_auth_oauthlib", "dotenv", "smtplib", "sqlite3", "dap.crawler"]
+
+
+def _run(code):
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+
+
+def test_run_daily_import_is_light():
+    r = _run("import sys, dap.run_daily, dap.sheets.client; print(','.join(sorted(sys.modules)))")
+    assert r.returncode == 0, r.stderr
+    loaded = set(r.stdout.strip().split(","))
+    assert [m for m in HEAVY_MODULES if m in loaded] == []
+
+
+def test_run_daily_import_time_budget():
+    r = _run("import dap.run_daily")
+    assert r.returncode == 0, r.stderr
+    line = next(x for x in r.stderr.splitlines() if x.rstrip().endswith("| dap.run_daily"))
+    cumulative_us = int(line.split("|")[1])
+    assert cumulative_us < IMPORT_BUDGET_US, line
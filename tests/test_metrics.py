@@ -0,0 +1,31 @@
+from dap.metrics import Registry, record_run
+from dap.tracing import Tracer
+
+
+def test_record_run_renders_textfile_and_accumulates(tmp_path):
+    tracer = Tracer("run-1")
+    with tracer.stage("crawl"):
+        with tracer.span("fetch", host="a.example") as sp:
+            sp["attrs"]["bytes"] = 10
+    with tracer.span("sheets.update", status=429):
+        pass
+
+    state = tmp_path / "metrics_state.json"
+    for _ in range(2):
+        registry = Registry.load(state)
+        record_run(registry, tracer, {"emails_queued": 3}, ok=True)
+        registry.save(state)
+
+    text = registry.render()
+    assert 'dap_fetches_total{outcome="ok"} 2' in text
+    assert 'dap_sheets_throttles_total{method="update"} 2' in text
+    assert "dap_emails_queued_total 6" in text
+    assert 'dap_stage_duration_seconds_count{stage="crawl"} 2' in text
+    assert "dap_last_run_success 1" in text
+
+    om = registry.render(openmetrics=True)
+    assert "# TYPE dap_fetches counter" in om
+    assert om.endswith("# EOF\n")
+
+    registry.write_textfile(tmp_path / "dap.prom")
+    assert (tmp_path / "dap.prom").read_text() == text
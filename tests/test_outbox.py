@@ -0,0 +1,65 @@
+from dap.email import build_log_updates
+from dap.outbox import Outbox
+
+
+def _item(i):
+    return {"prospect": {"website_url": f"https://s{i}.example"}, "email": f"info@s{i}.example"}
+
+
+def test_outbox_is_idempotent_and_resumes_without_resending(tmp_path):
+    path = tmp_path / "outbox.sqlite3"
+
+    with Outbox(path) as outbox:
+        assert outbox.enqueue([_item(1), _item(2), _item(3)]) == 3
+        assert outbox.enqueue([_item(1)]) == 0
+
+        first, second = outbox.claim(2)
+        outbox.mark_result(first["idem_key"], True, message_id="ID1")
+        # crash: `second` stays in `sending`, item 3 stays `queued`
+
+    with Outbox(path) as outbox:
+        assert outbox.recover() == 1
+        assert outbox.known("https://s2.example", "info@s2.example")
+
+        resumed = outbox.claim(10)
+        assert [x["email"] for x in resumed] == ["info@s3.example"]
+        outbox.mark_result(resumed[0]["idem_key"], True, message_id="ID3")
+
+        pending = outbox.unsynced()
+        logs = {u["website_url"]: u for u in build_log_updates(pending)}
+        assert logs["https://s1.example"]["email_provider_message_id"] == "ID1"
+        assert logs["https://s2.example"]["send_status"] == "failed"
+
+        outbox.mark_synced(e["idem_key"] for e in pending)
+        assert outbox.unsynced() == []
+
+
+def test_outbox_retries_transient_failures_up_to_max_attempts(tmp_path):
+    with Outbox(tmp_path / "outbox.sqlite3", max_attempts=2) as outbox:
+        outbox.enqueue([_item(1), _item(2)])
+        flaky, bounced = outbox.claim(10)
+        outbox.mark_result(flaky["idem_key"], False, error="421 try later")
+        outbox.mark_result(bounced["idem_key"], False, error="550 no such user", final=True)
+
+        assert not outbox.known("https://s1.example", "info@s1.example")
+        assert outbox.known("https://s2.example", "info@s2.example")
+        assert outbox.enqueue([_item(1), _item(2)]) == 1
+
+        (retry,) = outbox.claim(10)
+        assert retry["email"] == "info@s1.example"
+        outbox.mark_result(retry["idem_key"], False, error="421 try later")
+
+        # second attempt used up
+        assert outbox.known("https://s1.example", "info@s1.example")
+        assert outbox.enqueue([_item(1)]) == 0
+        assert outbox.claim(10) == []
+
+
+def test_outbox_release_does_not_use_an_attempt(tmp_path):
+    with Outbox(tmp_path / "outbox.sqlite3", max_attempts=1) as outbox:
+        outbox.enqueue([_item(1)])
+        (x,) = outbox.claim(10)
+        outbox.release(x["idem_key"])
+        (x,) = outbox.claim(10)
+        outbox.mark_result(x["idem_key"], False, error="421 try later")
+        assert outbox.known("https://s1.example", "info@s1.example")
@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from dap.crawler import parse_page
+from dap.parse_pool import ParsePool
+
+
+def _page(i):
+    return (
+        f"<html lang='en'><title>Site {i} Law | Home</title><script>var a='x@script.example'</script>"
+        f"<p>Mail info@s{i}.example or call +1 504 555 {i:04d}</p></html>"
+    ).encode()
+
+
+def test_parse_page_is_compact_and_skips_scripts():
+    page = parse_page(_page(7))
+    assert page["emails"] == ["info@s7.example"]
+    assert page["phones"] == ["+15045550007"]
+    assert page["title"] == "Site 7 Law | Home"
+    assert page["company_name"] == "Site 7 Law"
+    assert page["language"] == "en"
+    assert set(page) == {"title", "company_name", "description", "emails", "phones", "language", "content_hash"}
+
+
+def test_small_runs_parse_inline():
+    with ParsePool(workers=2, inline_below=10) as pool:
+        assert [pool.parse(_page(i)) for i in range(5)] == [parse_page(_page(i)) for i in range(5)]
+    assert pool.pooled == 0 and pool._executor is None
+
+
+def test_pool_matches_inline_results_under_concurrency():
+    bodies = [_page(i) for i in range(60)]
+    with ParsePool(workers=2, chunk_size=8, inline_below=0) as pool, ThreadPoolExecutor(8) as ex:
+        got = list(ex.map(pool.parse, bodies))
+    assert got == [parse_page(b) for b in bodies]
+    assert pool.pooled == 60
@@ -0,0 +1,130 @@
+from datetime import datetime
+
+import pytest
+
+from dap.frontier import Prioritizer
+from dap.pipeline import build_crawl_items, run_streaming
+
+
+class ListWriter:
+    def __init__(self):
+        self.updates = []
+
+    def submit(self, ups):
+        self.updates.extend(ups)
+
+
+def _enrich(prospects, results):
+    return [{"website_url": p["website_url"], "primary_email": r["emails"][0]} for p in prospects for r in results]
+
+
+def _crawl(item):
+    return {"url": item["url"], "emails": [f"info@{item['domain']}"]}
+
+
+def test_streaming_matches_sequential_outputs():
+    prospects = [
+        {"domain": "a.example", "website_url": "https://a.example"},
+        {"domain": "b.example", "website_url": "https://b.example", "primary_email": "x@b.example"},
+    ]
+    discovered = [
+        {"domain": "a.example", "url": "https://a.example"},
+        {"domain": "c.example", "url": "https://c.example", "query": "q"},
+        {"domain": "d.example", "url": "https://d.example", "query": "q"},
+    ]
+    upserted = []
+
+    def upsert(cfg, rows):
+        upserted.extend(rows)
+        return len(rows)
+
+    writer = ListWriter()
+    out = run_streaming(
+        None,
+        prospects,
+        {"a.example", "b.example"},
+        discover_iter=lambda: iter(discovered),
+        upsert=upsert,
+        crawl=_crawl,
+        enrich=_enrich,
+        writer=writer,
+        crawl_workers=3,
+        seed_batch_size=1,
+    )
+
+    assert out["seeded_count"] == 2
+    assert [r["domain"] for r in upserted] == ["c.example", "d.example"]
+    expected = build_crawl_items(prospects + upserted)
+    assert sorted(i["url"] for i in out["crawl_items"]) == sorted(i["url"] for i in expected)
+    assert sorted(u["primary_email"] for u in writer.updates) == ["info@a.example", "info@c.example", "info@d.example"]
+    assert out["updates"] == writer.updates
+
+
+def test_streaming_respects_limit():
+    prospects = [{"domain": f"s{i}.example", "website_url": f"https://s{i}.example"} for i in range(10)]
+    out = run_streaming(
+        None,
+        prospects,
+        set(),
+        discover_iter=lambda: iter([{"domain": "new.example", "url": "https://new.example"}]),
+        upsert=lambda cfg, rows: len(rows),
+        crawl=_crawl,
+        enrich=_enrich,
+        writer=ListWriter(),
+        limit=4,
+    )
+    assert len(out["crawl_items"]) == 4
+    assert len(out["crawl_results"]) == 4
+
+
+def test_streaming_limit_ranks_new_seeds_with_backlog_like_sequential():
+    prioritizer = Prioritizer(pack_priority={"hot": 3.0}, now=datetime(2026, 6, 1))
+    prospects = [
+        {"domain": f"s{i}.example", "website_url": f"https://s{i}.example", "last_checked_at": "2026-05-31T00:00:00Z"}
+        for i in range(8)
+    ]
+    prospects.append({"domain": "hot.example", "website_url": "https://hot.example", "source_keyword": "hot"})
+    discovered = [{"domain": f"new{i}.example", "url": f"https://new{i}.example", "query": "q"} for i in range(2)]
+    upserted = []
+
+    def upsert(cfg, rows):
+        upserted.extend(rows)
+        return len(rows)
+
+    out = run_streaming(
+        None,
+        prospects,
+        {p["domain"] for p in prospects},
+        discover_iter=lambda: iter(discovered),
+        upsert=upsert,
+        crawl=_crawl,
+        enrich=_enrich,
+        writer=ListWriter(),
+        limit=4,
+        seed_batch_size=1,
+        priority=prioritizer.score,
+    )
+
+    # sequential: seed, re-read, then rank every row and apply the limit
+    sequential = build_crawl_items(prioritizer.order(prospects + upserted), limit=4)
+    assert [i["url"] for i in out["crawl_items"]] == [i["url"] for i in sequential]
+    assert {"https://new0.example", "https://new1.example", "https://hot.example"} <= {i["url"] for i in sequential}
+
+
+def test_stage_error_cancels_pipeline():
+    def crawl(item):
+        raise ValueError("boom")
+
+    prospects = [{"domain": f"s{i}.example", "website_url": f"https://s{i}.example"} for i in range(500)]
+    with pytest.raises(ValueError, match="boom"):
+        run_streaming(
+            None,
+            prospects,
+            set(),
+            discover_iter=lambda: iter([]),
+            upsert=lambda cfg, rows: len(rows),
+            crawl=crawl,
+            enrich=_enrich,
+            writer=ListWriter(),
+            queue_size=5,
+        )
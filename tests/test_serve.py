@@ -0,0 +1,62 @@
+import argparse
+import json
+import threading
+import urllib.request
+from datetime import datetime, timezone
+
+from dap.serve import Service, next_run_at, start_status_server
+
+
+def test_next_run_at_interval_and_daily():
+    assert next_run_at(1000.0, None, 60) == 1000.0
+    assert next_run_at(1000.0, 990.0, 60) == 1050.0
+
+    now = datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc).timestamp()
+    assert next_run_at(now, None, 60, at="06:30") == datetime(2026, 3, 2, 6, 30, tzinfo=timezone.utc).timestamp()
+    assert next_run_at(now, None, 60, at="11:00") == datetime(2026, 3, 1, 11, 0, tzinfo=timezone.utc).timestamp()
+
+
+def test_service_runs_cycles_and_reports_status():
+    seen = []
+
+    def run_fn(args):
+        seen.append(args.stop)
+        return 0 if len(seen) == 1 else 1
+
+    service = Service(make_args=argparse.Namespace, run_fn=run_fn, interval_s=0, max_cycles=2)
+    server = start_status_server(service, "127.0.0.1", 0)
+    try:
+        service.serve_forever()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        status = json.loads(urllib.request.urlopen(url + "/status").read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert seen == [service.stop_event, service.stop_event]
+    assert status["cycles"] == 2
+    assert status["failures"] == 1
+    assert status["state"] == "stopped"
+    assert status["last_run"]["exit_code"] == 1
+
+
+def test_stop_lets_running_cycle_finish():
+    started = threading.Event()
+    finished = []
+
+    def run_fn(args):
+        started.set()
+        args.stop.wait(5)  # a run checks the event between stages and winds down
+        finished.append(args.stop.is_set())
+        return 0
+
+    service = Service(make_args=argparse.Namespace, run_fn=run_fn, interval_s=3600)
+    t = threading.Thread(target=service.serve_forever)
+    t.start()
+    assert started.wait(5)
+    service.stop()
+    t.join(5)
+
+    assert not t.is_alive()
+    assert finished == [True]
+    assert service.status()["state"] == "stopped"
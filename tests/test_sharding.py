@@ -0,0 +1,74 @@
+import argparse
+import json
+
+import pytest
+
+from dap.sharding import Shard, merge_run_rows, read_shard_logs, shard_of, write_shard_log
+
+
+def test_shards_partition_domains_stably():
+    domains = [f"site{i}.example" for i in range(200)]
+    shards = [Shard(i, 4) for i in range(4)]
+    owners = [[s for s in shards if s.owns(d)] for d in domains]
+    assert all(len(o) == 1 for o in owners)
+    assert len({o[0] for o in owners}) == 4
+    assert shard_of("Site1.Example ", 4) == shard_of("site1.example", 4)
+
+
+def test_owns_row_falls_back_to_website_host():
+    s = Shard(shard_of("a.example", 3), 3)
+    assert s.owns_row({"domain": "", "website_url": "https://A.example/contact"})
+
+
+def test_parse_rejects_bad_specs():
+    assert Shard.parse("2/4") == Shard(2, 4)
+    for spec in ("4/4", "x", "1/0"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            Shard.parse(spec)
+
+
+def test_shard_logs_merge_into_one_row(tmp_path, monkeypatch):
+    monkeypatch.setenv("DAP_STATE_DIR", str(tmp_path))
+    rows = [
+        {
+            "started_at": "2026-01-01T00:00:05Z",
+            "finished_at": "2026-01-01T00:10:00Z",
+            "sites_scraped_count": "10",
+            "errors_count": "0",
+            "duration_ms": "595000",
+            "stage_durations_ms": json.dumps({"pipeline": 500000}),
+        },
+        {
+            "started_at": "2026-01-01T00:00:01Z",
+            "finished_at": "2026-01-01T00:08:00Z",
+            "sites_scraped_count": "7",
+            "errors_count": "1",
+            "top_error": "timeout",
+            "duration_ms": "479000",
+            "stage_durations_ms": json.dumps({"pipeline": 450000, "email": 2000}),
+        },
+    ]
+    for i, row in enumerate(rows):
+        write_shard_log("g1", Shard(i, 2), row, [])
+
+    logs = read_shard_logs("g1")
+    merged = merge_run_rows("g1", [x["row"] for x in logs])
+
+    assert [x["shard"] for x in logs] == ["0/2", "1/2"]
+    assert merged["run_id"] == "g1"
+    assert merged["started_at"] == "2026-01-01T00:00:01Z"
+    assert merged["finished_at"] == "2026-01-01T00:10:00Z"
+    assert merged["sites_scraped_count"] == "17"
+    assert merged["errors_count"] == "1"
+    assert merged["top_error"] == "timeout"
+    assert json.loads(merged["stage_durations_ms"]) == {"pipeline": 500000, "email": 2000}
+
+
+def test_shard_logs_go_to_shared_runs_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DAP_STATE_DIR", str(tmp_path / "local"))
+    monkeypatch.setenv("DAP_RUNS_DIR", str(tmp_path / "shared"))
+    path = write_shard_log("g2", Shard(1, 2), {"run_id": "r"}, [])
+
+    assert path.parent == tmp_path / "shared" / "g2"
+    (log,) = read_shard_logs("g2")
+    assert log["shard"] == "1/2" and log["host"]
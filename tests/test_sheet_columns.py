@@ -0,0 +1,64 @@
+import pytest
+
+from tests.fakes import MemoryWorksheet, memory_sheets
+from dap.sheets.columns import ColumnMap, reset_column_cache, validate_schema
+from dap.sheets.schema import PROSPECT_COLUMNS_V1, RUNS_COLUMNS_V1
+from dap.sheets.writers import append_run_log
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    reset_column_cache()
+    yield
+    reset_column_cache()
+
+
+def _runs(history):
+    header = RUNS_COLUMNS_V1 + ["duration_ms"]
+    return MemoryWorksheet("runs", [header] + [[f"r{i}"] + [""] * (len(header) - 1) for i in range(history)])
+
+
+def test_append_run_log_reads_only_the_header_once():
+    runs = _runs(10_000)
+    with memory_sheets(MemoryWorksheet("prospects", [PROSPECT_COLUMNS_V1]), runs):
+        append_run_log(None, {"run_id": "a", "duration_ms": "5", "unknown": "x"})
+        append_run_log(None, {"run_id": "b"})
+
+    assert runs.calls == {"row_values": 1, "append_row": 2}
+    assert runs.values[-2][0] == "a" and runs.values[-2][-1] == "5"
+
+
+def test_validate_schema_reports_missing_columns_and_warms_cache():
+    runs = _runs(3)
+    prospects = MemoryWorksheet("prospects", [[c for c in PROSPECT_COLUMNS_V1 if c != "city"]])
+    with memory_sheets(prospects, runs):
+        assert validate_schema(None) == {"prospects": ["city"], "runs": []}
+        append_run_log(None, {"run_id": "c"})
+
+    assert runs.calls == {"row_values": 1, "append_row": 1}
+
+
+def test_empty_sheet_raises():
+    with memory_sheets(MemoryWorksheet("prospects", []), MemoryWorksheet("runs", [])):
+        with pytest.raises(RuntimeError, match="missing header row"):
+            validate_schema(None)
+
+
+def test_column_map_row():
+    cmap = ColumnMap.from_header([" a", "b ", "", "c"])
+    assert cmap.index == {"a": 0, "b": 1, "c": 3}
+    assert cmap.row({"c": "3", "a": "", "z": "9"}) == ["", "", "", "3"]
+
+
+def test_missing_feature_columns_uses_cached_header():
+    from dap.sheets.columns import missing_feature_columns
+
+    prospects = MemoryWorksheet("prospects", [PROSPECT_COLUMNS_V1])
+    with memory_sheets(prospects, _runs(0)):
+        validate_schema(None)
+        assert list(missing_feature_columns(None)) == ["crawl_fail_count"]
+        prospects.values[0].append("crawl_fail_count")
+        reset_column_cache()
+        assert missing_feature_columns(None) == {}
+
+    assert prospects.calls == {"row_values": 2}
@@ -0,0 +1,76 @@
+from dap.email import deliver_emails
+from dap.smtp_sender import RateLimiter, SmtpConfig, SmtpSender
+
+TEMPLATE = {"subject": "Hello {company_name}", "body": "Hi {company_name} at {website_url}"}
+
+
+def _sender(server, **kw):
+    cfg = SmtpConfig(
+        host="127.0.0.1",
+        port=server.server_address[1],
+        from_addr="outreach@dap.example",
+        username="user",
+        password="secret",
+        use_starttls=False,
+        **kw,
+    )
+    return SmtpSender(cfg)
+
+
+def test_deliver_emails_reuses_connections_and_records_ids(smtp_server):
+    to_email = [
+        {"prospect": {"website_url": f"https://s{i}.example", "company_name": f"Site {i}"}, "email": f"info@s{i}.example"}
+        for i in range(200)
+    ]
+    to_email.append({"prospect": {"website_url": "https://gone.example"}, "email": "bounce@gone.example"})
+
+    sender = _sender(smtp_server, pool_size=2, max_messages_per_connection=500, max_per_minute=0, max_per_domain_per_minute=0)
+    out = deliver_emails(to_email, sender, TEMPLATE)
+
+    assert out["sent_count"] == 200
+    assert len(smtp_server.messages) == 200
+    assert smtp_server.connections <= 2
+    assert out["results"][-1].permanent
+
+    logs = {u["website_url"]: u for u in out["log_updates"]}
+    assert logs["https://s0.example"]["send_status"] == "sent"
+    assert logs["https://s0.example"]["email_provider_message_id"].startswith("STUB")
+    assert logs["https://gone.example"]["send_status"] == "failed"
+
+
+def _queue(*emails):
+    return [{"prospect": {"website_url": f"https://{e.split('@')[1]}"}, "email": e} for e in emails]
+
+
+def test_sender_side_failures_stop_sending_without_bounces(smtp_server):
+    sender = _sender(smtp_server, pool_size=2, max_per_minute=0, max_per_domain_per_minute=0)
+    smtp_server.mail_reply = "550 5.7.1 Sender address rejected"
+    out = deliver_emails(_queue("info@a.example", "info@b.example", "info@c.example"), sender, TEMPLATE)
+    assert all(r.fatal and not r.permanent for r in out["results"])
+    assert smtp_server.messages == []
+
+    smtp_server.mail_reply = "250 OK"
+    smtp_server.auth_reply = "535 5.7.8 Authentication failed"
+    out = deliver_emails(_queue("info@a.example", "info@b.example"), sender, TEMPLATE)
+    assert all(r.fatal and not r.permanent for r in out["results"])
+
+
+def test_no_resend_after_data_was_sent(smtp_server):
+    sender = _sender(smtp_server, pool_size=1, max_per_minute=0, max_per_domain_per_minute=0)
+    out = deliver_emails(_queue("drop@a.example", "info@b.example"), sender, TEMPLATE)
+
+    dropped, ok = out["results"]
+    assert dropped.unknown and not dropped.ok and not dropped.permanent
+    assert ok.ok
+    assert [m[1] for m in smtp_server.messages] == [["drop@a.example"], ["info@b.example"]]
+
+
+def test_rate_limiter_blocks_per_domain():
+    now = [0.0]
+    limiter = RateLimiter(per_minute=0, per_domain_per_minute=2, clock=lambda: now[0])
+    limiter.acquire("a.example")
+    limiter.acquire("a.example")
+    limiter.acquire("b.example")
+    assert limiter._delay(limiter._by_domain["a.example"], 2, now[0]) == 60.0
+    now[0] = 61.0
+    limiter.acquire("a.example")
@@ -0,0 +1,40 @@
+from dap.email import send_emails
+from dap.suppression import SuppressionIndex, normalize_email
+
+
+def test_normalize_email():
+    assert normalize_email(" Info+News@Example.COM ") == "info@example.com"
+    assert normalize_email("mailto:a@b.co") == "a@b.co"
+    assert normalize_email("not-an-email") == ""
+
+
+def test_suppression_index_persists_and_suppresses_domains(tmp_path):
+    path = tmp_path / "suppression.sqlite3"
+
+    with SuppressionIndex(path) as index:
+        assert index.add_many(["Info@Acme.example", "info+x@acme.example", "sales@acme.example"]) == 2
+        index.add_bounce("gone@old.example")
+        index.suppress_domain("blocked.example")
+
+    with SuppressionIndex(path) as index:
+        assert len(index) == 3
+        assert "INFO+promo@acme.example" in index
+        assert "gone@old.example" in index
+        assert "anyone@blocked.example" in index
+        assert "new@acme.example" not in index
+
+        prospects = [{"website_url": "https://acme.example", "all_emails": "Info@acme.example,new@acme.example"}]
+        queued = send_emails(None, prospects, [], index)
+        assert [x["email"] for x in queued["to_email"]] == ["new@acme.example"]
+
+
+def test_suppression_index_is_seeded_once_per_source(tmp_path):
+    path = tmp_path / "suppression.sqlite3"
+    with SuppressionIndex(path) as index:
+        assert not index.seeded("sheet-a")
+        assert index.seed("sheet-a", ["a@x.example", "b@x.example"]) == 2
+        assert index.seeded("sheet-a") and not index.seeded("sheet-b")
+
+    with SuppressionIndex(path) as index:
+        assert index.seeded("sheet-a")
+        assert "b@x.example" in index
@@ -0,0 +1,47 @@
+import pytest
+
+from dap.tracing import Tracer, _percentile
+
+
+def test_tracer_records_stages_calls_and_host_percentiles(tmp_path):
+    tracer = Tracer("run-1")
+    with tracer.stage("crawl"):
+        for i in range(10):
+            with tracer.span("fetch", host="a.example") as sp:
+                sp["attrs"]["bytes"] = 100
+    with pytest.raises(ValueError):
+        with tracer.span("sheets.update"):
+            raise ValueError("boom")
+
+    summary = tracer.summary()
+    assert set(summary["stages"]) == {"crawl"}
+    assert summary["fetch_hosts"]["a.example"]["count"] == 10
+    assert summary["fetch_hosts"]["a.example"]["bytes"] == 1000
+    assert summary["calls"]["sheets.update"]["errors"] == 1
+
+    path = tracer.write_json(tmp_path / "trace.json")
+    assert path.read_text().startswith("{")
+
+
+def test_percentile_is_nearest_rank():
+    ten = [float(i) for i in range(1, 11)]
+    twenty = [float(i) for i in range(1, 21)]
+    assert _percentile(ten, 50) == 5.0
+    assert _percentile(ten, 90) == 9.0
+    assert _percentile(twenty, 95) == 19.0
+    assert _percentile(twenty, 100) == 20.0
+    assert _percentile([7.0], 50) == 7.0
+    assert _percentile([], 50) == 0.0
+
+
+def test_write_json_keeps_newest_traces(tmp_path, monkeypatch):
+    import os
+
+    monkeypatch.setenv("DAP_STATE_DIR", str(tmp_path))
+    monkeypatch.setenv("DAP_TRACE_KEEP", "3")
+    for i in range(5):
+        path = Tracer(f"run{i}").write_json()
+        os.utime(path, (1000 + i, 1000 + i))
+    Tracer("run5").write_json()
+
+    assert sorted(p.name for p in path.parent.glob("*.json")) == ["run3.json", "run4.json", "run5.json"]
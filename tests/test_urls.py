@@ -0,0 +1,28 @@
+from dap.urls import canonical_url, normalize_url, registrable_domain, url_key
+
+
+def test_canonical_url_strips_path_port_userinfo_and_case():
+    assert canonical_url("HTTPS://User:pw@WWW.Example.com:443/contact?x=1#top") == "https://www.example.com"
+    assert canonical_url("example.com/about") == "https://example.com"
+    assert canonical_url("http://example.com:8080/") == "http://example.com:8080"
+    assert canonical_url("") == canonical_url("   ") == ""
+
+
+def test_url_key_ignores_scheme_and_www():
+    assert url_key("http://www.example.com/a") == url_key("https://EXAMPLE.com.") == "example.com"
+    assert url_key("https://shop.example.com") == "shop.example.com"
+
+
+def test_normalize_url_keeps_path_only():
+    assert normalize_url("Example.com/About?utm_source=serper#x") == "https://example.com/About"
+    assert normalize_url("//example.com") == "https://example.com/"
+
+
+def test_registrable_domain():
+    assert registrable_domain("https://www.shop.example.com/x") == "example.com"
+    assert registrable_domain("www.example.com") == "example.com"
+    assert registrable_domain("a.lawfirm.co.uk") == "lawfirm.co.uk"
+    assert registrable_domain("https://bufete.co.cr") == "bufete.co.cr"
+    assert registrable_domain("x.wixsite.com") != registrable_domain("y.wixsite.com")
+    assert registrable_domain("localhost") == "localhost"
+    assert registrable_domain("10.0.0.1") == "10.0.0.1"
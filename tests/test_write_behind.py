@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from dap.sheets.write_behind import WriteBehindWriter
+
+
+def test_write_behind_batches_and_final_flush():
+    batches = []
+
+    def write_fn(cfg, updates):
+        batches.append(list(updates))
+        return len(updates)
+
+    with WriteBehindWriter(cfg=None, batch_size=3, flush_interval_s=60, write_fn=write_fn) as writer:
+        for i in range(7):
+            writer.submit([{"website_url": f"https://s{i}.example"}])
+
+    assert writer.written == 7
+    assert [len(b) for b in batches] == [3, 3, 1]
+
+
+def test_write_behind_flushes_on_time_trigger():
+    flushed = threading.Event()
+
+    def write_fn(cfg, updates):
+        flushed.set()
+        return len(updates)
+
+    writer = WriteBehindWriter(cfg=None, batch_size=100, flush_interval_s=0.05, write_fn=write_fn).start()
+    writer.submit([{"website_url": "https://a.example"}])
+    assert flushed.wait(2)
+    assert writer.close() == 1
+
+
+def test_write_behind_propagates_errors():
+    def write_fn(cfg, updates):
+        raise ValueError("quota")
+
+    writer = WriteBehindWriter(cfg=None, batch_size=1, write_fn=write_fn).start()
+    writer.submit([{"website_url": "https://a.example"}])
+    with pytest.raises(RuntimeError, match="quota"):
+        writer.close()
+
+
+def test_write_behind_reads_prospects_once_per_writer():
+    from tests.fakes import MemoryWorksheet, memory_sheets
+
+    header = ["website_url", "domain", "primary_email"]
+    ws = MemoryWorksheet("prospects", [header] + [[f"https://s{i}.example", f"s{i}.example", ""] for i in range(10)])
+    with memory_sheets(ws, MemoryWorksheet("runs", [["run_id"]])):
+        with WriteBehindWriter(cfg=None, batch_size=3, flush_interval_s=60) as writer:
+            for i in range(10):
+                writer.submit([{"website_url": f"https://s{i}.example", "primary_email": f"info@s{i}.example"}])
+            writer.submit([{"website_url": "https://unknown.example", "primary_email": "x@unknown.example"}])
+            writer.submit([{"website_url": "https://unknown.example", "primary_email": "x@unknown.example"}])
+
+    assert writer.written == 10
+    assert ws.calls["get_all_values"] == 2  # first flush, plus one re-read for the unknown row
+    assert ws.calls["batch_update"] == writer.flushes == 4
+    assert ws.values[10][2] == "info@s9.example"
+
+
+def test_write_behind_submit_blocks_when_queue_is_full():
+    release = threading.Event()
+
+    def write_fn(cfg, updates):
+        release.wait(5)
+        return len(updates)
+
+    writer = WriteBehindWriter(cfg=None, batch_size=1, max_pending=2, flush_interval_s=60, write_fn=write_fn).start()
+    done = threading.Event()
+
+    def produce():
+        for i in range(6):
+            writer.submit([{"website_url": f"https://s{i}.example"}])
+        done.set()
+
+    threading.Thread(target=produce, daemon=True).start()
+    assert not done.wait(0.5)  # one update in the stuck flush, two queued, the producer waits
+    release.set()
+    assert done.wait(5)
+    assert writer.close() == 6
+
+
+def test_write_behind_follows_rows_deleted_mid_run():
+    from tests.fakes import MemoryWorksheet, memory_sheets
+
+    header = ["website_url", "domain", "primary_email", "notes"]
+    ws = MemoryWorksheet("prospects", [header] + [[f"https://s{i}.example", f"s{i}.example", "", "keep"] for i in range(4)])
+    with memory_sheets(ws, MemoryWorksheet("runs", [["run_id"]])):
+        with WriteBehindWriter(cfg=None, batch_size=1, flush_interval_s=60) as writer:
+            writer.submit([{"website_url": "https://s0.example", "primary_email": "info@s0.example"}])
+            while writer.flushes < 1:
+                time.sleep(0.01)
+            ws.delete_rows(3)  # s1 archived by someone else: s2 and s3 move up a row
+            ws.values[2][3] = "edited meanwhile"  # s2, now on row 3
+            writer.submit([{"website_url": "https://s3.example", "primary_email": "info@s3.example"}])
+            writer.submit([{"website_url": "https://s2.example", "primary_email": "info@s2.example"}])
+
+    by_url = {r[0]: r for r in ws.values[1:]}
+    assert len(ws.values) == 4
+    assert by_url["https://s0.example"][2] == "info@s0.example"
+    assert by_url["https://s2.example"][2:] == ["info@s2.example", "edited meanwhile"]
+    assert by_url["https://s3.example"][2:] == ["info@s3.example", "keep"]
+    assert ws.calls["get_all_values"] == 2  # first flush, plus one re-read after the rows moved